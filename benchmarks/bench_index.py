@@ -0,0 +1,148 @@
+"""
+Compare the latency of a search in a synthetic repository with the remote API
+(simulated server), a brute-force scan of the mirror and the trigram index.
+Then measure the update of the index after a commit changing a few files.
+
+Usage : python benchmarks/bench_index.py [--files 5000] [--latency 0.3] [--changed 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from rx import operators as ops
+from gsc.core.local_search import search_tree
+from gsc.core.request_decorator import Api
+from gsc.core.trigram_index import (
+    INDEX_FILE,
+    INDEX_UPDATED,
+    build_index,
+    refresh_index,
+    search_index,
+)
+from gsc.data.request.gitlab_request import SearchRequest
+
+WORDS = [f"word{i}" for i in range(2000)]
+GIT = ["git", "-c", "user.name=gsc", "-c", "user.email=gsc@localhost"]
+
+
+def create_repository(root: str, files: int) -> str:
+    rand = random.Random(0)
+    work_dir = os.path.join(root, "work")
+    for i in range(files):
+        path = os.path.join(work_dir, f"dir_{i % 50}", f"file_{i}.py")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            for _ in range(100):
+                file.write(" ".join(rand.choices(WORDS, k=8)) + "\n")
+            if i % 500 == 0:
+                file.write("rare_keyword = True\n")
+
+    subprocess.run(GIT + ["init", "-q", "-b", "main", work_dir], check=True)
+    commit(work_dir)
+    git_dir = os.path.join(root, "mirror.git")
+    subprocess.run(["git", "clone", "-q", "--mirror", work_dir, git_dir], check=True)
+    return git_dir
+
+
+def commit(work_dir: str):
+    subprocess.run(GIT + ["-C", work_dir, "add", "-A"], check=True)
+    subprocess.run(GIT + ["-C", work_dir, "commit", "-q", "-m", "update"], check=True)
+
+
+def change_files(root: str, git_dir: str, changed: int):
+    work_dir = os.path.join(root, "work")
+    for i in range(changed):
+        path = os.path.join(work_dir, f"dir_{i % 50}", f"file_{i}.py")
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("changed_keyword = True\n")
+    commit(work_dir)
+    subprocess.run(["git", "--git-dir", git_dir, "fetch", "-q", "origin"], check=True)
+
+
+def create_server(items: list, latency: float) -> ThreadingHTTPServer:
+    body = json.dumps(items).encode()
+
+    class SearchHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            # Simulate the time of the search on the server
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", 0), SearchHandler)
+
+
+def search_api(host: str, keyword: str) -> list:
+    request = SearchRequest.__new__(SearchRequest)
+    Api.__init__(request, host, {})
+    return request.search_in_project(1, keyword, 100).pipe(ops.to_list()).run()
+
+
+def measure(func, *args, repeat: int = 5):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(func(*args))
+        elapsed.append(time.perf_counter() - start)
+    return count, sorted(elapsed)[len(elapsed) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--changed", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        git_dir = create_repository(root, args.files)
+        keyword = "rare_keyword"
+        expected = search_tree(git_dir, keyword)
+
+        server = create_server(expected, args.latency)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host = f"http://127.0.0.1:{server.server_port}/"
+
+        start = time.perf_counter()
+        build_index(git_dir, os.path.join(git_dir, INDEX_FILE))
+        build_time = time.perf_counter() - start
+        size = os.path.getsize(os.path.join(git_dir, INDEX_FILE)) / 1024 / 1024
+
+        print(f"{args.files} files, index built in {build_time:.2f}s ({size:.1f} MB)")
+        print(f"{'search':>10} {'items':>8} {'seconds':>10}")
+        for name, func, func_args in (
+            ("api", search_api, (host, keyword)),
+            ("scan", search_tree, (git_dir, keyword)),
+            ("index", search_index, (git_dir, keyword)),
+        ):
+            count, elapsed = measure(func, *func_args)
+            assert count == len(expected)
+            print(f"{name:>10} {count:>8} {elapsed:>10.3f}")
+
+        server.shutdown()
+
+        change_files(root, git_dir, args.changed)
+        start = time.perf_counter()
+        assert refresh_index(git_dir) == INDEX_UPDATED
+        update_time = time.perf_counter() - start
+        count = len(search_index(git_dir, "changed_keyword"))
+        assert count == args.changed
+        print(f"{args.changed} files changed, index updated in {update_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
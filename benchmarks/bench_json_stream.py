@@ -0,0 +1,104 @@
+"""
+Compare the peak memory of decoding a large search page with json.loads and
+with the incremental decoder.
+
+Usage : python benchmarks/bench_json_stream.py [--items 100] [--preview-kb 64]
+"""
+
+import argparse
+import json
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from gsc.core.json_stream import DEFAULT_CHUNK_SIZE, JsonStream
+from gsc.data.response.gitlab_response import file_response
+
+
+def create_server(body: bytes) -> ThreadingHTTPServer:
+    class SearchHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", 0), SearchHandler)
+
+
+def create_page(items: int, preview_kb: int) -> bytes:
+    preview = "x = 1\n" * (preview_kb * 1024 // 6)
+    return json.dumps(
+        [
+            {
+                "basename": f"file_{i}",
+                "path": f"src/file_{i}.py",
+                "ref": "main",
+                "startline": 1,
+                "project_id": 1,
+                "data": preview,
+            }
+            for i in range(items)
+        ]
+    ).encode()
+
+
+def load(url: str) -> int:
+    response = requests.get(url, timeout=20)
+    count = 0
+    for item in json.loads(response.content):
+        file_response(**item)
+        count += 1
+    return count
+
+
+def stream(url: str) -> int:
+    response = requests.get(url, timeout=20, stream=True)
+    count = 0
+    for item in JsonStream(response.iter_content(DEFAULT_CHUNK_SIZE)):
+        file_response(**item)
+        count += 1
+    response.close()
+    return count
+
+
+def measure(func, url: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func(url)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--preview-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    body = create_page(args.items, args.preview_kb)
+    server = create_server(body)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/search"
+
+    print(f"{args.items} items, {len(body) / 1024 / 1024:.1f} MB page")
+    print(f"{'decoder':>10} {'items':>8} {'seconds':>10} {'peak MB':>10}")
+    for name, func in (("loads", load), ("stream", stream)):
+        count, elapsed, peak = measure(func, url)
+        assert count == args.items
+        print(f"{name:>10} {count:>8} {elapsed:>10.3f} {peak:>10.1f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare the memory and the time to build the search hits with the former
+response dataclass mapped to the entity dataclass and with the slotted entity
+built straight from the decoded JSON.
+
+Usage : python benchmarks/bench_models.py [--items 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from gsc.data.response.gitlab_response import file_response
+
+
+@dataclass
+class LegacyFileResponse:
+    # pylint: disable=C0103
+    basename: str
+    data: str
+    path: str
+    filename: str
+    id: int
+    ref: str
+    startline: int
+    project_id: int
+
+    def __init__(self, **kwargs) -> None:
+        self.basename = kwargs.get("basename")
+        self.data = kwargs.get("data")
+        self.path = kwargs.get("path")
+        self.filename = kwargs.get("filename")
+        self.id = kwargs.get("id")
+        self.ref = kwargs.get("ref")
+        self.startline = kwargs.get("startline")
+        self.project_id = kwargs.get("project_id")
+
+
+@dataclass
+class LegacyFile:
+    name: str
+    path: str
+    ref: str
+    data_preview: str
+    project_url: str = ""
+    project_id: int = None
+
+
+def legacy(item: dict):
+    response = LegacyFileResponse(**item)
+    return LegacyFile(
+        name=response.basename,
+        path=response.path,
+        ref=response.ref,
+        data_preview=response.data,
+        project_id=response.project_id,
+    )
+
+
+def create_items(count: int) -> list:
+    return [
+        {
+            "basename": f"file_{i}",
+            "data": f"line {i}\n",
+            "path": f"src/file_{i}.py",
+            "filename": f"src/file_{i}.py",
+            "id": None,
+            "ref": "main",
+            "startline": 1,
+            "project_id": i % 50,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(func, items: list):
+    tracemalloc.start()
+    start = time.perf_counter()
+    files = [func(item) for item in items]
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(files) == len(items)
+    return elapsed, retained / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    items = create_items(args.items)
+    print(f"{args.items} search hits")
+    print(f"{'model':>10} {'seconds':>10} {'items/s':>12} {'retained MB':>12}")
+    for name, func in (
+        ("legacy", legacy),
+        ("slots", lambda item: file_response(**item)),
+    ):
+        elapsed, retained = measure(func, items)
+        rate = args.items / elapsed
+        print(f"{name:>10} {elapsed:>10.3f} {rate:>12.0f} {retained:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compare the lines per second of the search output printed with one
+click.secho and one export write per line (former observer) and with the
+buffered writer thread of PrintPlugin, to a file and to a pseudo terminal.
+The "callbacks" time is how long the caller is held by the observer, the
+"seconds" include the flush of the output.
+
+Usage : python benchmarks/bench_output.py [--hits 20000]
+"""
+
+import argparse
+import os
+import pty
+import tempfile
+import threading
+import time
+import click
+from gsc.presentation.observer.plugin import MarkdownExportPlugin, PrintPlugin
+
+PREVIEW = "    token = load_token()\n    return client.search(token, keyword)\n"
+
+
+def legacy_output(stream, export_path: str, hits: int, finish: list) -> int:
+    export_file = click.open_file(export_path, mode="w")
+    lines = 0
+    for number in range(hits):
+        path = f"src/module_{number % 100}/file_{number}.py"
+        click.secho(path, file=stream)
+        export_file.write(path + "\n")
+        highlight = click.style("token", bg="bright_white")
+        parts = [click.style(part, dim=True) for part in PREVIEW.split("token")]
+        click.secho(highlight.join(parts), dim=True, file=stream)
+        export_file.write(f"```\n{PREVIEW})\n```\n")
+        lines += 2 + PREVIEW.count("\n")
+    finish.append(time.perf_counter())
+    export_file.close()
+    return lines
+
+
+def writer_output(stream, export_path: str, hits: int, finish: list) -> int:
+    print_output = PrintPlugin(False, stream, stream)
+    export_output = MarkdownExportPlugin()
+    export_output.set_output_path(export_path)
+    lines = 0
+    for number in range(hits):
+        path = f"src/module_{number % 100}/file_{number}.py"
+        print_output.print(path)
+        export_output.normal(path)
+        print_output.print_highlight(PREVIEW, "token", dim=True)
+        export_output.code_block(PREVIEW)
+        lines += 2 + PREVIEW.count("\n")
+    finish.append(time.perf_counter())
+    print_output.close()
+    export_output.close()
+    return lines
+
+
+def open_terminal():
+    """
+    Return a text stream on a pseudo terminal, its output is read and
+    dropped by a thread.
+    """
+    master, slave = pty.openpty()
+
+    def drain():
+        try:
+            while os.read(master, 1 << 16):
+                pass
+        except OSError:
+            pass
+
+    threading.Thread(target=drain, daemon=True).start()
+    return os.fdopen(slave, "w", encoding="utf-8", closefd=True), master
+
+
+def measure(name: str, target: str, func) -> None:
+    finish = []
+    start = time.perf_counter()
+    lines = func(finish)
+    end = time.perf_counter()
+    print(
+        f"{name:>8} {target:>9} {lines:>8} {finish[0] - start:>10.2f}"
+        f" {end - start:>8.2f} {lines / (end - start):>10.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hits", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(
+        f"{'output':>8} {'target':>9} {'lines':>8} {'callbacks':>10} {'seconds':>8}"
+        f" {'lines/s':>10}"
+    )
+    outputs = {"secho": legacy_output, "writer": writer_output}
+    with tempfile.TemporaryDirectory() as root:
+        export_path = os.path.join(root, "result.md")
+        for target in ("file", "terminal"):
+            for name, output in outputs.items():
+                master = None
+                if target == "file":
+                    stream = open(os.path.join(root, "out.txt"), "w", encoding="utf-8")
+                else:
+                    stream, master = open_terminal()
+                measure(
+                    name,
+                    target,
+                    lambda finish: output(stream, export_path, args.hits, finish),
+                )
+                stream.close()
+                if master is not None:
+                    os.close(master)
+
+
+if __name__ == "__main__":
+    main()
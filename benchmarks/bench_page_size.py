@@ -0,0 +1,86 @@
+"""
+Measure the latency of listing a large simulated GitLab group per page size.
+
+Usage : python benchmarks/bench_page_size.py [--projects 2000] [--latency 0.03]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from math import ceil
+from urllib.parse import urlparse, parse_qs
+from rx import operators as ops
+from gsc.core.request_decorator import Api
+from gsc.data.request.gitlab_request import ProjectRequest
+
+
+def create_server(total_projects: int, latency: float) -> ThreadingHTTPServer:
+    class GroupHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            query = parse_qs(urlparse(self.path).query)
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query["per_page"][0])
+            total_pages = ceil(total_projects / per_page)
+            first_id = (page - 1) * per_page
+            last_id = min(first_id + per_page, total_projects)
+            body = json.dumps(
+                [
+                    {"id": i, "name_with_namespace": f"group / project-{i}"}
+                    for i in range(first_id, last_id)
+                ]
+            ).encode()
+
+            # Simulate the round-trip time of the server
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-Total-Pages", str(total_pages))
+            if page < total_pages:
+                next_url = f"http://{self.headers['Host']}{urlparse(self.path).path}"
+                next_url += f"?page={page + 1}&per_page={per_page}"
+                self.send_header("Link", f'<{next_url}>; rel="next"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", 0), GroupHandler)
+
+
+def list_projects(host: str, page_size: int) -> int:
+    request = ProjectRequest.__new__(ProjectRequest)
+    Api.__init__(request, host, {})
+    projects = request.project_list("group", page_size).pipe(ops.to_list()).run()
+    return len(projects)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.03)
+    args = parser.parse_args()
+
+    server = create_server(args.projects, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{server.server_port}/"
+
+    print(f"{args.projects} projects, {args.latency * 1000:.0f}ms per request")
+    print(f"{'page size':>10} {'requests':>10} {'seconds':>10}")
+    for page_size in (10, 20, 50, 100):
+        start = time.perf_counter()
+        count = list_projects(host, page_size)
+        elapsed = time.perf_counter() - start
+        assert count == args.projects
+        print(f"{page_size:>10} {ceil(count / page_size):>10} {elapsed:>10.3f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
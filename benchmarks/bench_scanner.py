@@ -0,0 +1,106 @@
+"""
+Measure the throughput in MB/s of searching many keywords in a synthetic bare
+mirror : one pass over the blobs per keyword (``search_tree``), one pass with
+the keyword scanner (``scan_tree``), and the scanner of several mirrors on the
+process pool, like ``--engine mirror`` does.
+
+Usage : python benchmarks/bench_scanner.py [--size-mb 200] [--keywords 20] [--mirrors 4]
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import tempfile
+import time
+from gsc.core.keyword_scanner import scan_tree
+from gsc.core.local_search import LocalSearchEngine, search_tree
+
+WORDS = [f"word{i}" for i in range(5000)] + ["def", "return", "self", "import"]
+FILE_SIZE = 256 * 1024
+GIT = ["git", "-c", "user.name=gsc", "-c", "user.email=gsc@localhost"]
+
+
+def create_mirror(root: str, size_mb: int, keywords: list) -> str:
+    rand = random.Random(0)
+    work_dir = os.path.join(root, "work")
+    for i in range(size_mb * 1024 * 1024 // FILE_SIZE):
+        path = os.path.join(work_dir, f"dir_{i % 20}", f"file_{i}.py")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lines = []
+        size = 0
+        while size < FILE_SIZE:
+            line = " ".join(rand.choices(WORDS, k=10))
+            if rand.random() < 0.001:
+                line += f" {rand.choice(keywords)}"
+            lines.append(line)
+            size += len(line) + 1
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+
+    subprocess.run(GIT + ["init", "-q", "-b", "main", work_dir], check=True)
+    subprocess.run(GIT + ["-C", work_dir, "add", "-A"], check=True)
+    subprocess.run(GIT + ["-C", work_dir, "commit", "-q", "-m", "init"], check=True)
+    git_dir = os.path.join(root, "mirror.git")
+    subprocess.run(["git", "clone", "-q", "--mirror", work_dir, git_dir], check=True)
+    return git_dir
+
+
+def tree_size(git_dir: str) -> int:
+    output = subprocess.run(
+        ["git", "--git-dir", git_dir, "ls-tree", "-r", "-l", "HEAD"],
+        check=True,
+        capture_output=True,
+    ).stdout
+    return sum(int(line.split()[3]) for line in output.splitlines())
+
+
+def search_per_keyword(git_dir: str, keywords: list) -> int:
+    return sum(len(search_tree(git_dir, keyword)) for keyword in keywords)
+
+
+def scan_mirrors(engine: LocalSearchEngine, git_dirs: list, keywords: list) -> int:
+    futures = [engine.submit(scan_tree, git_dir, keywords) for git_dir in git_dirs]
+    return sum(len(future.result()) for future in futures)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--keywords", type=int, default=20)
+    parser.add_argument("--mirrors", type=int, default=4)
+    args = parser.parse_args()
+
+    keywords = [f"Keyword_{i}" for i in range(args.keywords)]
+    engine = LocalSearchEngine()
+    with tempfile.TemporaryDirectory() as root:
+        git_dir = create_mirror(root, args.size_mb, keywords)
+        size_mb = tree_size(git_dir) / 1024 / 1024
+        # The same mirror searched several times, as several repositories.
+        git_dirs = [git_dir] * args.mirrors
+
+        print(
+            f"{size_mb:.0f} MB, {len(keywords)} keywords, {engine.max_workers} workers"
+        )
+        print(f"{'search':>12} {'items':>8} {'seconds':>8} {'MB/s':>8}")
+        for name, func, searched_mb in (
+            ("per keyword", lambda: search_per_keyword(git_dir, keywords), size_mb),
+            ("scanner", lambda: len(scan_tree(git_dir, keywords)), size_mb),
+            (
+                "scanner pool",
+                lambda: scan_mirrors(engine, git_dirs, keywords) // len(git_dirs),
+                size_mb * len(git_dirs),
+            ),
+        ):
+            start = time.perf_counter()
+            count = func()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:>12} {count:>8} {elapsed:>8.2f} {searched_mb / elapsed:>8.0f}"
+            )
+
+    engine.shutdown()
+
+
+if __name__ == "__main__":
+    main()
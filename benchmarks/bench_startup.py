@@ -0,0 +1,78 @@
+"""
+Measure the cold start of the commands : wall time of the process and time
+spent importing modules (python -X importtime), against a budget.
+
+Usage : python benchmarks/bench_startup.py [--runs 7] [--budget-ms 150]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = ("-h", "gl -h", "gl env --list", "gl search -h", "gh env --list")
+RUN_GSC = "import sys; from gsc import main; sys.argv[0] = 'gsc'; main()"
+
+
+def import_times(args: list) -> dict:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_GSC, *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only the top level imports, their time includes the nested ones
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def wall_time(args: list, runs: int, code: str = RUN_GSC) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code, *args], capture_output=True, check=False
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    # Imported by the interpreter itself, not by gsc
+    interpreter = import_times(["--version"]).keys() & {"site", "encodings"}
+    baseline = wall_time([], args.runs, code="pass")
+
+    print(f"python -c pass : {baseline:.0f} ms")
+    print(f"{'command':>16} {'wall ms':>8} {'import ms':>10}  heaviest")
+    over_budget = []
+    for command in COMMANDS:
+        arguments = command.split()
+        times = import_times(arguments)
+        for name in interpreter:
+            times.pop(name, None)
+        imports = sum(times.values()) / 1000
+        heaviest = sorted(times, key=times.get, reverse=True)[:3]
+        wall = wall_time(arguments, args.runs)
+        print(f"{command:>16} {wall:>8.0f} {imports:>10.0f}  {', '.join(heaviest)}")
+        if imports > args.budget_ms:
+            over_budget.append(command)
+
+    if over_budget:
+        print(f"Over the {args.budget_ms:.0f} ms import budget : {over_budget}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
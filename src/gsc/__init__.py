@@ -1,10 +1,7 @@
-from gsc.presentation.command_line import cli
-from gsc.di.application_container import ApplicationContainer
-
-
 def main():
-    app_container = ApplicationContainer()
-    app_container.wire(packages=["gsc"])
+    # The command modules and the container are imported by the invoked command.
+    from gsc.presentation.command_line import cli
+
     cli.app()
 
 
@@ -1,6 +1,11 @@
 import abc
+import json
+import os
+import tempfile
+from contextlib import contextmanager
 from os.path import join, dirname
 import dotenv
+from gsc.constants import DEFAULT_SEARCH_ENGINE
 from gsc.core.base_model import BaseModel
 
 
@@ -11,27 +16,49 @@ class Env(BaseModel):
         self.host_name = kwargs.get("host_name")
         self.private_token = kwargs.get("private_token")
         self.verify_ssl_cert = kwargs.get("verify_ssl_cert")
+        self.page_size = kwargs.get("page_size")
+        self.cache_ttl = kwargs.get("cache_ttl")
 
 
 class BaseConfig(abc.ABC):
-    def __init__(self, file_name: str) -> None:
-        self._config_path = join(dirname(__file__), f"{file_name.lower()}.env")
-        self.__reload_keys()
+    """
+    The keys of the .env file are parsed once and kept in memory. Every change
+    is written at once with an atomic replace of the file, the changes made in
+    a ``batch`` are written together at its end.
+
+    The session keys only live in memory, for the current invocation.
+    """
+
+    def __init__(self, file_name: str, config_dir: str = None) -> None:
+        self._config_path = join(
+            config_dir or dirname(__file__), f"{file_name.lower()}.env"
+        )
+        self._config_dict = dotenv.dotenv_values(self._config_path)
+        self._session_dict = {}
+        self._changed_keys = set()
+        self._batch_depth = 0
 
     def set_key(self, key: str, value: str):
         try:
-            dotenv.set_key(self._config_path, key, value)
-            self.__reload_keys()
+            self._config_dict[key] = value
+            self._changed_keys.add(key)
+            self.__commit()
             return True, None
         except Exception as err:
             return False, err
 
     def get_key(self, key: str) -> str:
+        if key in self._session_dict:
+            return self._session_dict[key]
         return self._config_dict.get(key)
 
     def remove_key(self, key: str):
-        dotenv.unset_key(self._config_path, key)
-        self.__reload_keys()
+        self._config_dict.pop(key, None)
+        self._changed_keys.add(key)
+        self.__commit()
+
+    def set_session_key(self, key: str, value: str):
+        self._session_dict[key] = value
 
     def get_all(self) -> dict:
         return self._config_dict
@@ -39,65 +66,149 @@ class BaseConfig(abc.ABC):
     def has_key(self, key: str):
         return key in self._config_dict
 
-    def __reload_keys(self):
-        self._config_dict = dotenv.dotenv_values(self._config_path)
+    @contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+        self.__commit()
+
+    def save(self):
+        if not self._changed_keys:
+            return
+
+        # Apply only the keys changed here on top of the file, so concurrent
+        # invocations do not overwrite the keys they did not change.
+        config_dict = dotenv.dotenv_values(self._config_path)
+        for key in self._changed_keys:
+            if key in self._config_dict:
+                config_dict[key] = self._config_dict[key]
+            else:
+                config_dict.pop(key, None)
+
+        file_descriptor, temp_path = tempfile.mkstemp(
+            prefix=".", suffix=".tmp", dir=dirname(self._config_path)
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                file.writelines(
+                    self.__format_line(key, value) for key, value in config_dict.items()
+                )
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self._config_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        self._config_dict = config_dict
+        self._changed_keys.clear()
+
+    def __commit(self):
+        if self._batch_depth == 0:
+            self.save()
+
+    @staticmethod
+    def __format_line(key: str, value: str) -> str:
+        if value is None:
+            return f"{key}\n"
+        # Same quoting as dotenv.set_key
+        value = value.replace("\\", "\\\\").replace("'", "\\'")
+        return f"{key}='{value}'\n"
 
 
 class AppConfig(BaseConfig):
     DEBUG_FLAG = "DEBUG"
+    CACHE_FLAG = "CACHE"
+    MAX_RESULTS = "MAX_RESULTS"
+    ENGINE = "ENGINE"
 
-    def __init__(self, _: str = None) -> None:
-        super().__init__(type(self).__name__)
+    def __init__(self, config_dir: str = None) -> None:
+        super().__init__(type(self).__name__, config_dir)
 
+    # The flags of the command line are only kept for the current invocation.
     def set_debug(self, debug):
-        super().set_key(self.DEBUG_FLAG, str(debug))
+        super().set_session_key(self.DEBUG_FLAG, str(debug))
 
     def is_debug(self):
         return super().get_key(self.DEBUG_FLAG) == "True"
 
+    def set_cache_enabled(self, enabled):
+        super().set_session_key(self.CACHE_FLAG, str(enabled))
+
+    def is_cache_enabled(self):
+        return super().get_key(self.CACHE_FLAG) != "False"
+
+    def set_max_results(self, max_results):
+        super().set_session_key(self.MAX_RESULTS, str(max_results))
+
+    def get_max_results(self):
+        value = super().get_key(self.MAX_RESULTS)
+        return int(value) if value and value.isdigit() else None
+
+    def set_engine(self, engine):
+        super().set_session_key(self.ENGINE, engine)
+
+    def get_engine(self):
+        return super().get_key(self.ENGINE) or DEFAULT_SEARCH_ENGINE
+
 
 class EnvConfig(BaseConfig):
     DEFAULT_ENV = "DEFAULT_ENV"
     SESSION_ENV = "SESSION_ENV"
 
-    def __init__(self, _=None) -> None:
-        super().__init__(type(self).__name__)
+    def __init__(self, config_dir: str = None) -> None:
+        super().__init__(type(self).__name__, config_dir)
         self._exclude_keys = [self.DEFAULT_ENV, self.SESSION_ENV]
-        self._all_envs = None
-        self.__reload_envs()
+        # Envs decoded from JSON on first use
+        self._envs = {}
 
     def set_env(self, env: Env):
-        # Automatically set new env as default if there is no any env before
-        if len(self._all_envs) == 0:
-            super().set_key(self.DEFAULT_ENV, env.name)
+        with self.batch():
+            # Automatically set new env as default if there is no any env before
+            if len(self.get_all_envs()) == 0:
+                super().set_key(self.DEFAULT_ENV, env.name)
 
-        super().set_key(env.name, env.to_json_string())
-        self.__reload_envs()
+            super().set_key(env.name, env.to_json_string())
+        self._envs[env.name] = env
         return True, None
 
     def get_env(self, name: str) -> Env:
+        if name in self._envs:
+            return self._envs[name]
+
         str_value = super().get_key(name)
-        if not str_value:
+        if not str_value or name in self._exclude_keys:
             return None
 
-        return Env.from_json(str_value)
+        # Plain JSON, no need to load jsonpickle to read the envs
+        env = Env(**json.loads(str_value))
+        self._envs[name] = env
+        return env
 
     def get_all_envs(self) -> list:
-        return self._all_envs
+        return [
+            self.get_env(key)
+            for key, value in super().get_all().items()
+            if (key not in self._exclude_keys) and value
+        ]
 
     def remove_env(self, name: str):
         if not self.is_env_existed(name):
             return
 
-        super().remove_key(name)
-        self.__reload_envs()
+        with self.batch():
+            super().remove_key(name)
+            self._envs.pop(name, None)
 
-        # Re-select the default env. If there is any env existed, select the top env.
-        list_env_empty = len(self._all_envs) == 0
-        if self.get_default_env() is None and not list_env_empty:
-            self.set_default_env(self._all_envs[0].name)
-        else:
-            self.remove_default_env()
+            # Re-select the default env. If there is any env existed, select the top env.
+            all_envs = self.get_all_envs()
+            if self.get_default_env() is None and len(all_envs) > 0:
+                self.set_default_env(all_envs[0].name)
+            else:
+                self.remove_default_env()
 
     def is_env_existed(self, name: str) -> bool:
         return self.has_key(name)
@@ -126,14 +237,13 @@ class EnvConfig(BaseConfig):
         if not self.is_env_existed(name):
             return False, ValueError("Value is not existed.")
 
-        return super().set_key(self.SESSION_ENV, name)
+        super().set_session_key(self.SESSION_ENV, name)
+        return True, None
 
-    def __reload_envs(self):
-        self._all_envs = [
-            Env.from_json(value)
-            for key, value in super().get_all().items()
-            if (key not in self._exclude_keys) and value
-        ]
+    def save(self):
+        super().save()
+        # The file may have been changed by another invocation.
+        self._envs.clear()
 
 
 class GitLabConfig(EnvConfig):
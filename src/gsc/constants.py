@@ -1,17 +1,38 @@
 APP_NAME = "git_search_command"
+# Maximum number of items per page allowed by both GitLab and GitHub APIs
+API_PAGE_SIZE_MAX = 100
+# Stop paging through the search results of a project / repository after this
+SEARCH_MAX_RESULTS = 1000
+# Search with the search api, in local mirrors of the projects or with the
+# trigram index of the mirrors
+SEARCH_ENGINES = ("api", "mirror", "index")
+DEFAULT_SEARCH_ENGINE = "api"
+# Seconds a cached response is fresh when the env does not set it
+DEFAULT_CACHE_TTL = 3600
 
 
 class GitLabConstant:
     NAME = "GitLab"
-    GROUP_API_LIMIT = 10
+    GROUP_API_LIMIT = API_PAGE_SIZE_MAX
     SEARCH_API_LIMIT = 100
     SEARCH_RATE_LIMIT_CALLS = 60
     SEARCH_RATE_LIMIT_PERIOD = 60
+    SEARCH_RATE_LIMIT_INTERVAL = 0.5
 
 
 class GitHubConstant:
     NAME = "GitHub"
-    REPOSITORY_LIST_API_LIMIT = 10
+    REPOSITORY_LIST_API_LIMIT = API_PAGE_SIZE_MAX
     SEARCH_API_LIMIT = 100
     SEARCH_RATE_LIMIT_CALLS = 30
     SEARCH_RATE_LIMIT_PERIOD = 60
+    SEARCH_RATE_LIMIT_INTERVAL = 1
+    # Maximum length of the search query accepted by the server
+    SEARCH_QUERY_MAX_LENGTH = 256
+    # Maximum number of AND / OR / NOT operators in a search query
+    SEARCH_MAX_OPERATORS = 5
+    # "packed" : repo: qualifiers packed into as few queries as possible
+    # "owner" : one user: / org: qualifier per owner of the repositories
+    # "repo" : one query per repository
+    SEARCH_MODES = ("packed", "owner", "repo")
+    DEFAULT_SEARCH_MODE = "packed"
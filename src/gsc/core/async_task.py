@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from functools import wraps
+from rx import create, core
+from rx.disposable import Disposable
+from gsc.core.retry import RetryLater, deferred_retries
+
+DEFAULT_CONCURRENCY = 32
+
+
+class AsyncEngine:
+    """
+    Run tasks on a single asyncio event loop living in a background thread.
+
+    The number of tasks in flight is bounded by a semaphore instead of the
+    size of rx pool scheduler. Coroutine functions are awaited on the loop,
+    blocking functions (``requests`` calls) are dispatched to an I/O executor
+    sized to the concurrency limit. Results are bridged back to rx Observables.
+
+    The HTTP calls are still blocking, so every request in flight holds one
+    executor thread just like the rx pool scheduler does. What the loop saves
+    are the threads waiting for the rate limiter or a throttled retry, which
+    are awaited on the loop instead.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY) -> None:
+        self.concurrency = concurrency
+        self.enabled = False
+        self._loop = None
+        self._semaphore = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def configure(self, concurrency: int = None, enabled: bool = True):
+        with self._lock:
+            self.concurrency = concurrency or self.concurrency
+            self.enabled = enabled
+            if self._loop is not None:
+                # Apply the new limit on the running loop
+                self._loop.call_soon_threadsafe(self.__create_semaphore)
+                self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+                self._loop.call_soon_threadsafe(self.__create_semaphore)
+                thread = threading.Thread(
+                    target=self._loop.run_forever, name="gsc-async-engine", daemon=True
+                )
+                thread.start()
+            return self._loop
+
+    def submit(self, func, *args, **kwargs) -> core.Observable:
+        def subscribe(observer, _=None):
+            disposed = threading.Event()
+            future = asyncio.run_coroutine_threadsafe(
+                self.__run(observer, disposed, func, *args, **kwargs), self.loop
+            )
+
+            def dispose():
+                disposed.set()
+                future.cancel()
+
+            return Disposable(dispose)
+
+        return create(subscribe)
+
+    async def __run(self, observer, disposed, func, *args, **kwargs):
+        retry_state = None
+        while True:
+            try:
+                await self.__call(
+                    observer, disposed, func, retry_state, *args, **kwargs
+                )
+                observer.on_completed()
+                return
+            except RetryLater as retry:
+                # Reschedule the throttled request, no thread waits meanwhile.
+                retry_state = retry.state
+                await asyncio.sleep(retry.delay)
+            except Exception as err:
+                observer.on_error(err)
+                return
+
+    # pylint: disable=too-many-arguments
+    async def __call(self, observer, disposed, func, retry_state, *args, **kwargs):
+        limiter = getattr(func, "rate_limiter", None)
+        reserved = nullcontext()
+        if limiter is not None and not asyncio.iscoroutinefunction(func):
+            # Wait for the rate limiter on the loop instead of an executor thread.
+            key = limiter.key_of(args)
+            await limiter.acquire_async(key)
+            reserved = limiter.reserved(key)
+
+        def call():
+            # Only the first request can be rescheduled, the next pages of a
+            # generator are sent while emitting.
+            with deferred_retries(retry_state), reserved:
+                value = func(*args, **kwargs)
+            emit(observer, value, disposed)
+
+        async with self._semaphore:
+            if asyncio.iscoroutinefunction(func):
+                emit(observer, await func(*args, **kwargs), disposed)
+            else:
+                await self._loop.run_in_executor(self._executor, call)
+
+    def __create_semaphore(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+
+def emit(observer, value, disposed: threading.Event = None):
+    """
+    Emit the items of value, a generator stops being iterated (its next
+    pages are not requested) once the subscription is disposed.
+    """
+    if isinstance(value, types.GeneratorType):
+        with closing(value):
+            for data in value:
+                emit(observer, data, disposed)
+                if disposed is not None and disposed.is_set():
+                    break
+    elif isinstance(value, list):
+        for item in value:
+            observer.on_next(item)
+    else:
+        observer.on_next(value)
+
+
+async_engine = AsyncEngine()
+
+
+def async_task(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> core.Observable:
+        return async_engine.submit(func, *args, **kwargs)
+
+    return wrapper
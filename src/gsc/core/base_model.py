@@ -1,17 +1,70 @@
 import abc
 from dataclasses import dataclass
-import jsonpickle
 
 
 @dataclass
 class BaseModel(abc.ABC):
+    __slots__ = ()
+
     def __str__(self) -> str:
-        return jsonpickle.encode(self.__dict__)
+        return self.to_json_string()
+
+    def to_dict(self) -> dict:
+        return self.__dict__
 
     def to_json_string(self) -> str:
-        return jsonpickle.encode(self.__dict__)
+        import jsonpickle  # pylint: disable=C0415
+
+        return jsonpickle.encode(self.to_dict())
 
     @classmethod
     def from_json(cls, json_str: str):
+        import jsonpickle  # pylint: disable=C0415
+
         attr_dict = jsonpickle.decode(json_str)
         return cls(**attr_dict)
+
+
+class SlotModel(BaseModel):
+    """
+    Compact model for the objects created in large numbers (search hits).
+
+    The attributes are the ``__slots__`` of the class, there is no instance
+    ``__dict__``. Attributes missing from the arguments take the value of
+    ``_defaults``.
+    """
+
+    __slots__ = ()
+    _defaults = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Generate the __init__ like dataclass does, a generic loop of setattr
+        # is slower than the former dataclass.
+        args = ", ".join(
+            f"{name}=_defaults[{name!r}]" if name in cls._defaults else name
+            for name in cls.__slots__
+        )
+        body = "".join(f"\n    self.{name} = {name}" for name in cls.__slots__)
+        namespace = {}
+        # pylint: disable=exec-used
+        exec(
+            f"def __init__(self, {args}):{body or ' pass'}",
+            {"_defaults": cls._defaults},
+            namespace,
+        )
+        cls.__init__ = namespace["__init__"]
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(f"{name}={value!r}" for name, value in self.to_dict().items())
+        return f"{type(self).__name__}({attrs})"
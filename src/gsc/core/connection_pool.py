@@ -0,0 +1,90 @@
+import threading
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+import requests
+from gsc.core.rx_task import optimal_thread_count
+
+# Number of host pools kept by each adapter, one session only talks to one host.
+DEFAULT_POOL_CONNECTIONS = 4
+# Keep one connection per worker thread of rx pool scheduler.
+DEFAULT_POOL_MAXSIZE = optimal_thread_count
+
+
+@dataclass
+class ConnectionStats:
+    opened: int = 0
+    reused: int = 0
+
+    def __str__(self) -> str:
+        return f"Connections : {self.opened} opened, {self.reused} reused"
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions = {}
+        self._lock = threading.RLock()
+
+    def configure(self, pool_connections: int = None, pool_maxsize: int = None):
+        with self._lock:
+            self.pool_connections = pool_connections or self.pool_connections
+            self.pool_maxsize = pool_maxsize or self.pool_maxsize
+            # Sessions are re-created with the new limits on the next request.
+            self.close()
+
+    def session(self, host: str, ssl_verify=True) -> requests.Session:
+        key = (host, ssl_verify)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self.__create_session(host, ssl_verify)
+                self._sessions[key] = session
+            return session
+
+    def stats(self) -> ConnectionStats:
+        opened = 0
+        requested = 0
+        with self._lock:
+            for session in self._sessions.values():
+                for adapter in set(session.adapters.values()):
+                    pools = adapter.poolmanager.pools
+                    for key in pools.keys():
+                        pool = pools.get(key)
+                        if pool is None:
+                            continue
+                        opened += pool.num_connections
+                        requested += pool.num_requests
+        return ConnectionStats(opened=opened, reused=max(0, requested - opened))
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+    def __create_session(self, host: str, ssl_verify) -> requests.Session:
+        # Only connection errors are retried here, the responses are retried by
+        # the retry policy of Api object.
+        retries = Retry(
+            total=2, backoff_factor=0.5, status=0, respect_retry_after_header=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retries,
+        )
+
+        session = requests.Session()
+        session.mount(host, adapter)
+        session.verify = ssl_verify
+        return session
+
+
+# Shared by all Api objects, one session (and connection pool) per host.
+http_pool = ConnectionPool()
@@ -0,0 +1,284 @@
+import base64
+import os
+import re
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from os.path import exists, join
+from urllib.parse import urlparse
+from gsc.core.response_cache import CACHE_DIR
+
+MIRROR_DIR = join(CACHE_DIR, "mirrors")
+# Number of git fetch run at the same time, each one is a network transfer.
+DEFAULT_FETCH_WORKERS = 4
+VERSION_KEY = "gsc.version"
+# Only the branches are fetched, the search reads the default branch. The
+# other refs (pull / merge requests, keep-around) would grow the mirrors.
+FETCH_REFSPEC = "+refs/heads/*:refs/heads/*"
+# The git configuration is given in environment variables since git 2.31
+MIN_GIT_VERSION = (2, 31)
+
+# Status of a mirror after a refresh
+MIRROR_UNCHANGED = "unchanged"
+MIRROR_CLONED = "cloned"
+MIRROR_FETCHED = "fetched"
+# The fetch failed, the mirror is kept as is
+MIRROR_OFFLINE = "offline"
+
+
+class GitMirrorError(Exception):
+    pass
+
+
+class GitMirror:
+    """
+    Bare mirror of one remote repository. The credentials are passed to git in
+    the environment of the clone and fetch commands, ``env_of`` returns them
+    for the url of the remote. They are never written in the mirror.
+    """
+
+    def __init__(self, git_dir: str, env_of=None) -> None:
+        self.git_dir = git_dir
+        self._env_of = env_of
+
+    def exists(self) -> bool:
+        return exists(join(self.git_dir, "HEAD"))
+
+    def sync(self, url: str = None):
+        """
+        Clone the branches of the remote repository at ``url`` the first time,
+        then fetch their changes.
+        """
+        if self.exists():
+            # The refspec is given to the fetch, the mirrors cloned with all
+            # refs only update their branches.
+            self.run_git(
+                "--git-dir",
+                self.git_dir,
+                "fetch",
+                "--prune",
+                "--quiet",
+                "origin",
+                FETCH_REFSPEC,
+                env=self.__remote_env(self.url),
+            )
+        elif url:
+            os.makedirs(os.path.dirname(self.git_dir), exist_ok=True)
+            self.run_git(
+                "clone",
+                "--bare",
+                "--quiet",
+                url,
+                self.git_dir,
+                env=self.__remote_env(url),
+            )
+            # A bare clone has no refspec, set it for the git commands run by
+            # hand in the mirror.
+            self.git("config", "remote.origin.fetch", FETCH_REFSPEC)
+        else:
+            raise GitMirrorError(f"No mirror at {self.git_dir} and no url to clone")
+
+    @property
+    def url(self) -> str:
+        return self.__config("remote.origin.url")
+
+    @property
+    def version(self) -> str:
+        """
+        Version of the remote project (last activity) when it was synced.
+        """
+        return self.__config(VERSION_KEY)
+
+    @version.setter
+    def version(self, value: str):
+        self.git("config", VERSION_KEY, value)
+
+    def head(self, ref: str = "HEAD") -> str:
+        return self.git("rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}").strip()
+
+    def head_ref(self) -> str:
+        """
+        Name of the default branch.
+        """
+        return self.git("symbolic-ref", "--short", "HEAD").strip()
+
+    def git(self, *args: str) -> str:
+        return self.run_git("--git-dir", self.git_dir, *args)
+
+    def run_git(self, *args: str, env: dict = None) -> str:
+        return run_git(*args, env=env)
+
+    def __remote_env(self, url: str) -> dict:
+        return self._env_of(url) if self._env_of and url else {}
+
+    def __config(self, key: str) -> str:
+        try:
+            return self.git("config", "--get", key).strip() or None
+        except GitMirrorError:
+            return None
+
+
+class MirrorStore:
+    """
+    The mirrors of one env, one per project.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        *namespace: str,
+        user: str = None,
+        token: str = None,
+        verify_ssl: bool = True,
+        root_dir: str = MIRROR_DIR,
+    ) -> None:
+        self._dir = join(root_dir, *[str(name).lower() for name in namespace])
+        self._user = user
+        self._token = token
+        self._verify_ssl = verify_ssl
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def mirror(self, key) -> GitMirror:
+        return GitMirror(join(self._dir, f"{key}.git"), self.__config_env)
+
+    def sync(self, key, version: str = None, resolve_url=None) -> GitMirror:
+        """
+        Return the mirror of project ``key`` synced at ``version``, see
+        ``refresh``.
+        """
+        return self.refresh(key, version, resolve_url)[0]
+
+    def refresh(self, key, version: str = None, resolve_url=None) -> tuple:
+        """
+        Sync the mirror of project ``key`` at ``version`` and return (mirror,
+        status). The mirror is only fetched when the version changed,
+        ``resolve_url`` is called to get the url of the project the first time.
+
+        When the fetch fails (no network) an existing mirror is returned as is.
+        """
+        mirror = self.mirror(key)
+        with self.__lock(key):
+            if mirror.exists() and version and mirror.version == version:
+                return mirror, MIRROR_UNCHANGED
+
+            status = MIRROR_FETCHED if mirror.exists() else MIRROR_CLONED
+            if self._token or self._verify_ssl is False:
+                # An older git ignores the configuration, the clone of a
+                # private project would fail on an authentication prompt.
+                check_git_version()
+            try:
+                mirror.sync(None if mirror.exists() else resolve_url())
+            except GitMirrorError:
+                if not mirror.exists():
+                    raise
+                return mirror, MIRROR_OFFLINE
+
+            if version:
+                mirror.version = version
+        return mirror, status
+
+    def __lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def __config_env(self, url: str) -> dict:
+        return git_config_env(url, self._user, self._token, self._verify_ssl)
+
+
+class MirrorPool:
+    """
+    Bounded pool of the mirror syncs, the other syncs wait for a free worker.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_FETCH_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def configure(self, max_workers: int = None):
+        with self._lock:
+            self.max_workers = max_workers or self.max_workers
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def submit(self, func, *args, **kwargs):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="gsc-fetch"
+                )
+            return self._executor.submit(func, *args, **kwargs)
+
+
+def run_git(*args: str, env: dict = None) -> str:
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0", **(env or {}))
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as err:
+        message = getattr(err, "stderr", None) or str(err)
+        if isinstance(message, bytes):
+            message = message.decode("utf-8", "replace")
+        raise GitMirrorError(message.strip()) from err
+    return result.stdout.decode("utf-8", "replace")
+
+
+@lru_cache(maxsize=None)
+def git_version() -> tuple:
+    """
+    Version of the installed git, (major, minor, patch).
+    """
+    output = run_git("--version")
+    match = re.search(r"(\d+)\.(\d+)(?:\.(\d+))?", output)
+    if match is None:
+        raise GitMirrorError(f"Unknown git version : {output.strip()}")
+    return tuple(int(number or 0) for number in match.groups())
+
+
+def check_git_version():
+    version = git_version()
+    if version[:2] < MIN_GIT_VERSION:
+        required = ".".join(str(number) for number in MIN_GIT_VERSION)
+        found = ".".join(str(number) for number in version)
+        raise GitMirrorError(
+            f"git >= {required} is required to pass the credentials of the "
+            f"mirrors to git, found git {found}."
+        )
+
+
+def git_config_env(
+    url: str, user: str = None, token: str = None, verify_ssl=True
+) -> dict:
+    """
+    Git configuration given in environment variables (git >= 2.31), so the
+    token does not appear in the command line nor in the mirror config. The
+    configuration only applies to the host of ``url``, the header is not sent
+    to the other hosts (redirects, submodules).
+    """
+    parsed = urlparse(url)
+    host = parsed.netloc.rpartition("@")[2]
+    scope = f"http.{parsed.scheme}://{host}/" if host else "http"
+    config = {}
+    if token:
+        credentials = base64.b64encode(f"{user}:{token}".encode()).decode()
+        config[f"{scope}.extraHeader"] = f"Authorization: Basic {credentials}"
+    if verify_ssl is False:
+        config[f"{scope}.sslVerify"] = "false"
+
+    env = {"GIT_CONFIG_COUNT": str(len(config))}
+    for index, (key, value) in enumerate(config.items()):
+        env[f"GIT_CONFIG_KEY_{index}"] = key
+        env[f"GIT_CONFIG_VALUE_{index}"] = value
+    return env
+
+
+# Shared by all the mirror repositories.
+mirror_pool = MirrorPool()
@@ -0,0 +1,121 @@
+import codecs
+import json
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+
+class JsonStream:
+    """
+    Decode a JSON document incrementally from chunks of bytes.
+
+    Iterating yields the items of the top-level array, or of the array at
+    ``items_key`` in the top-level object, one by one. Only the item being
+    decoded is kept in memory, not the whole body. The other members of the
+    top-level object are stored in ``fields`` as they are read.
+    """
+
+    def __init__(self, chunks, items_key: str = None) -> None:
+        self.items_key = items_key
+        self.fields = {}
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        char = self.__peek()
+        if char == "[":
+            yield from self.__array()
+        elif char == "{":
+            yield from self.__object()
+        elif char is not None:
+            yield self.__value()
+
+    def __array(self):
+        self.__expect("[")
+        if self.__peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.__value()
+            char = self.__peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self.__error("Expecting ',' delimiter")
+
+    def __object(self):
+        self.__expect("{")
+        char = self.__peek()
+        while char != "}":
+            key = self.__value()
+            self.__expect(":")
+            if key == self.items_key and self.__peek() == "[":
+                yield from self.__array()
+            else:
+                self.fields[key] = self.__value()
+
+            char = self.__peek()
+            if char == ",":
+                self._pos += 1
+            elif char != "}":
+                self.__error("Expecting ',' delimiter")
+        self._pos += 1
+
+        if self.items_key is None:
+            yield self.fields
+
+    def __value(self):
+        self.__peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self.__fill():
+                    continue
+                raise
+            # A number or literal may continue in the next chunk.
+            if end == len(self._buffer) and self.__fill():
+                continue
+            self._pos = end
+            return value
+
+    def __peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self.__fill():
+                return None
+
+    def __expect(self, char: str):
+        if self.__peek() != char:
+            self.__error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def __fill(self) -> bool:
+        if self._eof:
+            return False
+
+        text = ""
+        while not text:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                text = self._text_decoder.decode(b"", final=True)
+                break
+            text = self._text_decoder.decode(chunk)
+
+        # Drop the decoded part, the buffer only holds the current item.
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return bool(text) or not self._eof
+
+    def __error(self, message: str):
+        raise json.JSONDecodeError(message, self._buffer, self._pos)
@@ -0,0 +1,156 @@
+import re
+import subprocess
+from collections import deque
+from os.path import basename, splitext
+from gsc.core.local_search import (
+    BINARY_CHECK_SIZE,
+    branch_name,
+    list_blobs,
+    preview_range,
+    read_blobs,
+)
+
+LOWER = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+
+
+class KeywordScanner:
+    """
+    Find all the keywords (case insensitive) in one pass over the content,
+    with an Aho-Corasick automaton.
+
+    Stepping the automaton byte by byte in Python is slow, so a compiled
+    alternation of the keywords first jumps to the next position where a
+    keyword starts. The automaton runs from there until it is back to its
+    root, it reports the overlapping keywords and the keywords which are a
+    prefix of another one, then the jump is done again.
+    """
+
+    def __init__(self, keywords: list) -> None:
+        self.keywords = list(dict.fromkeys(keyword for keyword in keywords if keyword))
+        patterns = [keyword.lower().encode("utf-8") for keyword in self.keywords]
+        self._lengths = [len(pattern) for pattern in patterns]
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for number, pattern in enumerate(patterns):
+            self.__add(number, pattern)
+        self.__link()
+
+        self._prefilter = None
+        if patterns:
+            alternation = b"|".join(
+                re.escape(pattern)
+                for pattern in sorted(patterns, key=len, reverse=True)
+            )
+            self._prefilter = re.compile(alternation, re.IGNORECASE)
+
+    def scan(self, content: bytes):
+        """
+        Yield (offset, keyword number) of all the matches in content, ordered
+        by end offset.
+        """
+        if self._prefilter is None:
+            return
+        goto, fail, output = self._goto, self._fail, self._output
+        lengths = self._lengths
+        size = len(content)
+        search = self._prefilter.search
+        match = search(content)
+        while match:
+            position = match.start()
+            state = 0
+            while position < size:
+                byte = LOWER[content[position]]
+                while state and byte not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(byte, 0)
+                for number in output[state]:
+                    yield position - lengths[number] + 1, number
+                position += 1
+                if not state:
+                    break
+            match = search(content, position)
+
+    def __add(self, number: int, pattern: bytes):
+        state = 0
+        for byte in pattern:
+            if byte not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][byte] = len(self._goto) - 1
+            state = self._goto[state][byte]
+        self._output[state].append(number)
+
+    def __link(self):
+        # Breadth first, the failure of a state is deeper than its parent's.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for byte, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and byte not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(byte, 0)
+                self._output[child] = (
+                    self._output[child] + self._output[self._fail[child]]
+                )
+
+
+def scan_content(scanner: KeywordScanner, path: str, content: bytes, ref: str) -> list:
+    """
+    Return one item per keyword found in the content of file, with the keys of
+    a ``search_tree`` item, the ``keyword`` and the (line, offset) of all its
+    ``matches``.
+    """
+    matches = {}
+    line = 1
+    last = 0
+    for offset, number in sorted(scanner.scan(content)):
+        # Count the lines in the gaps between the matches.
+        line += content.count(b"\n", last, offset)
+        last = offset
+        matches.setdefault(number, []).append((line, offset))
+
+    items = []
+    for number, positions in sorted(matches.items()):
+        line, offset = positions[0]
+        start, end = preview_range(content, offset)
+        preview = content[start:end].decode("utf-8", "replace")
+        if not preview.endswith("\n"):
+            preview += "\n"
+        items.append(
+            {
+                "basename": splitext(basename(path))[0],
+                "path": path,
+                "ref": ref,
+                "startline": line - content[start:offset].count(b"\n"),
+                "data": preview,
+                "keyword": scanner.keywords[number],
+                "matches": positions,
+            }
+        )
+    return items
+
+
+def scan_tree(git_dir: str, keywords: list, ref: str = "HEAD") -> list:
+    """
+    Search the keywords in the files of the ``ref`` tree of a bare repository,
+    each blob is read once for all keywords. Return the items of
+    ``scan_content``.
+    """
+    scanner = KeywordScanner(keywords)
+    try:
+        blobs = list_blobs(git_dir, ref)
+    except subprocess.CalledProcessError:
+        # Empty repository
+        return []
+    branch = branch_name(git_dir, ref)
+
+    items = []
+    for path, content in read_blobs(git_dir, blobs):
+        if b"\0" in content[:BINARY_CHECK_SIZE]:
+            continue
+        items.extend(scan_content(scanner, path, content, branch))
+    return items
@@ -0,0 +1,192 @@
+import multiprocessing
+import os
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from os.path import basename, splitext
+
+# Same limit as the blob search of GitLab, bigger files are not indexed.
+MAX_FILE_SIZE = 1024 * 1024
+# A file with a NUL byte in the first bytes is treated as binary, like git.
+BINARY_CHECK_SIZE = 8000
+# Lines shown around the first match of a file.
+PREVIEW_CONTEXT_LINES = 1
+
+
+def search_tree(git_dir: str, keyword: str, ref: str = "HEAD") -> list:
+    """
+    Search the keyword (case insensitive) in the files of the ``ref`` tree of
+    a bare repository. Return one item per matching file, with the same keys
+    as a GitLab blob search result.
+    """
+    pattern = keyword.lower().encode("utf-8")
+    try:
+        blobs = list_blobs(git_dir, ref)
+    except subprocess.CalledProcessError:
+        # Empty repository
+        return []
+    branch = branch_name(git_dir, ref)
+
+    items = []
+    for path, content in read_blobs(git_dir, blobs):
+        if b"\0" in content[:BINARY_CHECK_SIZE]:
+            continue
+        position = content.lower().find(pattern)
+        if position < 0:
+            continue
+
+        startline, preview = preview_lines(content, position)
+        items.append(
+            {
+                "basename": splitext(basename(path))[0],
+                "path": path,
+                "ref": branch,
+                "startline": startline,
+                "data": preview,
+            }
+        )
+    return items
+
+
+def list_blobs(git_dir: str, ref: str) -> list:
+    """
+    Return the (path, object id) of the regular files of the tree.
+    """
+    output = git(git_dir, "ls-tree", "-r", "-l", "-z", "--full-tree", ref)
+    blobs = []
+    for entry in output.split(b"\0"):
+        if not entry:
+            continue
+        info, path = entry.split(b"\t", 1)
+        mode, object_type, object_id, size = info.split()
+        # Skip the submodules, symbolic links and big files
+        if object_type != b"blob" or mode == b"120000":
+            continue
+        if int(size) > MAX_FILE_SIZE:
+            continue
+        blobs.append((path.decode("utf-8", "replace"), object_id.decode()))
+    return blobs
+
+
+def read_blobs(git_dir: str, blobs: list):
+    """
+    Yield (path, content) of the blobs, read with one git cat-file process.
+    """
+    if not blobs:
+        return
+
+    with subprocess.Popen(
+        ["git", "--git-dir", git_dir, "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    ) as process:
+        # Write the ids from another thread, git blocks when its output is full.
+        writer = threading.Thread(
+            target=write_ids, args=(process.stdin, blobs), daemon=True
+        )
+        writer.start()
+        for path, _ in blobs:
+            header = process.stdout.readline().split()
+            if len(header) < 3 or header[1] != b"blob":
+                continue
+            content = process.stdout.read(int(header[2]))
+            process.stdout.read(1)
+            yield path, content
+        writer.join()
+
+
+def write_ids(stream, blobs: list):
+    try:
+        stream.write(b"".join(f"{object_id}\n".encode() for _, object_id in blobs))
+        stream.close()
+    except OSError:
+        pass
+
+
+def preview_lines(content: bytes, position: int) -> tuple:
+    """
+    Return the line number (1-based) of the first line of the preview, and
+    the lines around the match at ``position``.
+    """
+    start, end = preview_range(content, position)
+    preview = content[start:end].decode("utf-8", "replace")
+    if not preview.endswith("\n"):
+        preview += "\n"
+    return content.count(b"\n", 0, start) + 1, preview
+
+
+def preview_range(content, position: int) -> tuple:
+    """
+    Return the (start, end) offsets of the lines around the match at
+    ``position``.
+    """
+    start = content.rfind(b"\n", 0, position) + 1
+    for _ in range(PREVIEW_CONTEXT_LINES):
+        if start == 0:
+            break
+        start = content.rfind(b"\n", 0, start - 1) + 1
+
+    end = position
+    for _ in range(PREVIEW_CONTEXT_LINES + 1):
+        newline = content.find(b"\n", end)
+        if newline < 0:
+            end = len(content)
+            break
+        end = newline + 1
+        if end >= len(content):
+            break
+    return start, end
+
+
+def branch_name(git_dir: str, ref: str) -> str:
+    if ref != "HEAD":
+        return ref
+    try:
+        return git(git_dir, "symbolic-ref", "--short", "HEAD").decode().strip()
+    except subprocess.CalledProcessError:
+        return ref
+
+
+def git(git_dir: str, *args: str) -> bytes:
+    return subprocess.run(
+        ["git", "--git-dir", git_dir, *args],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    ).stdout
+
+
+class LocalSearchEngine:
+    """
+    Run the local searches on a pool of processes, scanning the files is
+    CPU bound and would hold the GIL of the rx threads.
+    """
+
+    def __init__(self, max_workers: int = None) -> None:
+        self.max_workers = max_workers or os.cpu_count()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def configure(self, max_workers: int = None):
+        with self._lock:
+            self.max_workers = max_workers or self.max_workers
+            self.shutdown()
+
+    def submit(self, func, *args):
+        with self._lock:
+            if self._executor is None:
+                # Spawn the workers, forking a process running threads is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor.submit(func, *args)
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Shared by all the mirror repositories.
+local_search_engine = LocalSearchEngine()
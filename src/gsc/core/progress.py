@@ -0,0 +1,57 @@
+import threading
+
+
+class Progress:
+    """
+    Count the items received against the total announced by the server
+    (``total_count`` / ``X-Total``), shared by all requests of a search.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.done = 0
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def add_total(self, total: int):
+        with self._lock:
+            self.total += total
+        self.__notify()
+
+    def advance(self, count: int):
+        with self._lock:
+            self.done += count
+        self.__notify()
+
+    def reset(self):
+        with self._lock:
+            self.total = 0
+            self.done = 0
+
+    @property
+    def percent(self) -> float:
+        return min(100.0, self.done * 100 / self.total) if self.total else 0.0
+
+    def __notify(self):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(self)
+
+    def __str__(self) -> str:
+        return (
+            f"{min(self.done, self.total)}/{self.total} results ({self.percent:.0f}%)"
+        )
+
+
+# Shared by the search requests, displayed by the print observer.
+search_progress = Progress()
@@ -1,10 +1,21 @@
 from typing import Any
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
 from functools import wraps
 from math import floor
+import asyncio
 import time
 import sys
 import threading
 
+# Quota headers advertised by the server, GitLab first then GitHub.
+REMAINING_HEADERS = ("RateLimit-Remaining", "X-RateLimit-Remaining")
+RESET_HEADERS = ("RateLimit-Reset", "X-RateLimit-Reset")
+
+_context = threading.local()
+_limiters = []
+
 
 def now():
     if hasattr(time, "monotonic"):
@@ -12,61 +23,233 @@ def now():
     return time.time
 
 
-class RateLimitException(Exception):
-    def __init__(self, message, period_remaining):
-        super().__init__(message)
-        self.period_remaining = period_remaining or None
+def report_response(headers: dict, status_code: int = None):
+    """
+    Forward the response headers to the rate limiter which is wrapping the
+    current call on this thread, if any.
+    """
+    reporter = getattr(_context, "reporter", None)
+    if reporter is not None:
+        reporter(headers, status_code)
+
+
+def rate_limit_stats():
+    stats = RateLimitStats()
+    for limiter in _limiters:
+        stats.merge(limiter.stats())
+    return stats
+
+
+@dataclass
+class RateLimitStats:
+    calls: int = 0
+    total_wait: float = 0
+    max_wait: float = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.calls if self.calls else 0
+
+    def merge(self, other: "RateLimitStats"):
+        self.calls += other.calls
+        self.total_wait += other.total_wait
+        self.max_wait = max(self.max_wait, other.max_wait)
+        self.queue_depth += other.queue_depth
+        self.max_queue_depth = max(self.max_queue_depth, other.max_queue_depth)
+
+    def __str__(self) -> str:
+        return (
+            f"Rate limit : {self.calls} calls, "
+            f"{self.average_wait:.2f}s average wait, {self.max_wait:.2f}s max wait, "
+            f"{self.max_queue_depth} max queue depth"
+        )
+
+
+class Quota:
+    def __init__(self, remaining: int, reset_at: float) -> None:
+        self.remaining = remaining
+        self.reset_at = reset_at
 
 
 class RateLimitDecorator:
-    def __init__(self, calls, period, callback_clock=now()) -> None:
+    """
+    Sliding log rate limiter: at most ``calls`` calls start in any ``period``,
+    two calls start at least ``min_interval`` apart.
+
+    Every call reserves its start time under the lock, so the waiting calls are
+    served in arrival order (FIFO) and nobody busy-retries. Once the server
+    has advertised a quota (see ``report_response``), the remaining calls are
+    also spread over the time left until the quota resets. The quota may be
+    a broader throttle than the endpoint (GitLab advertises the general API
+    limit), so a call waits for the later of the two starts.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, calls, period, min_interval=0, callback_clock=now()) -> None:
         self.clamped_calls = max(1, min(sys.maxsize, floor(calls)))
         self.period = period
+        self.min_interval = min_interval
         self.callback_clock = callback_clock
 
-        # Initialise the decorator state.
-        self.last_reset = callback_clock()
-        self.num_calls = 0
+        # Start time of the latest calls, reserved in arrival order.
+        self.reservations = deque(maxlen=self.clamped_calls)
+
+        # Quota advertised by the server, shared by all threads using the same token.
+        self.quotas = {}
+
+        self._stats = RateLimitStats()
+        self._waiting = []
 
         # Add thread safety.
         self.lock = threading.RLock()
+        _limiters.append(self)
 
     def __call__(self, func) -> Any:
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = self.key_of(args)
+                await self.acquire_async(key)
+                return await self.call_async(key, func, *args, **kwargs)
+
+            async_wrapper.rate_limiter = self
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            while True:
-                try:
-                    return self.__handle_function_call(func, *args, **kwargs)
-                except RateLimitException as exception:
-                    if exception.period_remaining is not None:
-                        time.sleep(exception.period_remaining)
-                    else:
-                        raise exception
+            key = self.key_of(args)
+            self.acquire(key)
+            return self.call(key, func, *args, **kwargs)
 
+        wrapper.rate_limiter = self
         return wrapper
 
-    def __handle_function_call(self, func, *args, **kwargs):
+    @staticmethod
+    def key_of(args: tuple):
+        # The first argument is the Api object when decorating a request.
+        return getattr(args[0], "rate_limit_key", None) if args else None
+
+    def acquire(self, key=None):
+        if getattr(_context, "reserved", None) == (self, key):
+            # The caller already waited for this call (see ``reserved``).
+            _context.reserved = None
+            return
+        delay = self.reserve(key)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, key=None):
+        delay = self.reserve(key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def reserve(self, key=None) -> float:
+        """
+        Reserve the next start time without blocking, return the delay in
+        seconds that the caller must wait before calling.
+        """
+        with self.lock:
+            clock = self.callback_clock()
+            start = max(clock, self.__next_start(key, clock))
+            self.reservations.append(start)
+
+            delay = start - clock
+            self._waiting = [t for t in self._waiting if t > clock]
+            if delay > 0:
+                self._waiting.append(start)
+
+            self._stats.calls += 1
+            self._stats.total_wait += delay
+            self._stats.max_wait = max(self._stats.max_wait, delay)
+            self._stats.queue_depth = len(self._waiting)
+            self._stats.max_queue_depth = max(
+                self._stats.max_queue_depth, self._stats.queue_depth
+            )
+            return delay
+
+    @contextmanager
+    def reserved(self, key=None):
+        """
+        Skip the next ``acquire`` of key on this thread, the caller reserved
+        and waited for the start of the call (``acquire_async``) beforehand.
+        """
+        _context.reserved = (self, key)
+        try:
+            yield
+        finally:
+            _context.reserved = None
+
+    def call(self, key, func, *args, **kwargs):
+        _context.reporter = lambda headers, status: self.update(key, headers, status)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _context.reporter = None
+
+    async def call_async(self, key, func, *args, **kwargs):
+        _context.reporter = lambda headers, status: self.update(key, headers, status)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _context.reporter = None
+
+    def update(self, key, headers: dict, status_code: int = None):
+        remaining = _first_header(headers, REMAINING_HEADERS)
+        reset = _first_header(headers, RESET_HEADERS)
+        retry_after = headers.get("Retry-After")
+
         with self.lock:
-            period_remaining = self.__period_remaining()
+            clock = self.callback_clock()
+            if status_code in (403, 429) and retry_after and retry_after.isdigit():
+                self.quotas[key] = Quota(0, clock + int(retry_after))
+            elif remaining is not None and reset is not None:
+                # Reset time is an epoch timestamp, convert it to our clock.
+                reset_at = clock + max(0, float(reset) - time.time())
+                self.quotas[key] = Quota(int(remaining), reset_at)
+
+    def stats(self) -> RateLimitStats:
+        with self.lock:
+            clock = self.callback_clock()
+            queue_depth = len([t for t in self._waiting if t > clock])
+            return RateLimitStats(
+                calls=self._stats.calls,
+                total_wait=self._stats.total_wait,
+                max_wait=self._stats.max_wait,
+                queue_depth=queue_depth,
+                max_queue_depth=self._stats.max_queue_depth,
+            )
+
+    def __next_start(self, key, clock: float) -> float:
+        last_start = self.reservations[-1] if self.reservations else None
+        next_start = last_start + self.min_interval if last_start is not None else 0
+
+        # The call "calls" reservations ago must be out of the sliding window.
+        if len(self.reservations) == self.clamped_calls:
+            next_start = max(next_start, self.reservations[0] + self.period)
 
-            # If the time window has elapsed then reset.
-            if period_remaining <= 0:
-                self.num_calls = 0
-                self.last_reset = self.callback_clock()
+        quota = self.quotas.get(key)
+        if quota is not None and quota.reset_at > clock:
+            if quota.remaining <= 0:
+                return max(next_start, quota.reset_at)
 
-            # Increase the number of attempts to call the function.
-            self.num_calls += 1
+            # Spread the remaining calls over the time left until the reset.
+            interval = (quota.reset_at - clock) / quota.remaining
+            quota.remaining -= 1
+            if last_start is not None:
+                next_start = max(next_start, last_start + interval)
 
-            # If the number of attempts to call the function exceeds the
-            # maximum then raise an exception.
-            if self.num_calls > self.clamped_calls:
-                raise RateLimitException("Too many calls", period_remaining)
+        return next_start
 
-        return func(*args, **kwargs)
 
-    def __period_remaining(self):
-        elapsed = self.callback_clock() - self.last_reset
-        return self.period - elapsed
+def _first_header(headers: dict, names: tuple):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
 
 
 # pylint: disable=C0103
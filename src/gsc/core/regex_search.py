@@ -0,0 +1,257 @@
+import re
+import sys
+from rx import (
+    Observable,
+    defer,
+    empty,
+    from_future,
+    from_iterable,
+    just,
+    merge,
+    operators as ops,
+)
+from gsc.core.local_search import preview_lines
+
+# A shorter word matches too many files to be worth a server search.
+MIN_LITERAL_LENGTH = 2
+WORD = re.compile(r"\w+")
+
+_OPCODES = (
+    "LITERAL",
+    "AT",
+    "SUBPATTERN",
+    # Python >= 3.11
+    "ATOMIC_GROUP",
+    "MAX_REPEAT",
+    "MIN_REPEAT",
+    # Python >= 3.11
+    "POSSESSIVE_REPEAT",
+)
+
+
+def required_literals(pattern: str) -> list:
+    """
+    Return the literal strings found in every match of pattern. The
+    alternations and optional parts are skipped, so the list may be empty.
+    Raise ``re.error`` if pattern is not a valid regular expression.
+    """
+    re.compile(pattern)
+    parsed = _parse(pattern)
+    if parsed is None:
+        return []
+
+    opcodes, items = parsed
+    try:
+        return [literal for literal in _literals(items, opcodes) if literal]
+    except (AttributeError, IndexError, TypeError, ValueError):
+        # Unknown layout of the parse tree
+        return []
+
+
+def _parse(pattern: str):
+    """
+    Return the opcodes and the parse tree of pattern, from the parser of the
+    re module. It is private and changes between the Python versions, None
+    when it cannot be used.
+    """
+    try:
+        if sys.version_info >= (3, 11):
+            # pylint: disable=C0415
+            from re import _parser as parser
+        else:
+            # pylint: disable=C0415,W4901
+            import sre_parse as parser
+
+        opcodes = {name: getattr(parser, name, None) for name in _OPCODES}
+        return opcodes, parser.parse(pattern)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _literals(items, opcodes: dict) -> list:
+    repeats = [
+        opcodes[name]
+        for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+        if opcodes[name] is not None
+    ]
+    literals = [""]
+    for operator, value in items:
+        if operator is opcodes["LITERAL"]:
+            literals[-1] += chr(value)
+        elif operator is opcodes["AT"]:
+            # Zero width (^, $, \b), the literal goes on.
+            continue
+        elif operator is opcodes["SUBPATTERN"]:
+            literals.extend(_literals(value[-1], opcodes))
+            literals.append("")
+        elif (
+            opcodes["ATOMIC_GROUP"] is not None and operator is opcodes["ATOMIC_GROUP"]
+        ):
+            literals.extend(_literals(value, opcodes))
+            literals.append("")
+        elif operator in repeats and value[0] >= 1:
+            literals.extend(_literals(value[2], opcodes))
+            literals.append("")
+        else:
+            literals.append("")
+    return literals
+
+
+def prefilter_keyword(pattern: str) -> str:
+    """
+    Return the longest word of the required literals of pattern, searched on
+    the server to find the candidate files, or None when there is none.
+    Punctuation and spaces are left out, the servers do not search them.
+    """
+    words = [
+        word
+        for literal in required_literals(pattern)
+        for word in WORD.findall(literal)
+        if len(word) >= MIN_LITERAL_LENGTH
+    ]
+    return max(words, key=len) if words else None
+
+
+def find_matches(pattern: str, texts: list) -> list:
+    """
+    Return the (start, end) of the first match of pattern in each text, or
+    None. Run on the process pool, the regular expressions are CPU bound.
+    """
+    regex = re.compile(pattern, re.MULTILINE)
+    spans = []
+    for text in texts:
+        match = regex.search(text)
+        spans.append(match.span() if match else None)
+    return spans
+
+
+def content_preview(content: str, start: int) -> str:
+    position = len(content[:start].encode("utf-8"))
+    return preview_lines(content.encode("utf-8"), position)[1]
+
+
+class RegexVerifier:
+    """
+    Keep the files of the search of the prefilter keywords which match the
+    regular expressions.
+
+    The text of the matches returned by the server (``texts_of`` a file) is
+    checked first. The content of the file is only loaded when it does not
+    match, then the preview is set (``set_preview``) around the first match of
+    the content. The regular expressions run on the process pool of engine
+    (``LocalSearchEngine``), or in this thread without engine.
+    """
+
+    def __init__(self, patterns: list, texts_of, set_preview, engine=None) -> None:
+        self.patterns = list(dict.fromkeys(patterns))
+        self._texts_of = texts_of
+        self._set_preview = set_preview
+        self._engine = engine
+        self._patterns_by_keyword = {}
+        for pattern in self.patterns:
+            self._patterns_by_keyword.setdefault(prefilter_keyword(pattern), []).append(
+                pattern
+            )
+
+    def keywords(self) -> list:
+        """
+        The keywords to search on the server, one per distinct prefilter.
+        """
+        return [keyword for keyword in self._patterns_by_keyword if keyword]
+
+    def verify(self, matches: list, load_content) -> Observable:
+        """
+        Emit the (pattern, file) of the (keyword, file) matches which match
+        the pattern of keyword. ``load_content`` of a file is an Observable of
+        its text.
+        """
+        candidates = [
+            (pattern, file)
+            for keyword, file in matches
+            for pattern in self._patterns_by_keyword.get(keyword, ())
+        ]
+        texts = ["\n".join(self._texts_of(file) or ()) for _, file in candidates]
+        return self.__find(candidates, texts).pipe(
+            ops.flat_map(
+                lambda spans: self.__check_contents(candidates, spans, load_content)
+            ),
+            ops.flat_map(
+                lambda spans: from_iterable(
+                    [candidate for candidate, span in zip(candidates, spans) if span]
+                )
+            ),
+        )
+
+    def __check_contents(self, candidates: list, spans: list, load_content):
+        """
+        Check the content of the files whose text did not match, emit the spans
+        of all the candidates.
+        """
+        missed = [number for number, span in enumerate(spans) if not span]
+        if not missed:
+            return just(spans)
+
+        # Load each file once, for all its patterns.
+        files = {id(candidates[number][1]): candidates[number][1] for number in missed}
+
+        def check(contents: list):
+            content_by_file = dict(contents)
+            texts = [
+                content_by_file.get(id(candidates[number][1]), "") for number in missed
+            ]
+
+            def update(content_spans: list):
+                for number, text, span in zip(missed, texts, content_spans):
+                    if span:
+                        self._set_preview(
+                            candidates[number][1], content_preview(text, span[0])
+                        )
+                        spans[number] = span
+                return spans
+
+            return self.__find([candidates[number] for number in missed], texts).pipe(
+                ops.map(update)
+            )
+
+        return merge(
+            *[
+                load_content(file).pipe(
+                    ops.map(lambda text, key=key: (key, text)),
+                    # A file which cannot be read (removed since indexed) is
+                    # not a match.
+                    ops.catch(lambda *_: empty()),
+                )
+                for key, file in files.items()
+            ]
+        ).pipe(ops.to_list(), ops.flat_map(check))
+
+    def __find(self, candidates: list, texts: list) -> Observable:
+        """
+        Emit the span of the first match of the pattern of each candidate in
+        its text, one task per pattern.
+        """
+        by_pattern = {}
+        for number, ((pattern, _), text) in enumerate(zip(candidates, texts)):
+            numbers, pattern_texts = by_pattern.setdefault(pattern, ([], []))
+            numbers.append(number)
+            pattern_texts.append(text)
+
+        def collect(results: list):
+            spans = [None] * len(candidates)
+            for numbers, pattern_spans in results:
+                for number, span in zip(numbers, pattern_spans):
+                    spans[number] = span
+            return spans
+
+        tasks = [
+            self.__submit(find_matches, pattern, pattern_texts).pipe(
+                ops.map(lambda spans, numbers=numbers: (numbers, spans))
+            )
+            for pattern, (numbers, pattern_texts) in by_pattern.items()
+        ]
+        return merge(*tasks).pipe(ops.to_list(), ops.map(collect))
+
+    def __submit(self, func, *args) -> Observable:
+        if self._engine is None:
+            return defer(lambda _: just(func(*args)))
+        return defer(lambda _: from_future(self._engine.submit(func, *args)))
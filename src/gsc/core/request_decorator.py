@@ -2,17 +2,34 @@ from functools import wraps
 from typing import Any
 from enum import Enum
 import abc
+import hashlib
 import threading
+import time
 import json
 import types
-from urllib.parse import urljoin
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from math import ceil
+from urllib.parse import urljoin, urlparse, parse_qs
 from urllib3.exceptions import InsecureRequestWarning
 import requests
-
+from gsc.core.connection_pool import ConnectionPool, http_pool
+from gsc.core.json_stream import DEFAULT_CHUNK_SIZE, JsonStream
+from gsc.core.response_cache import ResponseCache
+from gsc.core.progress import Progress
+from gsc.core.rate_limit import RateLimitDecorator, report_response
+from gsc.core.retry import (
+    RetryLater,
+    RetryPolicy,
+    RetryState,
+    current_state,
+    is_deferred,
+    retry_policy as default_retry_policy,
+)
 
 DEFAULT_TIMEOUT = 20
+DEFAULT_PREFETCH_PAGES = 4
 
 
 class HttpMethod(Enum):
@@ -32,14 +49,22 @@ class RequestDecorator(abc.ABC):
         response_model,
         headers: dict = None,
         timeout: int = None,
+        cacheable: bool = False,
+        stream: bool = False,
+        items_key: str = None,
     ):
         self.path = path if path is not None else ""
         self.method = method
         self.headers = headers
         self.response_model = response_model
         self.timeout = timeout or DEFAULT_TIMEOUT
+        # Store the response in the response cache of Api object if any.
+        self.cacheable = cacheable
+        # Decode the body incrementally, item by item, instead of loading it.
+        self.stream = stream
+        # Key of the items array when the body is an object (GitHub search).
+        self.items_key = items_key
         self.__lock = None
-        self.__object = None
 
     def __call__(self, func):
         def json_serialize(obj):
@@ -55,7 +80,6 @@ class RequestDecorator(abc.ABC):
             if not isinstance(obj, Api):
                 raise TypeError("Object type is not supported.")
 
-            self.__object = obj
             path_dict, param_dict = func(obj, *args, **kwargs)
 
             req_path = self.path
@@ -66,19 +90,24 @@ class RequestDecorator(abc.ABC):
             req_body = param_dict if body_required else None
             req_params = param_dict if not body_required else None
 
+            # The decorator is shared by every call of the method, so the Api
+            # object is passed along the call instead of being stored on it.
             response = self.send(
+                obj,
                 urljoin(obj.host, req_path),
                 obj.default_header,
                 req_params,
-                json_serialize(req_body),
+                json_serialize(req_body) if body_required else None,
                 obj.ssl_verify,
             )
-            return self.__convert_to_model(self.response_model, response)
+            return self.__convert_to_model(obj, self.response_model, response)
 
         return wrapper
 
+    # pylint: disable=too-many-arguments
     def send(
         self,
+        api: "Api",
         url: str,
         headers: dict = None,
         params: dict = None,
@@ -87,29 +116,31 @@ class RequestDecorator(abc.ABC):
     ):
         req_header = self.headers
         if req_header is not None and headers is not None:
-            req_header.update(headers)
+            req_header = {**req_header, **headers}
         elif headers is not None:
             req_header = headers
         else:
             pass
 
-        try:
-            retries = Retry(
-                total=3,
-                backoff_factor=10,
-                respect_retry_after_header=True,
-                status_forcelist=[429, 403],
-            )
-
-            if not ssl_verify:
-                # Suppress only the single warning from urllib3 needed.
-                requests.packages.urllib3.disable_warnings(
-                    category=InsecureRequestWarning
-                )
-
-            session = requests.Session()
-            session.mount(self.__object.host, HTTPAdapter(max_retries=retries))
-            session.verify = ssl_verify
+        cache = api.response_cache if self.cacheable else None
+        cache_key = cache.key(url, params) if cache else None
+        cache_entry = cache.get(cache_key) if cache else None
+        if cache_entry is not None:
+            if cache.is_fresh(cache_entry):
+                return cache.to_response(cache_entry)
+            req_header = {
+                **(req_header or {}),
+                **cache.conditional_headers(cache_entry),
+            }
+
+        if not ssl_verify:
+            # Suppress only the single warning from urllib3 needed.
+            requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
+
+        session = api.connection_pool.session(api.host, ssl_verify)
+        policy = api.retry_policy
+        state = current_state()
+        while True:
             response = session.request(
                 method=self.method.name.upper(),
                 url=url,
@@ -117,18 +148,31 @@ class RequestDecorator(abc.ABC):
                 params=params,
                 data=data,
                 timeout=self.timeout,
-                hooks={
-                    "response": self.__debug_request if self.__object.is_debug else None
-                },
+                stream=self.stream and cache is None,
+                hooks={"response": self.__debug_request if api.is_debug else None},
             )
-            response.raise_for_status()
-            return response
-        except Exception as err:
-            raise err
-        finally:
-            session.close()
-
-    def __convert_to_model(self, model_cls, response: Any):
+            report_response(response.headers, response.status_code)
+
+            delay = policy.next_delay(response, state)
+            if delay is None:
+                break
+            state = RetryState(state.attempt + 1, delay)
+            response.close()
+            if is_deferred():
+                raise RetryLater(delay, state)
+            time.sleep(delay)
+
+        # Not modified since the last request, the cached body is still valid.
+        if cache_entry is not None and response.status_code == 304:
+            cache.touch(cache_key, cache_entry)
+            return cache.to_response(cache_entry)
+
+        response.raise_for_status()
+        if cache:
+            cache.put(cache_key, response)
+        return response
+
+    def __convert_to_model(self, api: "Api", model_cls, response: Any):
         if model_cls is None:
             raise TypeError(f"{model_cls} is not supported.")
 
@@ -136,11 +180,14 @@ class RequestDecorator(abc.ABC):
             raise TypeError(f"{type(response)} type is not supported.")
 
         if isinstance(response, types.GeneratorType):
-            return self.__convert_generator(model_cls, response)
+            return self._convert_generator(api, model_cls, response)
 
-        return self.__convert_object(model_cls, response)
+        return self.__convert_object(api, model_cls, response)
+
+    def __convert_object(self, api: "Api", model_cls, response: requests.Response):
+        if self.stream:
+            return self._convert_generator(api, model_cls, iter([response]))
 
-    def __convert_object(self, model_cls, response: requests.Response):
         data = json.loads(response.content)
 
         if isinstance(data, list):
@@ -148,17 +195,35 @@ class RequestDecorator(abc.ABC):
 
         return [model_cls(**data)]
 
-    def __convert_generator(self, model_cls, response: types.GeneratorType):
+    # pylint: disable=unused-argument
+    def _convert_generator(self, api: "Api", model_cls, response: types.GeneratorType):
         for res in response:
-            data = json.loads(res.content)
-
-            if isinstance(data, dict):
-                yield model_cls(**data)
-            elif isinstance(data, list):
-                for item in data:
+            _, items = self._page_items(res)
+            try:
+                for item in items:
                     yield model_cls(**item)
-            else:
-                pass
+            finally:
+                res.close()
+
+    def _page_items(self, response: requests.Response):
+        """
+        Return the members of the page object (if any) and an iterator over
+        the items of the page.
+        """
+        if self.stream:
+            json_stream = JsonStream(
+                response.iter_content(DEFAULT_CHUNK_SIZE), self.items_key
+            )
+            return json_stream.fields, iter(json_stream)
+
+        data = json.loads(response.content)
+        if isinstance(data, list):
+            return {}, iter(data)
+        if isinstance(data, dict) and self.items_key in data:
+            return data, iter(data[self.items_key])
+        if isinstance(data, dict):
+            return {}, iter([data])
+        return {}, iter([])
 
     def __debug_request(self, response: requests.Response, *_, **__):
         if not self.__lock:
@@ -179,45 +244,231 @@ class RequestDecorator(abc.ABC):
 
 
 class Api:
+    # pylint: disable=too-many-arguments
     def __init__(
-        self, host: str, default_header: dict = None, ssl_verify=True, is_debug=False
+        self,
+        host: str,
+        default_header: dict = None,
+        ssl_verify=True,
+        is_debug=False,
+        connection_pool: ConnectionPool = None,
+        response_cache: ResponseCache = None,
+        retry_policy: RetryPolicy = None,
+        max_results: int = None,
     ):
         self.host = host
         self.default_header = default_header
         self.ssl_verify = ssl_verify
         self.is_debug = is_debug
+        self.connection_pool = connection_pool or http_pool
+        self.response_cache = response_cache
+        self.retry_policy = retry_policy or default_retry_policy
+        # Stop paging through the search results after this number of items.
+        self.max_results = max_results
+
+    @property
+    def rate_limit_key(self) -> str:
+        # The quota is counted per user token on the server side.
+        credential = json.dumps(self.default_header or {}, sort_keys=True)
+        return hashlib.sha256(f"{self.host}{credential}".encode("utf-8")).hexdigest()
 
 
 class GetRequest(RequestDecorator):
+    # pylint: disable=too-many-arguments
     def __init__(
-        self, path: str, response_model, headers: dict = None, timeout: int = None
+        self,
+        path: str,
+        response_model,
+        headers: dict = None,
+        timeout: int = None,
+        cacheable: bool = False,
+        stream: bool = False,
+        items_key: str = None,
     ):
-        super().__init__(HttpMethod.GET, path, response_model, headers, timeout)
+        super().__init__(
+            HttpMethod.GET,
+            path,
+            response_model,
+            headers,
+            timeout,
+            cacheable,
+            stream,
+            items_key,
+        )
 
 
 class GetRequestPagination(GetRequest):
     # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        path: str,
+        response_model,
+        headers: dict = None,
+        timeout: int = None,
+        prefetch: int = None,
+        cacheable: bool = False,
+        rate_limiter: RateLimitDecorator = None,
+        progress: Progress = None,
+        capped: bool = False,
+        stream: bool = False,
+        items_key: str = None,
+    ):
+        super().__init__(
+            path, response_model, headers, timeout, cacheable, stream, items_key
+        )
+        # Number of pages fetched in parallel once the total is known.
+        self.prefetch = prefetch
+        # Every page is a call of the rate limiter, not only the first one.
+        self.rate_limiter = rate_limiter
+        self.progress = progress
+        # Stop at the max_results of Api object.
+        self.capped = capped
+
+    def __call__(self, func):
+        wrapper = super().__call__(func)
+        # The asyncio engine waits for the first page on its loop.
+        wrapper.rate_limiter = self.rate_limiter
+        return wrapper
+
     def send(
         self,
+        api: Api,
         url: str,
         headers: dict = None,
         params: dict = None,
         data: dict = None,
         ssl_verify=True,
     ):
-        _url = url
-        while True:
-            if _url == url:
-                response = super().send(url, headers, params, data, ssl_verify)
-            else:
-                response = super().send(_url, headers, ssl_verify=ssl_verify)
+        # The first page is sent at once, not when the pages are consumed, so
+        # the caller can reschedule it (see ``deferred_retries``).
+        response = self.__send_page(api, url, headers, params, data, ssl_verify)
+        return self.__pages(api, response, url, headers, params, ssl_verify)
 
+    # pylint: disable=too-many-arguments
+    def __pages(
+        self,
+        api: Api,
+        response: requests.Response,
+        url: str,
+        headers: dict,
+        params: dict,
+        ssl_verify,
+    ):
+        yield response
+
+        total_pages = self.__total_pages(response, params) if self.prefetch else None
+        if total_pages is None:
+            yield from self.__follow_next_links(api, response, headers, ssl_verify)
+        else:
+            yield from self.__prefetch_pages(
+                api, url, headers, params, ssl_verify, total_pages
+            )
+
+    def _convert_generator(self, api: Api, model_cls, response: types.GeneratorType):
+        max_results = api.max_results if self.capped else None
+        count = 0
+        # The next page is only requested once the previous one is consumed.
+        for index, res in enumerate(response):
+            fields, items = self._page_items(res)
+            page_count = 0
+            try:
+                for item in items:
+                    if index == 0 and page_count == 0:
+                        self.__report_total(res, fields, max_results)
+                    if max_results is not None and count >= max_results:
+                        return
+                    count += 1
+                    page_count += 1
+                    yield model_cls(**item)
+            finally:
+                if self.progress is not None and page_count:
+                    self.progress.advance(page_count)
+                res.close()
+
+            if index == 0 and page_count == 0:
+                self.__report_total(res, fields, max_results)
+            if max_results is not None and count >= max_results:
+                return
+
+    def __report_total(self, response: requests.Response, fields: dict, max_results):
+        if self.progress is None:
+            return
+        # Search results of GitHub are wrapped in an object with the total.
+        total = response.headers.get("X-Total") or fields.get("total_count")
+        if total is not None:
+            total = int(total)
+            self.progress.add_total(min(total, max_results) if max_results else total)
+
+    def __send_page(self, api: Api, *args, **kwargs):
+        send = super().send
+        if self.rate_limiter is None:
+            return send(api, *args, **kwargs)
+        key = api.rate_limit_key
+        self.rate_limiter.acquire(key)
+        return self.rate_limiter.call(key, send, api, *args, **kwargs)
+
+    def __follow_next_links(self, api: Api, response, headers: dict, ssl_verify):
+        send = self.__send_page
+        while "next" in response.links:
+            response = send(
+                api, response.links["next"]["url"], headers, ssl_verify=ssl_verify
+            )
             yield response
 
-            if "next" not in response.links:
-                break
+    # pylint: disable=too-many-arguments
+    def __prefetch_pages(
+        self,
+        api: Api,
+        url: str,
+        headers: dict,
+        params: dict,
+        ssl_verify,
+        total_pages: int,
+    ):
+        send = self.__send_page
+        first_page = int((params or {}).get("page", 1))
+        pages = iter(range(first_page + 1, total_pages + 1))
+        futures = deque()
+
+        def fetch(page: int):
+            return send(
+                api, url, headers, {**params, "page": page}, ssl_verify=ssl_verify
+            )
 
-            _url = response.links["next"]["url"]
+        with ThreadPoolExecutor(max_workers=self.prefetch) as executor:
+            try:
+                for page in islice(pages, self.prefetch):
+                    futures.append(executor.submit(fetch, page))
+
+                # Yield in page order, keep at most "prefetch" pages in flight.
+                while futures:
+                    response = futures.popleft().result()
+                    for page in islice(pages, 1):
+                        futures.append(executor.submit(fetch, page))
+                    yield response
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    @staticmethod
+    def __total_pages(response: requests.Response, params: dict):
+        # GitLab
+        total_pages = response.headers.get("X-Total-Pages")
+        if total_pages:
+            return int(total_pages)
+
+        total = response.headers.get("X-Total")
+        per_page = (params or {}).get("per_page")
+        if total and per_page:
+            return ceil(int(total) / int(per_page))
+
+        # GitHub
+        if "last" in response.links:
+            query = parse_qs(urlparse(response.links["last"]["url"]).query)
+            if "page" in query:
+                return int(query["page"][0])
+
+        return None
 
 
 class PostRequest(RequestDecorator):
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from os.path import join, dirname, expanduser
+import requests
+from requests.structures import CaseInsensitiveDict
+from gsc.constants import APP_NAME, DEFAULT_CACHE_TTL
+
+CACHE_DIR = join(
+    os.environ.get("XDG_CACHE_HOME") or join(expanduser("~"), ".cache"), APP_NAME
+)
+
+# Only keep the headers which are needed to rebuild the response
+CACHED_HEADERS = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Link",
+    "X-Total",
+    "X-Total-Pages",
+    "X-Next-Page",
+)
+
+
+class ResponseCache:
+    """
+    Store the successful responses on disk, one JSON file per request.
+
+    A fresh entry (younger than ``ttl`` seconds) is returned without any request,
+    a stale one is revalidated with ``If-None-Match`` / ``If-Modified-Since``.
+    """
+
+    def __init__(self, *namespace: str, ttl: int = DEFAULT_CACHE_TTL) -> None:
+        self.ttl = DEFAULT_CACHE_TTL if ttl is None else ttl
+        self._dir = join(CACHE_DIR, *[str(name).lower() for name in namespace])
+
+    @staticmethod
+    def key(url: str, params: dict = None) -> str:
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict:
+        try:
+            with open(self.__path(key), encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, response: requests.Response):
+        entry = {
+            "url": response.url,
+            "headers": {
+                name: response.headers[name]
+                for name in CACHED_HEADERS
+                if name in response.headers
+            },
+            "content": response.content.decode("utf-8"),
+            "stored_at": time.time(),
+        }
+        self.__write(key, entry)
+
+    def touch(self, key: str, entry: dict):
+        entry["stored_at"] = time.time()
+        self.__write(key, entry)
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("stored_at", 0) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        etag = entry["headers"].get("ETag")
+        if etag:
+            headers["If-None-Match"] = etag
+        last_modified = entry["headers"].get("Last-Modified")
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    @staticmethod
+    def to_response(entry: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = "utf-8"
+        # pylint: disable=protected-access
+        response._content = entry["content"].encode("utf-8")
+        response._content_consumed = True
+        return response
+
+    def clear(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __path(self, key: str) -> str:
+        return join(self._dir, f"{key}.json")
+
+    def __write(self, key: str, entry: dict):
+        write_json(self.__path(key), entry)
+
+
+def write_json(path: str, data):
+    os.makedirs(dirname(path), exist_ok=True)
+    # Write to a temporary file then rename, readers never see a partial file.
+    file_desc, temp_path = tempfile.mkstemp(dir=dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(file_desc, "w", encoding="utf-8") as temp_file:
+            json.dump(data, temp_file)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
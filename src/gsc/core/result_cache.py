@@ -0,0 +1,43 @@
+import hashlib
+import json
+import shutil
+from os.path import join
+from gsc.core.response_cache import CACHE_DIR, write_json
+
+
+class ResultCache:
+    """
+    Store the search results on disk, keyed by the search input.
+
+    Each entry remembers the ``version`` of the searched project (for example the
+    last activity time), an entry with another version is treated as a miss.
+    """
+
+    def __init__(self, *namespace: str, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._dir = join(CACHE_DIR, *[str(name).lower() for name in namespace])
+
+    def get(self, key: tuple, version: str) -> list:
+        if not self.enabled or not version:
+            return None
+
+        try:
+            with open(self.__path(key), encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        return entry["items"] if entry.get("version") == version else None
+
+    def put(self, key: tuple, version: str, items: list):
+        if not self.enabled or not version:
+            return
+
+        write_json(self.__path(key), {"version": version, "items": items})
+
+    def clear(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __path(self, key: tuple) -> str:
+        name = json.dumps(list(key), default=str).encode("utf-8")
+        return join(self._dir, f"{hashlib.sha256(name).hexdigest()}.json")
@@ -0,0 +1,190 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+import requests
+from gsc.core.rate_limit import REMAINING_HEADERS, RESET_HEADERS
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1
+DEFAULT_MAX_DELAY = 60
+# Retries allowed per request sent, plus a reserve for the first failures.
+DEFAULT_BUDGET_RATIO = 0.2
+DEFAULT_BUDGET_RESERVE = 10
+
+RETRYABLE_STATUS = (429, 502, 503, 504)
+
+_context = threading.local()
+
+
+class RetryLater(Exception):
+    """
+    Raised instead of sleeping when retries are deferred (see ``deferred_retries``),
+    the caller must call again after ``delay`` seconds with the given state.
+    """
+
+    def __init__(self, delay: float, state: "RetryState") -> None:
+        super().__init__(f"Retry in {delay:.2f}s")
+        self.delay = delay
+        self.state = state
+
+
+@dataclass
+class RetryState:
+    attempt: int = 0
+    delay: float = 0
+
+
+@dataclass
+class RetryStats:
+    retries: int = 0
+    exhausted: int = 0
+
+    def __str__(self) -> str:
+        return f"Retries : {self.retries} retried, {self.exhausted} out of budget"
+
+
+class RetryBudget:
+    """
+    Bound the retries to a ratio of the requests sent, so a throttled server
+    is not hammered by every worker retrying at the same time.
+    """
+
+    def __init__(
+        self, ratio: float = DEFAULT_BUDGET_RATIO, reserve: int = DEFAULT_BUDGET_RESERVE
+    ) -> None:
+        self.ratio = ratio
+        self.reserve = reserve
+        self._tokens = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.reserve, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Retry the throttled and unavailable responses with decorrelated jitter,
+    within the retry budget. A 403 is only retried when the server says it
+    is a rate limit, a permission denied fails fast.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        budget: RetryBudget = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self._stats = RetryStats()
+
+    def configure(
+        self, max_attempts: int = None, base_delay: float = None, max_delay=None
+    ):
+        self.max_attempts = self.max_attempts if max_attempts is None else max_attempts
+        self.base_delay = base_delay or self.base_delay
+        self.max_delay = max_delay or self.max_delay
+
+    def next_delay(self, response: requests.Response, state: RetryState) -> float:
+        """
+        Return the delay before the next attempt, None if the response must not
+        be retried.
+        """
+        if state.attempt == 0:
+            self.budget.deposit()
+
+        if response.ok or not self.is_retryable(response):
+            return None
+        if state.attempt >= self.max_attempts:
+            return None
+
+        delay = self.server_delay(response)
+        if delay is None:
+            # Decorrelated jitter, the delay grows without synchronizing the callers.
+            previous = state.delay or self.base_delay
+            delay = min(self.max_delay, random.uniform(self.base_delay, previous * 3))
+        elif delay > self.max_delay:
+            return None
+
+        if not self.budget.withdraw():
+            self._stats.exhausted += 1
+            return None
+
+        self._stats.retries += 1
+        return delay
+
+    @staticmethod
+    def is_retryable(response: requests.Response) -> bool:
+        if response.status_code in RETRYABLE_STATUS:
+            return True
+        if response.status_code != 403:
+            return False
+
+        # Rate limit 403 of GitHub / GitLab, any other 403 is permission denied.
+        headers = response.headers
+        if "Retry-After" in headers:
+            return True
+        if "0" in (
+            headers.get("RateLimit-Remaining"),
+            headers.get("X-RateLimit-Remaining"),
+        ):
+            return True
+        return "rate limit" in response.text.lower()
+
+    @staticmethod
+    def server_delay(response: requests.Response) -> float:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+
+        # GitHub sends the reset of the quota with every response, it is only
+        # the time to wait once the quota is exhausted.
+        for remaining, reset in zip(REMAINING_HEADERS, RESET_HEADERS):
+            reset_at = response.headers.get(reset, "")
+            if response.headers.get(remaining) == "0" and reset_at.isdigit():
+                return max(0, float(reset_at) - time.time())
+        return None
+
+    def stats(self) -> RetryStats:
+        return RetryStats(self._stats.retries, self._stats.exhausted)
+
+
+def current_state() -> RetryState:
+    return getattr(_context, "state", None) or RetryState()
+
+
+def is_deferred() -> bool:
+    return getattr(_context, "deferred", False)
+
+
+@contextmanager
+def deferred_retries(state: RetryState = None):
+    """
+    Raise ``RetryLater`` from the requests sent on this thread instead of
+    sleeping, so the caller can reschedule them without holding the thread.
+    """
+    _context.deferred = True
+    _context.state = state
+    try:
+        yield
+    finally:
+        _context.deferred = False
+        _context.state = None
+
+
+# Shared by all Api objects, the retry budget is global.
+retry_policy = RetryPolicy()
@@ -1,8 +1,10 @@
-import types
 import multiprocessing
+import threading
 from functools import wraps
 from rx import create, core, operators as ops
+from rx.disposable import CompositeDisposable, Disposable
 from rx.scheduler import ThreadPoolScheduler
+from gsc.core.async_task import async_engine, emit
 
 # calculate number of CPUs, then create a ThreadPoolScheduler with that number of threads
 optimal_thread_count = multiprocessing.cpu_count()
@@ -12,6 +14,9 @@ rx_pool_scheduler = ThreadPoolScheduler(optimal_thread_count)
 def rx_task(func):
     @wraps(func)
     def wrapper(*args, **kwargs) -> core.Observable:
+        if async_engine.enabled:
+            return async_engine.submit(func, *args, **kwargs)
+
         def subscribe(observer, _=None):
             try:
                 res = func(*args, **kwargs)
@@ -28,23 +33,14 @@ def rx_task(func):
 def __flat_map():
     def _flat_map(source):
         def subscribe(observer, scheduler=None):
-            def emit(value):
-                if isinstance(value, list):
-                    for item in value:
-                        observer.on_next(item)
-                else:
-                    observer.on_next(value)
-
-            def on_next(value):
-                if isinstance(value, types.GeneratorType):
-                    for data in value:
-                        emit(data)
-                else:
-                    emit(value)
-
-            return source.subscribe(
-                on_next, observer.on_error, observer.on_completed, scheduler
+            disposed = threading.Event()
+            subscription = source.subscribe(
+                lambda value: emit(observer, value, disposed),
+                observer.on_error,
+                observer.on_completed,
+                scheduler,
             )
+            return CompositeDisposable(subscription, Disposable(disposed.set))
 
         return create(subscribe)
 
@@ -0,0 +1,458 @@
+import mmap
+import os
+import struct
+import subprocess
+import tempfile
+from array import array
+from bisect import bisect_left
+from os.path import basename, dirname, join, splitext
+from gsc.core.local_search import (
+    BINARY_CHECK_SIZE,
+    branch_name,
+    git,
+    list_blobs,
+    preview_lines,
+    read_blobs,
+)
+
+INDEX_FILE = "gsc.index"
+MAGIC = b"GSCTRI02"
+# magic, commit, ref length, files, trigrams, postings, paths size, ids size.
+# The commit is padded with NUL bytes, 64 characters fit a SHA-256 object id.
+HEADER = struct.Struct("=8s64sIIIQQQ")
+REF_SIZE = 256
+# Object id offset of the files removed by an update, they stay in the posting
+# lists until the next full build.
+DELETED = 2**64 - 1
+# The index is built again when the removed files are more than this part of
+# the files, instead of being updated.
+REBUILD_RATIO = 0.25
+
+INDEX_CURRENT = "current"
+INDEX_UPDATED = "updated"
+INDEX_BUILT = "built"
+# The repository has no commit
+INDEX_EMPTY = "empty"
+
+
+class TrigramIndex:
+    """
+    Trigram index of the files of a commit, read through a memory map.
+
+    Layout (native byte order) : header, ref name, file table (path offset,
+    path size, object id offset, object id size), sorted trigrams, offset and
+    count of the posting list of each trigram, posting lists (file numbers),
+    paths, object ids. The contents are not stored, the candidates are checked
+    by reading their blobs from the repository. The trigrams are built from
+    the lowercase contents.
+
+    An update appends the changed files and marks their former entries as
+    ``DELETED``, so the file numbers are not sorted by path anymore.
+    """
+
+    def __init__(self, path: str, git_dir: str = None) -> None:
+        self.path = path
+        # The index is stored in the repository it was built from.
+        self.git_dir = git_dir or dirname(path)
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            commit,
+            ref_size,
+            self.file_count,
+            trigram_count,
+            posting_count,
+            paths_size,
+            _,
+        ) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a trigram index")
+
+        self.commit = commit.rstrip(b"\0").decode()
+        self._view = view = memoryview(self._map)
+        offset = HEADER.size
+        self.ref = bytes(view[offset : offset + ref_size]).decode()
+        offset += REF_SIZE
+        self._files = view[offset : offset + self.file_count * 32].cast("Q")
+        offset += self.file_count * 32
+        self._trigrams = view[offset : offset + trigram_count * 4].cast("I")
+        offset += trigram_count * 4
+        self._lists = view[offset : offset + trigram_count * 16].cast("Q")
+        offset += trigram_count * 16
+        self._postings = view[offset : offset + posting_count * 4].cast("I")
+        offset += posting_count * 4
+        self._paths = offset
+        self._ids = offset + paths_size
+
+    def candidates(self, pattern: bytes) -> list:
+        """
+        Return the numbers of the files which contain all trigrams of pattern.
+        """
+        trigrams = {key(pattern[i : i + 3]) for i in range(len(pattern) - 2)}
+        if not trigrams:
+            return list(range(self.file_count))
+
+        lists = []
+        for trigram in trigrams:
+            position = bisect_left(self._trigrams, trigram)
+            if position == len(self._trigrams) or self._trigrams[position] != trigram:
+                return []
+            lists.append(self.posting_list(position))
+
+        lists.sort(key=len)
+        files = set(lists[0])
+        for postings in lists[1:]:
+            files.intersection_update(postings)
+            if not files:
+                break
+        return sorted(files)
+
+    def search(self, keyword: str) -> list:
+        """
+        Same items as ``search_tree``, only the candidate files are checked.
+        """
+        return self.search_keywords([keyword])[keyword]
+
+    def search_keywords(self, keywords: list) -> dict:
+        """
+        Return the items of each keyword, the blobs of the candidates of all
+        keywords are read with one git cat-file process.
+        """
+        patterns = {keyword: keyword.lower().encode("utf-8") for keyword in keywords}
+        candidates = {
+            keyword: [
+                number
+                for number in self.candidates(pattern)
+                if self._files[number * 4 + 2] != DELETED
+            ]
+            for keyword, pattern in patterns.items()
+        }
+        numbers = sorted(set().union(*candidates.values()))
+        blobs = [(number, self.object_id(number)) for number in numbers]
+        contents = dict(read_blobs(self.git_dir, blobs))
+
+        result = {}
+        for keyword, pattern in patterns.items():
+            items = []
+            for number in candidates[keyword]:
+                content = contents.get(number, b"")
+                position = content.lower().find(pattern)
+                if position < 0:
+                    continue
+
+                path = self.path_name(number)
+                startline, preview = preview_lines(content, position)
+                items.append(
+                    {
+                        "basename": splitext(basename(path))[0],
+                        "path": path,
+                        "ref": self.ref,
+                        "startline": startline,
+                        "data": preview,
+                    }
+                )
+            # Same order as the tree, the updated files are at the end of the index.
+            items.sort(key=lambda item: item["path"].encode("utf-8"))
+            result[keyword] = items
+        return result
+
+    def path_name(self, number: int) -> str:
+        path_offset, path_size = self._files[number * 4 : number * 4 + 2]
+        start = self._paths + path_offset
+        return self._map[start : start + path_size].decode("utf-8", "replace")
+
+    def object_id(self, number: int) -> str:
+        id_offset, id_size = self._files[number * 4 + 2 : number * 4 + 4]
+        start = self._ids + id_offset
+        return self._map[start : start + id_size].decode()
+
+    def live_files(self) -> dict:
+        """
+        Return the number of each file not deleted, by path.
+        """
+        return {
+            self.path_name(number): number
+            for number in range(self.file_count)
+            if self._files[number * 4 + 2] != DELETED
+        }
+
+    def file_table(self) -> array:
+        files = array("Q")
+        files.frombytes(self._files.tobytes())
+        return files
+
+    def trigram_table(self) -> array:
+        return array("I", self._trigrams)
+
+    def posting_list(self, position: int) -> memoryview:
+        start, count = self._lists[position * 2], self._lists[position * 2 + 1]
+        return self._postings[start : start + count]
+
+    def paths_data(self) -> memoryview:
+        return self._view[self._paths : self._ids]
+
+    def ids_data(self) -> memoryview:
+        return self._view[self._ids :]
+
+    def close(self):
+        # The views must be released before the map is closed.
+        for name in ("_files", "_trigrams", "_lists", "_postings", "_view"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def key(trigram: bytes) -> int:
+    return int.from_bytes(trigram, "big")
+
+
+def build_index(git_dir: str, path: str, ref: str = "HEAD") -> str:
+    """
+    Write the trigram index of the ``ref`` tree of repository to path, the
+    file is replaced atomically. Return the indexed commit.
+    """
+    commit = git(git_dir, "rev-parse", f"{ref}^{{commit}}").decode().strip()
+    files = array("Q")
+    paths = bytearray()
+    ids = bytearray()
+    postings = index_blobs(git_dir, list_blobs(git_dir, commit), files, paths, ids)
+
+    trigrams = array("I", sorted(postings))
+    lists = array("Q")
+    posting_array = array("I")
+    for trigram in trigrams:
+        lists.extend((len(posting_array), len(postings[trigram])))
+        posting_array.extend(postings[trigram])
+
+    temp_path = write_index(
+        dirname(path),
+        commit,
+        branch_name(git_dir, ref),
+        files,
+        (trigrams, lists, posting_array),
+        (paths,),
+        (ids,),
+    )
+    os.replace(temp_path, path)
+    return commit
+
+
+def update_index(git_dir: str, index: TrigramIndex, commit: str, ref: str) -> str:
+    """
+    Write the index of ``commit`` from the index of an older commit, only the
+    files changed between the two commits are read and indexed. Return the
+    path of the new index file, or None when the index must be built again.
+    """
+    try:
+        changed = git(
+            git_dir,
+            "diff-tree",
+            "-r",
+            "-z",
+            "--no-renames",
+            "--name-only",
+            index.commit,
+            commit,
+        )
+    except subprocess.CalledProcessError:
+        # The former commit is not in the mirror anymore (force push)
+        return None
+
+    changed = {path.decode("utf-8", "replace") for path in changed.split(b"\0") if path}
+    files = index.file_table()
+    removed = [number for path, number in index.live_files().items() if path in changed]
+    deleted = files[2::4].count(DELETED) + len(removed)
+    if deleted > index.file_count * REBUILD_RATIO:
+        return None
+
+    for number in removed:
+        files[number * 4 + 2] = DELETED
+        files[number * 4 + 3] = 0
+
+    blobs = [blob for blob in list_blobs(git_dir, commit) if blob[0] in changed]
+    # The paths and ids of the new files are written after the former ones,
+    # which are copied from the map of the index.
+    former_paths = index.paths_data()
+    former_ids = index.ids_data()
+    paths = bytearray()
+    ids = bytearray()
+    postings = index_blobs(
+        git_dir, blobs, files, paths, ids, (len(former_paths), len(former_ids))
+    )
+
+    # Merge the new posting lists after the former ones of each trigram, the
+    # new files have the biggest numbers so the lists stay sorted.
+    former = index.trigram_table()
+    trigrams = array("I", sorted(set(former).union(postings)))
+    lists = array("Q")
+    posting_array = array("I")
+    position = 0
+    for trigram in trigrams:
+        start = len(posting_array)
+        if position < len(former) and former[position] == trigram:
+            posting_array.frombytes(index.posting_list(position).tobytes())
+            position += 1
+        posting_array.extend(postings.get(trigram, ()))
+        lists.extend((start, len(posting_array) - start))
+
+    return write_index(
+        dirname(index.path),
+        commit,
+        branch_name(git_dir, ref),
+        files,
+        (trigrams, lists, posting_array),
+        (former_paths, paths),
+        (former_ids, ids),
+    )
+
+
+# pylint: disable=too-many-arguments
+def index_blobs(
+    git_dir: str,
+    blobs: list,
+    files: array,
+    paths: bytearray,
+    ids: bytearray,
+    offsets: tuple = (0, 0),
+) -> dict:
+    """
+    Append the text files of blobs to the file table, paths and object ids.
+    ``offsets`` are the sizes of the paths and ids written before them.
+    Return the sorted numbers of the new files by trigram.
+    """
+    paths_offset, ids_offset = offsets
+    object_ids = dict(blobs)
+    postings = {}
+    for path_name, content in read_blobs(git_dir, blobs):
+        if b"\0" in content[:BINARY_CHECK_SIZE]:
+            continue
+        number = len(files) // 4
+        encoded = path_name.encode("utf-8")
+        object_id = object_ids[path_name].encode()
+        files.extend(
+            (
+                paths_offset + len(paths),
+                len(encoded),
+                ids_offset + len(ids),
+                len(object_id),
+            )
+        )
+        paths += encoded
+        ids += object_id
+        lower = content.lower()
+        for trigram in {lower[i : i + 3] for i in range(len(lower) - 2)}:
+            postings.setdefault(key(trigram), array("I")).append(number)
+    return postings
+
+
+# pylint: disable=too-many-arguments
+def write_index(
+    directory: str,
+    commit: str,
+    ref: str,
+    files: array,
+    tables: tuple,
+    paths: tuple,
+    ids: tuple,
+) -> str:
+    """
+    Write an index to a temporary file of directory and return its path.
+    ``tables`` are the trigrams, their (offset, count) and the posting lists.
+    ``paths`` and ``ids`` are the buffers written one after the other.
+    """
+    trigrams, lists, postings = tables
+    ref_name = ref.encode("utf-8")[:REF_SIZE]
+    header = HEADER.pack(
+        MAGIC,
+        commit.encode(),
+        len(ref_name),
+        len(files) // 4,
+        len(trigrams),
+        len(postings),
+        sum(len(part) for part in paths),
+        sum(len(part) for part in ids),
+    )
+
+    file_descriptor, temp_path = tempfile.mkstemp(
+        prefix=".", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(header)
+            file.write(ref_name.ljust(REF_SIZE, b"\0"))
+            for part in (files, trigrams, lists, postings):
+                part.tofile(file)
+            for part in (*paths, *ids):
+                file.write(part)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path
+
+
+def refresh_index(git_dir: str, ref: str = "HEAD") -> str:
+    """
+    Bring the index of repository to the ``ref`` commit. The index is updated
+    with the files changed since the indexed commit, or built the first time.
+    Return ``INDEX_CURRENT``, ``INDEX_UPDATED``, ``INDEX_BUILT`` or
+    ``INDEX_EMPTY``.
+    """
+    path = join(git_dir, INDEX_FILE)
+    try:
+        commit = git(git_dir, "rev-parse", f"{ref}^{{commit}}").decode().strip()
+    except subprocess.CalledProcessError:
+        return INDEX_EMPTY
+    try:
+        index = TrigramIndex(path)
+    except (OSError, ValueError):
+        index = None
+
+    if index is not None:
+        with index:
+            if index.commit == commit:
+                return INDEX_CURRENT
+            temp_path = update_index(git_dir, index, commit, ref)
+        if temp_path:
+            os.replace(temp_path, path)
+            return INDEX_UPDATED
+
+    build_index(git_dir, path, ref)
+    return INDEX_BUILT
+
+
+def search_index(git_dir: str, keyword: str, ref: str = "HEAD") -> list:
+    """
+    Search with the index of repository, the index is refreshed when the
+    ``ref`` commit moved since it was built.
+    """
+    if refresh_index(git_dir, ref) == INDEX_EMPTY:
+        return []
+
+    with TrigramIndex(join(git_dir, INDEX_FILE)) as index:
+        return index.search(keyword)
+
+
+def search_index_keywords(git_dir: str, keywords: list, ref: str = "HEAD") -> list:
+    """
+    Same as ``search_index`` for several keywords, each item has the
+    ``keyword`` it was found for.
+    """
+    if refresh_index(git_dir, ref) == INDEX_EMPTY:
+        return []
+
+    with TrigramIndex(join(git_dir, INDEX_FILE)) as index:
+        found = index.search_keywords(keywords)
+        return [
+            dict(item, keyword=keyword)
+            for keyword in keywords
+            for item in found[keyword]
+        ]
@@ -1,9 +1,25 @@
-from rx import Observable, operators as ops
-from gsc.constants import GitHubConstant
+import re
+from collections import defaultdict
+from os.path import basename
+from urllib.parse import quote, unquote
+from rx import (
+    Observable,
+    concat,
+    create,
+    defer,
+    empty,
+    from_iterable,
+    just,
+    merge,
+    operators as ops,
+)
+from gsc.constants import GitHubConstant, SEARCH_MAX_RESULTS
+from gsc.core.git_mirror import MirrorStore
+from gsc.core.result_cache import ResultCache
 from gsc.data.repository.base_repository import BaseRepository
+from gsc.data.repository.mirror_repository import MirrorSearchRepository, web_url
 from gsc.data.request.github_request import RepositoryRequest, SearchRequest
-from gsc.data.response.github_response import RepositoryResponse, FileResponse
-from gsc.domain.entities.github_model import Repository, File
+from gsc.domain.entities.github_model import File, Repository
 from gsc.core.rx_task import rx_pool_scheduler
 
 
@@ -13,51 +29,727 @@ class GitHubRepoRepository(BaseRepository):
         self._request = repo_request
 
     def get_repository_info(self, repo_name: str) -> Observable:
-        return self._request.get_repository_info(repo_name).pipe(
-            ops.map(self.__object_mapping)
-        )
+        return self._request.get_repository_info(repo_name)
 
-    def get_repository_list(self) -> Observable:
-        return self._request.get_repository_list(
-            GitHubConstant.REPOSITORY_LIST_API_LIMIT
-        ).pipe(
-            ops.map(self.__object_mapping),
+    def get_repository_list(
+        self, page_size: int = GitHubConstant.REPOSITORY_LIST_API_LIMIT
+    ) -> Observable:
+        return self._request.get_repository_list(page_size).pipe(
             # Ignore fork repositories because search api cannot query them
             ops.filter(lambda item: item.fork is False),
         )
 
-    def __object_mapping(self, response: RepositoryResponse) -> Repository:
-        return Repository(
-            id=response.id,
-            name=response.name,
-            full_name=response.full_name,
-            private=response.private,
-            archived=response.archived,
-            html_url=response.html_url,
-            fork=response.fork,
-            forks_url=response.forks_url,
-        )
-
 
 class GitHubSearchRepository(BaseRepository):
-    def __init__(self, search_request: SearchRequest) -> None:
+    def __init__(
+        self, search_request: SearchRequest, result_cache: ResultCache = None
+    ) -> None:
         super().__init__()
         self._request = search_request
+        self._cache = result_cache or ResultCache(enabled=False)
 
-    def search(self, repo_full_name: int, keyword: str) -> Observable:
+    def search(
+        self, repo_full_name: int, keyword: str, version: str = None
+    ) -> Observable:
+        """
+        Search the keyword in repository. If the version of repository (last push
+        time) is given, the result of an unchanged repository is read from cache.
+        """
+        cache_key = (repo_full_name, keyword)
+        cached_items = self._cache.get(cache_key, version)
+        if cached_items is not None:
+            return from_iterable([File(**item) for item in cached_items])
+
+        items = []
         return self._request.search_in_repo(
             repo_full_name, keyword, GitHubConstant.SEARCH_API_LIMIT
         ).pipe(
             ops.subscribe_on(rx_pool_scheduler),
-            ops.map(lambda value: value.items),
-            ops.flat_map(lambda item: item),
-            ops.map(self.__file_mapping),
+            ops.do_action(
+                on_next=lambda file: items.append(file.to_dict()),
+                on_completed=lambda: self.__cache_result(cache_key, version, items),
+            ),
+        )
+
+    def file_content(self, repo_full_name: str, file: File) -> Observable:
+        """
+        Emit the text of a file found by the search, at the commit of its url,
+        to check a regular expression the text matches do not match.
+        """
+        return self._request.file_content(
+            repo_full_name, file.path, blob_ref(file.html_url, file.path)
+        )
+
+    def search_keywords(
+        self, repo_full_name: str, keywords: list, version: str = None
+    ) -> Observable:
+        """
+        Emit (keyword, file) for each keyword found in repository. The
+        compatible keywords are combined with OR in one query, the files are
+        split back by keyword. The result of each keyword is cached like
+        ``search``.
+        """
+        cached = []
+        pending = []
+        for keyword in keywords:
+            cached_items = self._cache.get((repo_full_name, keyword), version)
+            if cached_items is None:
+                pending.append(keyword)
+            else:
+                cached.extend((keyword, File(**item)) for item in cached_items)
+
+        searches = [
+            self.__search_group(repo_full_name, group, version)
+            for group in combine_keywords(pending)
+        ]
+        return concat(from_iterable(cached), merge(*searches))
+
+    def search_in_repositories(self, repositories: list, keyword: str) -> Observable:
+        """
+        Search the keyword in the repositories, see
+        ``search_keywords_in_repositories``. Emit (repository, files) once each
+        repository is searched.
+        """
+        return collect_matches(
+            self.search_keywords_in_repositories(from_iterable(repositories), [keyword])
+        ).pipe(ops.map(lambda value: (value[0], [file for _, file in value[1]])))
+
+    def search_keywords_in_repositories(
+        self, repositories: Observable, keywords: list
+    ) -> Observable:
+        """
+        Search the keywords in the repositories with as few queries as
+        possible, the repo: qualifiers are packed up to the query length limit
+        as the repositories are listed and the compatible keywords are combined
+        with OR. Emit (repository, (keyword, file)) as the pages arrive, then
+        (repository, complete) once all the files of repository are emitted,
+        see ``end_of_search``. The unchanged repositories are read from cache.
+        """
+        groups = combine_keywords(keywords)
+        # The qualifiers of a pack fit in the query of every group.
+        longest = max((or_query(group) for group in groups), key=len)
+        return repositories.pipe(
+            pack_repositories(
+                longest,
+                GitHubConstant.SEARCH_QUERY_MAX_LENGTH,
+                # A cached repository is not packed, it is read at once.
+                lambda repo: all(
+                    self.__cached_items(repo, group) is not None for group in groups
+                ),
+            ),
+            ops.flat_map(lambda pack: self.__search_pack(pack, groups)),
+        )
+
+    def search_in_owners(self, repositories: list, keyword: str) -> Observable:
+        """
+        Search the keyword with one user: / org: qualifier per owner, only the
+        files of the given repositories are kept. Emit (repository, files) once
+        each repository is searched.
+        """
+        return collect_matches(
+            self.search_keywords_in_owners(from_iterable(repositories), [keyword])
+        ).pipe(ops.map(lambda value: (value[0], [file for _, file in value[1]])))
+
+    def search_keywords_in_owners(
+        self, repositories: Observable, keywords: list
+    ) -> Observable:
+        """
+        Same as ``search_in_owners`` for several keywords, the compatible
+        keywords are combined with OR. Emit the same values as
+        ``search_keywords_in_repositories``.
+        """
+        return repositories.pipe(
+            ops.to_list(),
+            ops.flat_map(
+                lambda repos: self.__search_owners(repos, combine_keywords(keywords))
+            ),
+        )
+
+    def __search_group(self, repo_full_name: str, keywords: list, version: str):
+        """
+        Emit (keyword, file) for the keywords combined with OR in one query,
+        the result of each keyword is cached when all the files are split.
+        """
+        count = [0]
+        matches = []
+
+        def count_item(_):
+            count[0] += 1
+
+        def cache_result():
+            if self.__is_truncated(count[0]) or not is_split(keywords, matches):
+                return
+            for keyword in keywords:
+                self._cache.put(
+                    (repo_full_name, keyword),
+                    version,
+                    [file.to_dict() for key, file in matches if key == keyword],
+                )
+
+        return self._request.search_in_repo(
+            repo_full_name, or_query(keywords), GitHubConstant.SEARCH_API_LIMIT
+        ).pipe(
+            ops.subscribe_on(rx_pool_scheduler),
+            ops.do_action(count_item),
+            ops.flat_map(
+                lambda file: self.__split_file(repo_full_name, keywords, file)
+            ),
+            ops.do_action(on_next=matches.append, on_completed=cache_result),
+        )
+
+    def __split_file(self, repo_full_name: str, keywords: list, file: File):
+        """
+        Emit (keyword, file) for each keyword of a query combined with OR found
+        in the text matches of the file, else in its content. The text matches
+        are truncated and the server normalizes the case and the tokens, a file
+        in which none of the keywords is found is tagged with the whole query.
+        """
+        matches = split_matches(keywords, [file])
+        if matches:
+            return from_iterable(matches)
+
+        def split_content(content: str) -> list:
+            found = found_keywords(keywords, [content])
+            return [(keyword, file) for keyword in found or [or_query(keywords)]]
+
+        return self.file_content(repo_full_name, file).pipe(
+            ops.default_if_empty(""),
+            # The content api refuses the large files.
+            ops.catch(lambda *_: just("")),
+            ops.flat_map(lambda content: from_iterable(split_content(content))),
+        )
+
+    def __cache_result(self, key: tuple, version: str, items: list):
+        if not self.__is_truncated(len(items)):
+            self._cache.put(key, version, items)
+
+    def __is_truncated(self, count: int) -> bool:
+        """
+        Whether the search stopped at the max results, some files are not
+        returned so the result must not be cached.
+        """
+        # The server returns at most SEARCH_MAX_RESULTS items per query.
+        max_results = min(
+            self._request.max_results or SEARCH_MAX_RESULTS, SEARCH_MAX_RESULTS
+        )
+        return count >= max_results
+
+    def __cached_items(self, repo: Repository, keywords: list) -> list:
+        """
+        Return the cached files of each keyword in repository, None if one of
+        them is not cached.
+        """
+        cached_items = [
+            self._cache.get((repo.full_name, keyword), repo.pushed_at)
+            for keyword in keywords
+        ]
+        if any(items is None for items in cached_items):
+            return None
+        return cached_items
+
+    def __search_pack(self, repositories: list, groups: list) -> Observable:
+        incomplete = set()
+        searches = []
+        for group in groups:
+            pending = []
+            for repo in repositories:
+                cached_items = self.__cached_items(repo, group)
+                if cached_items is None:
+                    pending.append(repo)
+                    continue
+                searches.append(
+                    from_iterable(
+                        [
+                            (repo, (keyword, File(**item)))
+                            for keyword, items in zip(group, cached_items)
+                            for item in items
+                        ]
+                    )
+                )
+            if pending:
+                scopes = [(f"repo:{repo.full_name}", [repo]) for repo in pending]
+                searches.append(
+                    self.__search_packed(
+                        pending, group, scopes, incomplete, cacheable=True
+                    )
+                )
+        return concat(merge(*searches), end_of_search(repositories, incomplete))
+
+    def __search_owners(self, repositories: list, groups: list) -> Observable:
+        owners = defaultdict(list)
+        for repo in repositories:
+            if repo.owner:
+                qualifier = "org" if repo.owner_type == "Organization" else "user"
+                owners[f"{qualifier}:{repo.owner}"].append(repo)
+
+        longest = max((or_query(group) for group in groups), key=len)
+        queries = pack_qualifiers(
+            longest, sorted(owners), GitHubConstant.SEARCH_QUERY_MAX_LENGTH
+        )
+        searches = []
+        for query in queries:
+            scopes = [(owner, owners[owner]) for owner in query.split(" ")]
+            repos = [repo for _, owner_repos in scopes for repo in owner_repos]
+            incomplete = set()
+            searches.append(
+                concat(
+                    merge(
+                        *[
+                            self.__search_packed(repos, group, scopes, incomplete)
+                            for group in groups
+                        ]
+                    ),
+                    end_of_search(repos, incomplete),
+                )
+            )
+        # The repositories without owner are not searched.
+        searches.append(
+            from_iterable([(repo, True) for repo in repositories if not repo.owner])
+        )
+        return merge(*searches)
+
+    # pylint: disable=too-many-arguments
+    def __search_packed(
+        self,
+        repositories: list,
+        keywords: list,
+        scopes: list,
+        incomplete: set,
+        cacheable=False,
+    ) -> Observable:
+        """
+        Emit (repository, (keyword, file)) for each file found by the query of
+        the scopes, (qualifier, repositories) of a repository or an owner, as
+        the pages arrive. The max results are applied to each repository.
+
+        The server returns at most SEARCH_MAX_RESULTS files per query, a
+        truncated query is searched again with its scopes split in two and an
+        owner split into its repositories. The repositories still truncated
+        on their own are added to ``incomplete``.
+        """
+        repositories_by_id = {repo.id: repo for repo in repositories}
+        keyword = or_query(keywords)
+        max_results = self._request.max_results
+        counts = defaultdict(int)
+        seen = set()
+        found = defaultdict(list)
+
+        def accept(file: File) -> bool:
+            key = (file.repository_id, file.path)
+            # The owner queries return the repositories which are not listed,
+            # a query searched again returns the files already emitted.
+            if file.repository_id not in repositories_by_id or key in seen:
+                return False
+            seen.add(key)
+            counts[file.repository_id] += 1
+            return max_results is None or counts[file.repository_id] <= max_results
+
+        def is_capped(repo: Repository) -> bool:
+            return max_results is not None and counts[repo.id] >= max_results
+
+        def search(query_scopes: list) -> Observable:
+            count = [0]
+
+            def count_item(_):
+                count[0] += 1
+
+            def search_again():
+                if count[0] < SEARCH_MAX_RESULTS:
+                    return empty()
+                parts = split_scopes(
+                    keyword,
+                    [
+                        (qualifier, [repo for repo in repos if not is_capped(repo)])
+                        for qualifier, repos in query_scopes
+                    ],
+                    incomplete,
+                )
+                # One after the other, the parts share the files already seen.
+                return concat(*[search(part) for part in parts]) if parts else empty()
+
+            return concat(
+                self._request.search_with_qualifiers(
+                    keyword,
+                    " ".join(qualifier for qualifier, _ in query_scopes),
+                    GitHubConstant.SEARCH_API_LIMIT,
+                ).pipe(
+                    ops.subscribe_on(rx_pool_scheduler),
+                    ops.do_action(count_item),
+                    ops.filter(accept),
+                ),
+                defer(lambda _: search_again()),
+            )
+
+        def cache_result():
+            if not cacheable:
+                return
+            for repo in repositories:
+                # Some files are not returned or not split, the result is
+                # not cached.
+                if (
+                    is_capped(repo)
+                    or repo.id in incomplete
+                    or not is_split(keywords, found[repo.id])
+                ):
+                    continue
+                for key in keywords:
+                    self._cache.put(
+                        (repo.full_name, key),
+                        repo.pushed_at,
+                        [
+                            file.to_dict()
+                            for match, file in found[repo.id]
+                            if match == key
+                        ],
+                    )
+
+        return search(scopes).pipe(
+            ops.flat_map(
+                lambda file: self.__split_file(
+                    repositories_by_id[file.repository_id].full_name, keywords, file
+                )
+            ),
+            ops.do_action(
+                on_next=lambda match: found[match[1].repository_id].append(match),
+                on_completed=cache_result,
+            ),
+            ops.map(lambda match: (repositories_by_id[match[1].repository_id], match)),
         )
 
-    def __file_mapping(self, response: FileResponse) -> File:
-        return File(
-            name=response.name,
-            path=response.path,
-            html_url=response.html_url,
-            repository_id=response.repository_id,
+
+class GitHubMirrorSearchRepository(MirrorSearchRepository):
+    """
+    Same contract as ``GitHubSearchRepository``, searching in local mirrors.
+    """
+
+    def __init__(
+        self,
+        repo_request: RepositoryRequest,
+        mirror_store: MirrorStore,
+        indexed: bool = False,
+    ) -> None:
+        super().__init__(mirror_store, indexed)
+        self._request = repo_request
+
+    def search(
+        self, repo_full_name: str, keyword: str, version: str = None
+    ) -> Observable:
+        """
+        Search the keyword in the mirror of repository. The mirror is cloned
+        the first time, then only fetched when the version of repository changed.
+        """
+        return self._search_mirror(
+            repo_full_name,
+            keyword,
+            version,
+            lambda: self.__clone_url(repo_full_name),
+        ).pipe(ops.map(lambda value: mirror_file(web_url(value[0]), value[1])))
+
+    def sync(self, repo: Repository) -> Observable:
+        """
+        Sync the mirror of repository when it was pushed since the last sync,
+        see ``MirrorSearchRepository._sync_mirror``.
+        """
+        return self._sync_mirror(
+            repo.full_name, repo.pushed_at, lambda: f"{repo.html_url}.git"
         )
+
+    def file_content(self, repo_full_name: str, file: File) -> Observable:
+        return self._file_content(
+            repo_full_name, blob_ref(file.html_url, file.path), file.path
+        )
+
+    def search_keywords(
+        self, repo_full_name: str, keywords: list, version: str = None
+    ) -> Observable:
+        """
+        Emit (keyword, file) for each keyword found in the mirror of
+        repository, all keywords are searched in one pass.
+        """
+        return self._search_mirror_keywords(
+            repo_full_name,
+            keywords,
+            version,
+            lambda: self.__clone_url(repo_full_name),
+        ).pipe(
+            ops.map(
+                lambda value: (
+                    value[1]["keyword"],
+                    mirror_file(web_url(value[0]), value[1]),
+                )
+            )
+        )
+
+    def search_in_repositories(self, repositories: list, keyword: str) -> Observable:
+        """
+        Emit (repository, files) for each repository.
+        """
+        return merge(
+            *[self.__search_in_repository(repo, keyword) for repo in repositories]
+        )
+
+    def search_keywords_in_repositories(
+        self, repositories: Observable, keywords: list
+    ) -> Observable:
+        """
+        Emit (repository, (keyword, file)) as the mirror of each listed
+        repository is searched, then (repository, True) once all the files of
+        repository are emitted.
+        """
+        return repositories.pipe(
+            ops.flat_map(
+                lambda repo: concat(
+                    self._search_mirror_keywords(
+                        repo.full_name,
+                        keywords,
+                        repo.pushed_at,
+                        lambda: f"{repo.html_url}.git",
+                    ).pipe(
+                        ops.map(
+                            lambda value: (
+                                repo,
+                                (
+                                    value[1]["keyword"],
+                                    mirror_file(repo.html_url, value[1], repo.id),
+                                ),
+                            )
+                        )
+                    ),
+                    just((repo, True)),
+                )
+            )
+        )
+
+    def search_in_owners(self, repositories: list, keyword: str) -> Observable:
+        return self.search_in_repositories(repositories, keyword)
+
+    def search_keywords_in_owners(
+        self, repositories: Observable, keywords: list
+    ) -> Observable:
+        return self.search_keywords_in_repositories(repositories, keywords)
+
+    def __clone_url(self, repo_full_name: str) -> str:
+        return f"{self._request.get_repository_info(repo_full_name).run().html_url}.git"
+
+    def __search_in_repository(self, repo: Repository, keyword: str) -> Observable:
+        return self._search_mirror(
+            repo.full_name, keyword, repo.pushed_at, lambda: f"{repo.html_url}.git"
+        ).pipe(
+            ops.map(lambda value: mirror_file(repo.html_url, value[1], repo.id)),
+            ops.to_list(),
+            ops.map(lambda files: (repo, files)),
+        )
+
+
+def mirror_file(repo_url: str, item: dict, repository_id: int = None) -> File:
+    path = item["path"]
+    return File(
+        basename(path),
+        path,
+        f"{repo_url}/blob/{quote(item['ref'])}/{quote(path)}",
+        repository_id,
+        (item["data"],) if item.get("data") else (),
+    )
+
+
+def blob_ref(html_url: str, path: str) -> str:
+    """
+    Return the ref of a file url (``.../blob/<ref>/<path>``), None if there is
+    no ref in the url.
+    """
+    _, found, rest = html_url.partition("/blob/")
+    if not found:
+        return None
+    suffix = f"/{quote(path)}"
+    ref = rest[: -len(suffix)] if rest.endswith(suffix) else rest.split("/", 1)[0]
+    return unquote(ref)
+
+
+def combine_keywords(keywords: list) -> list:
+    """
+    Group the keywords searched with one query, joined with OR. Only single
+    words are combined, a keyword with spaces, quotes, parentheses or a
+    qualifier is searched alone.
+    """
+    max_terms = GitHubConstant.SEARCH_MAX_OPERATORS + 1
+    # Keep room in the query for the qualifiers.
+    max_length = GitHubConstant.SEARCH_QUERY_MAX_LENGTH // 2
+    groups = []
+    current = []
+    for keyword in keywords:
+        if not is_combinable(keyword):
+            groups.append([keyword])
+            continue
+        if current and (
+            len(current) == max_terms or len(or_query(current + [keyword])) > max_length
+        ):
+            groups.append(current)
+            current = []
+        current.append(keyword)
+    if current:
+        groups.append(current)
+    return groups
+
+
+def is_combinable(keyword: str) -> bool:
+    return re.fullmatch(r'[^\s"():]+', keyword) is not None and keyword.upper() not in (
+        "AND",
+        "OR",
+        "NOT",
+    )
+
+
+def or_query(keywords: list) -> str:
+    return " OR ".join(keywords)
+
+
+def split_matches(keywords: list, files: list) -> list:
+    """
+    Return the (keyword, file) of the files found by a query of keywords
+    combined with OR, the keyword is found in the text of the matches. A file
+    without matching text (not returned by the server) is left out, see
+    ``GitHubSearchRepository.__split_file``.
+    """
+    return [
+        (keyword, file)
+        for file in files
+        for keyword in found_keywords(keywords, file.fragments)
+    ]
+
+
+def found_keywords(keywords: list, texts) -> list:
+    """
+    Return the keywords of a query combined with OR found in the texts, case
+    insensitive as the search. A single keyword is always found.
+    """
+    if len(keywords) == 1:
+        return list(keywords)
+    text = "\n".join(texts).lower()
+    return [keyword for keyword in keywords if keyword.lower() in text]
+
+
+def is_split(keywords: list, matches: list) -> bool:
+    """
+    Whether all the (keyword, file) matches of a query combined with OR are
+    split by keyword, none of them is tagged with the whole query.
+    """
+    return all(keyword in keywords for keyword, _ in matches)
+
+
+def pack_qualifiers(keyword: str, qualifiers: list, max_length: int) -> list:
+    """
+    Join the qualifiers into as few queries as possible, the qualifiers of a
+    query are combined with OR by the server.
+    """
+    prefix_length = len(f"{keyword} in:file")
+    queries = []
+    current = []
+    length = prefix_length
+    for qualifier in qualifiers:
+        if current and length + 1 + len(qualifier) > max_length:
+            queries.append(" ".join(current))
+            current = []
+            length = prefix_length
+        current.append(qualifier)
+        length += 1 + len(qualifier)
+    if current:
+        queries.append(" ".join(current))
+    return queries
+
+
+def split_scopes(keyword: str, scopes: list, incomplete: set) -> list:
+    """
+    Split the (qualifier, repositories) scopes of a truncated query into the
+    scopes of the queries searched instead : the scopes in two halves, an owner
+    into the repo: qualifiers of its repositories. A repository alone is added
+    to ``incomplete``, it cannot be split further.
+    """
+    scopes = [(qualifier, repos) for qualifier, repos in scopes if repos]
+    if len(scopes) > 1:
+        middle = len(scopes) // 2
+        return [scopes[:middle], scopes[middle:]]
+    if not scopes:
+        return []
+
+    qualifier, repos = scopes[0]
+    if qualifier.startswith("repo:"):
+        incomplete.update(repo.id for repo in repos)
+        return []
+    repos_by_qualifier = {f"repo:{repo.full_name}": repo for repo in repos}
+    queries = pack_qualifiers(
+        keyword, list(repos_by_qualifier), GitHubConstant.SEARCH_QUERY_MAX_LENGTH
+    )
+    return [
+        [(qualifier, [repos_by_qualifier[qualifier]]) for qualifier in query.split(" ")]
+        for query in queries
+    ]
+
+
+def end_of_search(repositories: list, incomplete: set) -> Observable:
+    """
+    Emit (repository, complete) for each repository once it is searched,
+    complete is False when some files of repository are not returned.
+    """
+    return defer(
+        lambda _: from_iterable(
+            [(repo, repo.id not in incomplete) for repo in repositories]
+        )
+    )
+
+
+def pack_repositories(keyword: str, max_length: int, is_alone=None):
+    """
+    Pack the repositories into lists whose repo: qualifiers fit in one query,
+    a list is emitted once it is full or the repositories are all listed.
+    The repositories for which ``is_alone`` is true are emitted at once, in a
+    list of their own.
+    """
+
+    def _pack_repositories(source):
+        def subscribe(observer, scheduler=None):
+            prefix_length = len(f"{keyword} in:file")
+            current = []
+            length = [prefix_length]
+
+            def on_next(repo):
+                if is_alone is not None and is_alone(repo):
+                    observer.on_next([repo])
+                    return
+                qualifier = f"repo:{repo.full_name}"
+                if current and length[0] + 1 + len(qualifier) > max_length:
+                    observer.on_next(list(current))
+                    current.clear()
+                    length[0] = prefix_length
+                current.append(repo)
+                length[0] += 1 + len(qualifier)
+
+            def on_completed():
+                if current:
+                    observer.on_next(list(current))
+                    current.clear()
+                observer.on_completed()
+
+            return source.subscribe(
+                on_next, observer.on_error, on_completed, scheduler=scheduler
+            )
+
+        return create(subscribe)
+
+    return _pack_repositories
+
+
+def collect_matches(values: Observable) -> Observable:
+    """
+    Emit (repository, [(keyword, file)]) once each repository is searched,
+    from the values of ``search_keywords_in_repositories``.
+    """
+    matches = defaultdict(list)
+
+    def collect(value: tuple) -> Observable:
+        repo, match = value
+        if isinstance(match, tuple):
+            matches[repo.id].append(match)
+            return empty()
+        return just((repo, matches.pop(repo.id, [])))
+
+    return values.pipe(ops.flat_map(collect))
@@ -1,9 +1,27 @@
-from rx import Observable, operators as ops
+from collections import defaultdict
+from requests import HTTPError
+from rx import (
+    Observable,
+    concat,
+    defer,
+    empty,
+    from_iterable,
+    just,
+    merge,
+    throw,
+    operators as ops,
+)
 from gsc.constants import GitLabConstant
+from gsc.core.git_mirror import MirrorStore
+from gsc.core.result_cache import ResultCache
 from gsc.data.repository.base_repository import BaseRepository
+from gsc.data.repository.mirror_repository import MirrorSearchRepository
 from gsc.data.request.gitlab_request import ProjectRequest, SearchRequest
-from gsc.data.response.gitlab_response import ProjectResponse, FileResponse
-from gsc.domain.entities.gitlab_model import Project, File
+from gsc.data.response.gitlab_response import file_response
+from gsc.domain.entities.gitlab_model import File, Project
+
+# Status of group / instance blob search when advanced search is not enabled.
+UNSUPPORTED_SEARCH_STATUS = (400, 403, 404)
 
 
 class GitLabProjectRepository(BaseRepository):
@@ -12,46 +30,222 @@ class GitLabProjectRepository(BaseRepository):
         self._request = project_request
 
     def project_info(self, project_id: int) -> Observable:
-        return self._request.project_info(project_id).pipe(
-            ops.map(self.__project_mapping)
-        )
+        return self._request.project_info(project_id)
 
-    def project_list(self, group_name: str) -> Observable:
-        return self._request.project_list(
-            group_name, GitLabConstant.GROUP_API_LIMIT
-        ).pipe(ops.map(self.__project_mapping))
+    def project_list(
+        self, group_name: str, page_size: int = GitLabConstant.GROUP_API_LIMIT
+    ) -> Observable:
+        return self._request.project_list(group_name, page_size)
 
-    def own_project_list(self) -> Observable:
-        return self._request.own_project_list(GitLabConstant.GROUP_API_LIMIT).pipe(
-            ops.map(self.__project_mapping)
-        )
-
-    def __project_mapping(self, response: ProjectResponse) -> Project:
-        return Project(
-            id=response.id,
-            name=response.name,
-            archived=response.archived,
-            url=response.web_url,
-        )
+    def own_project_list(
+        self, page_size: int = GitLabConstant.GROUP_API_LIMIT
+    ) -> Observable:
+        return self._request.own_project_list(page_size)
 
 
 class GitLabSearchRepository(BaseRepository):
-    def __init__(self, search_request: SearchRequest) -> None:
+    # The group and the instance can be searched at once (``search_in_group``).
+    scoped_search = True
+
+    def __init__(
+        self, search_request: SearchRequest, result_cache: ResultCache = None
+    ) -> None:
         super().__init__()
         self._request = search_request
+        self._cache = result_cache or ResultCache(enabled=False)
+
+    def search(self, project_id: int, keyword: str, version: str = None) -> Observable:
+        """
+        Search the keyword in project. If the version of project (last activity
+        time) is given, the result of an unchanged project is read from cache.
+        """
+        cache_key = (project_id, keyword)
+        cached_items = self._cache.get(cache_key, version)
+        if cached_items is not None:
+            return from_iterable([File(**item) for item in cached_items])
 
-    def search(self, project_id: int, keyword: str) -> Observable:
+        found = []
+        items = []
         return self._request.search_in_project(
             project_id, keyword, GitLabConstant.SEARCH_API_LIMIT
         ).pipe(
+            ops.do_action(found.append),
             ops.distinct(lambda item: item.path),
-            ops.map(self.__file_mapping),
+            ops.do_action(
+                on_next=lambda file: items.append(file.to_dict()),
+                on_completed=lambda: self.__cache_result(
+                    cache_key, version, items, len(found)
+                ),
+            ),
+        )
+
+    def __cache_result(self, key: tuple, version: str, items: list, found: int):
+        # Do not cache a truncated result, some files are not returned.
+        max_results = self._request.max_results
+        if max_results is None or found < max_results:
+            self._cache.put(key, version, items)
+
+    def file_content(self, project_id: int, file: File) -> Observable:
+        """
+        Emit the text of a file found by the search, to check a regular
+        expression the preview does not match.
+        """
+        return self._request.file_content(project_id, file.path, file.ref)
+
+    def search_keywords(
+        self, project_id: int, keywords: list, version: str = None
+    ) -> Observable:
+        """
+        Emit (keyword, file) for each keyword found in project. The blob search
+        has no OR operator, the keywords are searched one by one under the
+        same rate limit.
+        """
+        return merge(
+            *[
+                self.search(project_id, keyword, version).pipe(
+                    ops.map(lambda file, keyword=keyword: (keyword, file))
+                )
+                for keyword in keywords
+            ]
         )
 
-    def __file_mapping(self, response: FileResponse) -> File:
-        return File(
-            name=response.name,
-            path=response.path,
-            ref=response.ref,
-            data_preview=response.data_preview,
+    def search_in_group(self, group_name: str, keyword: str) -> Observable:
+        """
+        Search the keyword in all projects of group with one paginated search.
+        Emit the files as the pages arrive, or a single None if the server
+        does not support the blob search of group (no advanced search).
+
+        The result is not cached : the search spans projects which have no
+        common version, it is always sent to the server.
+        """
+        return self.__scoped_files(
+            self._request.search_in_group(
+                group_name, keyword, GitLabConstant.SEARCH_API_LIMIT
+            )
         )
+
+    def search_in_instance(self, keyword: str, projects: list) -> Observable:
+        """
+        Same as ``search_in_group`` for the listed projects, with the search of
+        all projects visible to the user. The files of the projects which are
+        not listed still use up pages, so the search stops after one page per
+        listed project, what searching each project would cost at least. The
+        projects are then searched one by one, the files already emitted are
+        skipped.
+        """
+        max_items = len(projects) * GitLabConstant.SEARCH_API_LIMIT
+        received = [0]
+
+        def count(_):
+            received[0] += 1
+
+        def search_projects(_):
+            if received[0] < max_items:
+                # All the files were received within the pages
+                return empty()
+            return merge(
+                *[
+                    self.search(project.id, keyword, project.last_activity_at)
+                    for project in projects
+                ]
+            )
+
+        files = concat(
+            self._request.search_in_instance(
+                keyword, GitLabConstant.SEARCH_API_LIMIT
+            ).pipe(ops.take(max_items), ops.do_action(count)),
+            defer(search_projects),
+        )
+        return self.__scoped_files(files, {project.id for project in projects})
+
+    def __scoped_files(self, files: Observable, project_ids: set = None) -> Observable:
+        # Same cap as the search of one project, applied to each project. The
+        # scoped search itself is not capped, a large group would use it up.
+        max_results = self._request.max_results
+        counts = defaultdict(int)
+        received = [0]
+
+        def accept(file: File) -> bool:
+            received[0] += 1
+            if project_ids is not None and file.project_id not in project_ids:
+                return False
+            counts[file.project_id] += 1
+            return max_results is None or counts[file.project_id] <= max_results
+
+        def unsupported(error, _):
+            # Blob search of group / instance requires advanced search enabled,
+            # the first page is refused.
+            response = getattr(error, "response", None)
+            if isinstance(error, HTTPError) and response is not None:
+                if (
+                    not received[0]
+                    and response.status_code in UNSUPPORTED_SEARCH_STATUS
+                ):
+                    return just(None)
+            return throw(error)
+
+        return files.pipe(
+            ops.distinct(lambda item: (item.project_id, item.path)),
+            ops.filter(accept),
+            ops.catch(unsupported),
+        )
+
+
+class GitLabMirrorSearchRepository(MirrorSearchRepository):
+    """
+    Same contract as ``GitLabSearchRepository``, searching in local mirrors.
+    There is no scoped search, the projects of a group are searched one by one.
+    """
+
+    scoped_search = False
+
+    def __init__(
+        self,
+        project_request: ProjectRequest,
+        mirror_store: MirrorStore,
+        indexed: bool = False,
+    ) -> None:
+        super().__init__(mirror_store, indexed)
+        self._request = project_request
+
+    def search(self, project_id: int, keyword: str, version: str = None) -> Observable:
+        """
+        Search the keyword in the mirror of project. The mirror is cloned the
+        first time, then only fetched when the version of project changed.
+        """
+        return self._search_mirror(
+            project_id, keyword, version, lambda: self.__clone_url(project_id)
+        ).pipe(ops.map(lambda value: file_response(project_id=project_id, **value[1])))
+
+    def search_keywords(
+        self, project_id: int, keywords: list, version: str = None
+    ) -> Observable:
+        """
+        Emit (keyword, file) for each keyword found in the mirror of project,
+        all keywords are searched in one pass.
+        """
+        return self._search_mirror_keywords(
+            project_id, keywords, version, lambda: self.__clone_url(project_id)
+        ).pipe(
+            ops.map(
+                lambda value: (
+                    value[1]["keyword"],
+                    file_response(project_id=project_id, **value[1]),
+                )
+            )
+        )
+
+    def file_content(self, project_id: int, file: File) -> Observable:
+        return self._file_content(project_id, file.ref, file.path)
+
+    def sync(self, project: Project) -> Observable:
+        """
+        Sync the mirror of project when its last activity changed, see
+        ``MirrorSearchRepository._sync_mirror``.
+        """
+        return self._sync_mirror(
+            project.id, project.last_activity_at, lambda: f"{project.url}.git"
+        )
+
+    def __clone_url(self, project_id: int) -> str:
+        return f"{self._request.project_info(project_id).run().url}.git"
@@ -0,0 +1,92 @@
+from rx import Observable, defer, from_future, from_iterable, just, operators as ops
+from gsc.core.git_mirror import MirrorStore, mirror_pool
+from gsc.core.keyword_scanner import scan_tree
+from gsc.core.local_search import local_search_engine, search_tree
+from gsc.core.rx_task import rx_pool_scheduler
+from gsc.core.trigram_index import refresh_index, search_index, search_index_keywords
+from gsc.data.repository.base_repository import BaseRepository
+
+
+class MirrorSearchRepository(BaseRepository):
+    """
+    Search in local bare mirrors of the projects instead of the search api.
+    The mirrors are synced on the mirror pool (bounded number of fetch), then
+    searched on the process pool of the local search engine.
+
+    With ``indexed``, the search uses the trigram index of each mirror, the
+    index is rebuilt when the mirror head moved.
+    """
+
+    def __init__(self, mirror_store: MirrorStore, indexed: bool = False) -> None:
+        super().__init__()
+        self._store = mirror_store
+        self._indexed = indexed
+        self._search_func = search_index if indexed else search_tree
+        self._scan_func = search_index_keywords if indexed else scan_tree
+
+    def _sync_mirror(self, key, version: str = None, resolve_url=None) -> Observable:
+        """
+        Sync the mirror ``key`` without searching, then refresh its index with
+        the files changed since the last sync. Emit (mirror status, index
+        status), the index status is None when the repository is not indexed.
+        """
+
+        def refresh(value):
+            mirror, status = value
+            if not self._indexed:
+                return just((status, None))
+            return from_future(
+                local_search_engine.submit(refresh_index, mirror.git_dir)
+            ).pipe(ops.map(lambda index_status: (status, index_status)))
+
+        return defer(
+            lambda _: from_future(
+                mirror_pool.submit(self._store.refresh, key, version, resolve_url)
+            )
+        ).pipe(ops.flat_map(refresh))
+
+    def _search_mirror(
+        self, key, keyword: str, version: str = None, resolve_url=None
+    ) -> Observable:
+        """
+        Emit (remote url, item) for each file of the mirror ``key`` matching
+        the keyword, see ``search_tree`` for the keys of item.
+        """
+        return self.__run(key, version, resolve_url, self._search_func, keyword)
+
+    def _search_mirror_keywords(
+        self, key, keywords: list, version: str = None, resolve_url=None
+    ) -> Observable:
+        """
+        Same as ``_search_mirror`` for several keywords searched in one pass
+        over the files, the ``keyword`` of item is the keyword found.
+        """
+        return self.__run(key, version, resolve_url, self._scan_func, keywords)
+
+    def _file_content(self, key, ref: str, path: str) -> Observable:
+        """
+        Emit the text of the file at ref in the mirror ``key``.
+        """
+        return defer(
+            lambda _: just(self._store.mirror(key).git("show", f"{ref}:{path}"))
+        ).pipe(ops.subscribe_on(rx_pool_scheduler))
+
+    def __run(self, key, version: str, resolve_url, func, *args) -> Observable:
+        def search(mirror):
+            url = mirror.url or ""
+            return from_future(
+                local_search_engine.submit(func, mirror.git_dir, *args)
+            ).pipe(
+                ops.flat_map(from_iterable),
+                ops.map(lambda item: (url, item)),
+            )
+
+        return defer(
+            lambda _: from_future(
+                mirror_pool.submit(self._store.sync, key, version, resolve_url)
+            )
+        ).pipe(ops.flat_map(search))
+
+
+def web_url(remote_url: str) -> str:
+    return remote_url[: -len(".git")] if remote_url.endswith(".git") else remote_url
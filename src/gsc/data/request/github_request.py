@@ -1,19 +1,39 @@
 from html import escape
+from urllib.parse import quote
 from gsc.config import AppConfig, GitHubConfig
 from gsc.core.request_decorator import (
     Api,
+    DEFAULT_PREFETCH_PAGES,
     get_request,
     get_request_pagination,
 )
 from gsc.constants import GitHubConstant, APP_NAME
 from gsc.core.rx_task import rx_task
+from gsc.core.progress import search_progress
+from gsc.core.response_cache import ResponseCache
 from gsc.core.rate_limit import rate_limit
-from gsc.data.response.github_response import RepositoryResponse, ResultResponse
+from gsc.data.response.github_response import (
+    file_content_response,
+    file_response,
+    repository_response,
+)
+
+# Shared by all the search queries, the quota is counted per user.
+search_rate_limit = rate_limit(
+    calls=GitHubConstant.SEARCH_RATE_LIMIT_CALLS,
+    period=GitHubConstant.SEARCH_RATE_LIMIT_PERIOD,
+    min_interval=GitHubConstant.SEARCH_RATE_LIMIT_INTERVAL,
+)
 
 
 class GitHubApi(Api):
     def __init__(self, config: GitHubConfig, app_config: AppConfig) -> None:
         selected_env = config.get_session_env()
+        response_cache = None
+        if app_config.is_cache_enabled():
+            response_cache = ResponseCache(
+                GitHubConstant.NAME, selected_env.name, ttl=selected_env.cache_ttl
+            )
         super().__init__(
             selected_env.host_name,
             {
@@ -23,35 +43,73 @@ class GitHubApi(Api):
             },
             selected_env.verify_ssl_cert,
             app_config.is_debug(),
+            response_cache=response_cache,
+            max_results=app_config.get_max_results(),
         )
 
 
 class RepositoryRequest(GitHubApi):
     @rx_task
-    @get_request_pagination(path="user/repos", response_model=RepositoryResponse)
+    @get_request_pagination(
+        path="user/repos",
+        response_model=repository_response,
+        prefetch=DEFAULT_PREFETCH_PAGES,
+        cacheable=True,
+    )
     def get_repository_list(self, limit: int):
         return None, {"page": 1, "per_page": limit}
 
     @rx_task
-    @get_request(path="repos/{repo_name}", response_model=RepositoryResponse)
+    @get_request(path="repos/{repo_name}", response_model=repository_response)
     def get_repository_info(self, repo_name: str):
         return {"repo_name": repo_name}, None
 
 
 class SearchRequest(GitHubApi):
     @rx_task
-    @rate_limit(
-        calls=GitHubConstant.SEARCH_RATE_LIMIT_CALLS,
-        period=GitHubConstant.SEARCH_RATE_LIMIT_PERIOD,
-    )
-    @get_request(
+    @get_request_pagination(
         path="search/code",
         headers={"Accept": "application/vnd.github.v3.text-match+json"},
-        response_model=ResultResponse,
+        response_model=file_response,
+        rate_limiter=search_rate_limit,
+        progress=search_progress,
+        capped=True,
+        stream=True,
+        items_key="items",
     )
     def search_in_repo(self, repo_full_name: int, keyword: str, limit: int):
         query = escape(f"{keyword} in:file repo:{repo_full_name}")
         return None, {
             "q": query,
+            "page": 1,
+            "per_page": limit,
+        }
+
+    @rx_task
+    @get_request_pagination(
+        path="search/code",
+        headers={"Accept": "application/vnd.github.v3.text-match+json"},
+        response_model=file_response,
+        rate_limiter=search_rate_limit,
+        progress=search_progress,
+        stream=True,
+        items_key="items",
+    )
+    def search_with_qualifiers(self, keyword: str, qualifiers: str, limit: int):
+        query = escape(f"{keyword} in:file {qualifiers}")
+        return None, {
+            "q": query,
+            "page": 1,
             "per_page": limit,
         }
+
+    @rx_task
+    @get_request(
+        path="repos/{repo_name}/contents/{file_path}",
+        response_model=file_content_response,
+        cacheable=True,
+    )
+    def file_content(self, repo_name: str, file_path: str, ref: str = None):
+        return {"repo_name": repo_name, "file_path": quote(file_path)}, (
+            {"ref": ref} if ref else None
+        )
@@ -1,18 +1,38 @@
+from urllib.parse import quote
 from gsc.config import AppConfig, GitLabConfig
 from gsc.core.request_decorator import (
     Api,
+    DEFAULT_PREFETCH_PAGES,
     get_request,
     get_request_pagination,
 )
 from gsc.constants import GitLabConstant, APP_NAME
 from gsc.core.rx_task import rx_task
+from gsc.core.progress import search_progress
+from gsc.core.response_cache import ResponseCache
 from gsc.core.rate_limit import rate_limit
-from gsc.data.response.gitlab_response import FileResponse, ProjectResponse
+from gsc.data.response.gitlab_response import (
+    file_content_response,
+    file_response,
+    project_response,
+)
+
+# Shared by all the search endpoints, the quota is counted per user.
+search_rate_limit = rate_limit(
+    calls=GitLabConstant.SEARCH_RATE_LIMIT_CALLS,
+    period=GitLabConstant.SEARCH_RATE_LIMIT_PERIOD,
+    min_interval=GitLabConstant.SEARCH_RATE_LIMIT_INTERVAL,
+)
 
 
 class GitLabApi(Api):
     def __init__(self, config: GitLabConfig, app_config: AppConfig) -> None:
         selected_env = config.get_session_env()
+        response_cache = None
+        if app_config.is_cache_enabled():
+            response_cache = ResponseCache(
+                GitLabConstant.NAME, selected_env.name, ttl=selected_env.cache_ttl
+            )
         super().__init__(
             selected_env.host_name,
             {
@@ -22,13 +42,18 @@ class GitLabApi(Api):
             },
             selected_env.verify_ssl_cert,
             app_config.is_debug(),
+            response_cache=response_cache,
+            max_results=app_config.get_max_results(),
         )
 
 
 class ProjectRequest(GitLabApi):
     @rx_task
     @get_request_pagination(
-        path="api/v4/groups/{group_name}/projects", response_model=ProjectResponse
+        path="api/v4/groups/{group_name}/projects",
+        response_model=project_response,
+        prefetch=DEFAULT_PREFETCH_PAGES,
+        cacheable=True,
     )
     def project_list(self, group_name: str, limit: int):
         return {"group_name": group_name}, {
@@ -37,29 +62,82 @@ class ProjectRequest(GitLabApi):
             "order_by": "id",
             "sort": "asc",
             "include_subgroups": "true",
+            "statistics": "true",
         }
 
     @rx_task
-    @get_request_pagination(path="api/v4/projects", response_model=ProjectResponse)
+    @get_request_pagination(
+        path="api/v4/projects",
+        response_model=project_response,
+        prefetch=DEFAULT_PREFETCH_PAGES,
+        cacheable=True,
+    )
     def own_project_list(self, limit: int):
-        return None, {"simple": "true", "owned": "true", "per_page": limit}
+        return None, {"owned": "true", "statistics": "true", "per_page": limit}
 
     @rx_task
-    @get_request(path="api/v4/projects/{proj_id}", response_model=ProjectResponse)
+    @get_request(path="api/v4/projects/{proj_id}", response_model=project_response)
     def project_info(self, proj_id: int):
         return {"proj_id": proj_id}, None
 
 
 class SearchRequest(GitLabApi):
     @rx_task
-    @rate_limit(
-        calls=GitLabConstant.SEARCH_RATE_LIMIT_CALLS,
-        period=GitLabConstant.SEARCH_RATE_LIMIT_PERIOD,
+    @get_request_pagination(
+        path="api/v4/projects/{proj_id}/search",
+        response_model=file_response,
+        rate_limiter=search_rate_limit,
+        progress=search_progress,
+        capped=True,
+        stream=True,
     )
-    @get_request(path="api/v4/projects/{proj_id}/search", response_model=FileResponse)
     def search_in_project(self, proj_id: int, keyword: str, limit: int):
         return {"proj_id": proj_id}, {
             "scope": "blobs",
             "search": keyword,
+            "page": 1,
+            "per_page": limit,
+        }
+
+    @rx_task
+    @get_request_pagination(
+        path="api/v4/groups/{group_name}/search",
+        response_model=file_response,
+        rate_limiter=search_rate_limit,
+        progress=search_progress,
+        stream=True,
+    )
+    def search_in_group(self, group_name: str, keyword: str, limit: int):
+        return {"group_name": group_name}, {
+            "scope": "blobs",
+            "search": keyword,
+            "page": 1,
             "per_page": limit,
         }
+
+    @rx_task
+    @get_request_pagination(
+        path="api/v4/search",
+        response_model=file_response,
+        rate_limiter=search_rate_limit,
+        progress=search_progress,
+        stream=True,
+    )
+    def search_in_instance(self, keyword: str, limit: int):
+        return None, {
+            "scope": "blobs",
+            "search": keyword,
+            "page": 1,
+            "per_page": limit,
+        }
+
+    @rx_task
+    @get_request(
+        path="api/v4/projects/{proj_id}/repository/files/{file_path}",
+        response_model=file_content_response,
+        cacheable=True,
+    )
+    def file_content(self, proj_id: int, file_path: str, ref: str):
+        return {"proj_id": proj_id, "file_path": quote(file_path, safe="")}, {
+            "ref": ref
+        }
@@ -1,42 +1,37 @@
-from dataclasses import dataclass
-from gsc.core.base_model import BaseModel
+import base64
+from gsc.domain.entities.github_model import File, Repository
 
 
-# pylint: disable=R0902
-@dataclass
-class RepositoryResponse(BaseModel):
-    def __init__(self, **kwargs):
-        super().__init__()
-        # pylint: disable=C0103
-        self.id = kwargs.get("id")
-        self.name = kwargs.get("name")
-        self.full_name = kwargs.get("full_name")
-        self.private = kwargs.get("private")
-        self.archived = kwargs.get("archived")
-        self.html_url = kwargs.get("html_url")
-        self.fork = kwargs.get("fork")
-        self.forks_url = kwargs.get("forks_url")
+# The entities are built straight from the decoded JSON items.
+def repository_response(**kwargs) -> Repository:
+    owner = kwargs.get("owner")
+    return Repository(
+        id=kwargs.get("id"),
+        name=kwargs.get("name"),
+        full_name=kwargs.get("full_name"),
+        private=kwargs.get("private"),
+        archived=kwargs.get("archived"),
+        html_url=kwargs.get("html_url"),
+        fork=kwargs.get("fork"),
+        forks_url=kwargs.get("forks_url"),
+        pushed_at=kwargs.get("pushed_at"),
+        owner=owner.get("login") if owner else None,
+        owner_type=owner.get("type") if owner else None,
+    )
 
 
-@dataclass
-class ResultResponse(BaseModel):
-    def __init__(self, **kwargs):
-        super().__init__()
-        self.total_count = kwargs.get("total_count")
-        self.items = []
-        items = kwargs.get("items")
-        if items:
-            for item in items:
-                self.items.append(FileResponse(**item))
+def file_response(**kwargs) -> File:
+    repository = kwargs.get("repository")
+    return File(
+        kwargs.get("name"),
+        kwargs.get("path"),
+        kwargs.get("html_url"),
+        repository.get("id") if repository else None,
+        tuple(match.get("fragment", "") for match in kwargs.get("text_matches") or ()),
+    )
 
 
-@dataclass
-class FileResponse(BaseModel):
-    def __init__(self, **kwargs):
-        super().__init__()
-        self.name = kwargs.get("name")
-        self.path = kwargs.get("path")
-        self.html_url = kwargs.get("html_url")
-        repository = kwargs.get("repository")
-        if repository:
-            self.repository_id = repository.get("id")
+def file_content_response(**kwargs) -> str:
+    # The content of the file api is base64, decoded as text for the regex.
+    content = base64.b64decode(kwargs.get("content") or "")
+    return content.decode("utf-8", "replace")
@@ -1,25 +1,33 @@
-from dataclasses import dataclass
-from gsc.core.base_model import BaseModel
+import base64
+from gsc.domain.entities.gitlab_model import File, Project
 
 
-@dataclass
-class ProjectResponse(BaseModel):
-    def __init__(self, **kwargs):
-        super().__init__()
-        # pylint: disable=C0103
-        self.id = kwargs.get("id")
-        self.name = kwargs.get("name_with_namespace")
-        self.archived = kwargs.get("archived")
-        self.web_url = kwargs.get("web_url")
+# The entities are built straight from the decoded JSON items.
+def project_response(**kwargs) -> Project:
+    statistics = kwargs.get("statistics")
+    return Project(
+        id=kwargs.get("id"),
+        name=kwargs.get("name_with_namespace"),
+        archived=kwargs.get("archived"),
+        url=kwargs.get("web_url"),
+        last_activity_at=kwargs.get("last_activity_at"),
+        empty_repo=kwargs.get("empty_repo"),
+        repository_size=statistics.get("repository_size") if statistics else None,
+    )
 
 
-@dataclass
-class FileResponse(BaseModel):
-    def __init__(self, **kwargs):
-        super().__init__()
-        self.name = kwargs.get("basename")
-        self.path = kwargs.get("path")
-        self.ref = kwargs.get("ref")
-        self.start_line = kwargs.get("startline")
-        self.project_id = kwargs.get("project_id")
-        self.data_preview = kwargs.get("data")
+def file_response(**kwargs) -> File:
+    return File(
+        kwargs.get("basename"),
+        kwargs.get("path"),
+        kwargs.get("ref"),
+        kwargs.get("data"),
+        "",
+        kwargs.get("project_id"),
+    )
+
+
+def file_content_response(**kwargs) -> str:
+    # The content of the file api is base64, decoded as text for the regex.
+    content = base64.b64decode(kwargs.get("content") or "")
+    return content.decode("utf-8", "replace")
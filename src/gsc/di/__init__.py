@@ -0,0 +1,17 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_container():
+    # pylint: disable=C0415
+    from gsc.di.application_container import ApplicationContainer
+
+    return ApplicationContainer()
+
+
+def wire(*modules: str):
+    """
+    Wire the container into the modules of the invoked command only, instead of
+    importing the whole package.
+    """
+    get_container().wire(modules=modules)
@@ -1,14 +1,7 @@
 from dependency_injector import containers, providers
 from gsc.config import GitHubConfig
-from gsc.data.request.github_request import RepositoryRequest, SearchRequest
-from gsc.data.repository.github_repository import (
-    GitHubRepoRepository,
-    GitHubSearchRepository,
-)
-from gsc.domain.use_cases.github_search_use_case import (
-    GitHubSearchRepoUseCase,
-    GitHubSearchMultiRepoUseCase,
-)
+from gsc.constants import GitHubConstant
+from gsc.di.lazy_provider import lazy
 
 
 class GitHubContainer(containers.DeclarativeContainer):
@@ -20,20 +13,75 @@ class GitHubContainer(containers.DeclarativeContainer):
 
     # Api request
     repo_request = providers.Singleton(
-        RepositoryRequest, config=config, app_config=app_config
+        lazy("gsc.data.request.github_request.RepositoryRequest"),
+        config=config,
+        app_config=app_config,
     )
     search_request = providers.Singleton(
-        SearchRequest, config=config, app_config=app_config
+        lazy("gsc.data.request.github_request.SearchRequest"),
+        config=config,
+        app_config=app_config,
+    )
+
+    # Cache
+    search_cache = providers.Singleton(
+        lazy("gsc.core.result_cache.ResultCache"),
+        GitHubConstant.NAME,
+        config.provided.get_session_env.call().name,
+        "search",
+        enabled=app_config.provided.is_cache_enabled.call(),
+    )
+
+    # Local mirrors
+    mirror_store = providers.Singleton(
+        lazy("gsc.core.git_mirror.MirrorStore"),
+        GitHubConstant.NAME,
+        config.provided.get_session_env.call().name,
+        user="x-access-token",
+        token=config.provided.get_session_env.call().private_token,
+        verify_ssl=config.provided.get_session_env.call().verify_ssl_cert,
     )
 
     # Repository
-    get_repo = providers.Factory(GitHubRepoRepository, repo_request)
-    search_repo = providers.Factory(GitHubSearchRepository, search_request)
+    get_repo = providers.Factory(
+        lazy("gsc.data.repository.github_repository.GitHubRepoRepository"), repo_request
+    )
+    search_repo = providers.Selector(
+        app_config.provided.get_engine.call(),
+        api=providers.Factory(
+            lazy("gsc.data.repository.github_repository.GitHubSearchRepository"),
+            search_request,
+            search_cache,
+        ),
+        mirror=providers.Factory(
+            lazy("gsc.data.repository.github_repository.GitHubMirrorSearchRepository"),
+            repo_request,
+            mirror_store,
+        ),
+        index=providers.Factory(
+            lazy("gsc.data.repository.github_repository.GitHubMirrorSearchRepository"),
+            repo_request,
+            mirror_store,
+            indexed=True,
+        ),
+    )
 
     # Use case
     search_repo_use_case = providers.Factory(
-        GitHubSearchRepoUseCase, get_repo, search_repo
+        lazy("gsc.domain.use_cases.github_search_use_case.GitHubSearchRepoUseCase"),
+        get_repo,
+        search_repo,
     )
     search_multi_repo_use_case = providers.Factory(
-        GitHubSearchMultiRepoUseCase, get_repo, search_repo
+        lazy(
+            "gsc.domain.use_cases.github_search_use_case.GitHubSearchMultiRepoUseCase"
+        ),
+        get_repo,
+        search_repo,
+    )
+    # The engine is set to "mirror" or "index" by the sync command.
+    sync_multi_repo_use_case = providers.Factory(
+        lazy("gsc.domain.use_cases.github_sync_use_case.GitHubSyncMultiRepoUseCase"),
+        get_repo,
+        search_repo,
     )
@@ -1,14 +1,7 @@
 from dependency_injector import containers, providers
 from gsc.config import GitLabConfig
-from gsc.data.request.gitlab_request import ProjectRequest, SearchRequest
-from gsc.data.repository.gitlab_repository import (
-    GitLabProjectRepository,
-    GitLabSearchRepository,
-)
-from gsc.domain.use_cases.gitlab_search_use_case import (
-    GitLabSearchProjectUseCase,
-    GitLabSearchGroupUseCase,
-)
+from gsc.constants import GitLabConstant
+from gsc.di.lazy_provider import lazy
 
 
 class GitLabContainer(containers.DeclarativeContainer):
@@ -20,20 +13,74 @@ class GitLabContainer(containers.DeclarativeContainer):
 
     # Api request
     project_request = providers.Singleton(
-        ProjectRequest, config=config, app_config=app_config
+        lazy("gsc.data.request.gitlab_request.ProjectRequest"),
+        config=config,
+        app_config=app_config,
     )
     search_request = providers.Singleton(
-        SearchRequest, config=config, app_config=app_config
+        lazy("gsc.data.request.gitlab_request.SearchRequest"),
+        config=config,
+        app_config=app_config,
+    )
+
+    # Cache
+    search_cache = providers.Singleton(
+        lazy("gsc.core.result_cache.ResultCache"),
+        GitLabConstant.NAME,
+        config.provided.get_session_env.call().name,
+        "search",
+        enabled=app_config.provided.is_cache_enabled.call(),
+    )
+
+    # Local mirrors
+    mirror_store = providers.Singleton(
+        lazy("gsc.core.git_mirror.MirrorStore"),
+        GitLabConstant.NAME,
+        config.provided.get_session_env.call().name,
+        user="oauth2",
+        token=config.provided.get_session_env.call().private_token,
+        verify_ssl=config.provided.get_session_env.call().verify_ssl_cert,
     )
 
     # Repository
-    project_repo = providers.Factory(GitLabProjectRepository, project_request)
-    search_repo = providers.Factory(GitLabSearchRepository, search_request)
+    project_repo = providers.Factory(
+        lazy("gsc.data.repository.gitlab_repository.GitLabProjectRepository"),
+        project_request,
+    )
+    search_repo = providers.Selector(
+        app_config.provided.get_engine.call(),
+        api=providers.Factory(
+            lazy("gsc.data.repository.gitlab_repository.GitLabSearchRepository"),
+            search_request,
+            search_cache,
+        ),
+        mirror=providers.Factory(
+            lazy("gsc.data.repository.gitlab_repository.GitLabMirrorSearchRepository"),
+            project_request,
+            mirror_store,
+        ),
+        index=providers.Factory(
+            lazy("gsc.data.repository.gitlab_repository.GitLabMirrorSearchRepository"),
+            project_request,
+            mirror_store,
+            indexed=True,
+        ),
+    )
 
     # Use case
     search_proj_use_case = providers.Factory(
-        GitLabSearchProjectUseCase, project_repo, search_repo
+        lazy("gsc.domain.use_cases.gitlab_search_use_case.GitLabSearchProjectUseCase"),
+        project_repo,
+        search_repo,
     )
     search_group_use_case = providers.Factory(
-        GitLabSearchGroupUseCase, project_repo, search_repo
+        lazy("gsc.domain.use_cases.gitlab_search_use_case.GitLabSearchGroupUseCase"),
+        project_repo,
+        search_repo,
+    )
+    # The engine is set to "mirror" or "index" by the sync command.
+    sync_group_use_case = providers.Factory(
+        lazy("gsc.domain.use_cases.gitlab_sync_use_case.GitLabSyncGroupUseCase"),
+        project_repo,
+        search_repo,
     )
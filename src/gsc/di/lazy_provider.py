@@ -0,0 +1,15 @@
+from importlib import import_module
+
+
+def lazy(path: str):
+    """
+    Provide the class at ``module.Class`` path, the module is only imported when
+    the provider is called.
+    """
+    module_name, name = path.rsplit(".", 1)
+
+    def create(*args, **kwargs):
+        return getattr(import_module(module_name), name)(*args, **kwargs)
+
+    create.__qualname__ = name
+    return create
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from gsc.core.base_model import BaseModel
+from gsc.core.base_model import BaseModel, SlotModel
+
 
 # pylint: disable=R0902
 @dataclass(unsafe_hash=True)
@@ -13,11 +14,13 @@ class Repository(BaseModel):
     html_url: str
     fork: bool
     forks_url: str
+    pushed_at: str = None
+    owner: str = None
+    owner_type: str = None
 
 
-@dataclass
-class File(BaseModel):
-    name: str
-    path: str
-    html_url: str
-    repository_id: int
+class File(SlotModel):
+    # fragments: text of the matches returned by the server, to find which
+    # keyword of a query combined with OR matched the file.
+    __slots__ = ("name", "path", "html_url", "repository_id", "fragments")
+    _defaults = {"fragments": ()}
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from gsc.core.base_model import BaseModel
+from datetime import datetime, timezone
+from gsc.core.base_model import BaseModel, SlotModel
+from gsc.utils import parse_iso_datetime
 
 
 @dataclass(unsafe_hash=True)
@@ -9,16 +11,38 @@ class Project(BaseModel):
     name: str
     archived: bool
     url: str
+    last_activity_at: str = None
+    empty_repo: bool = None
+    repository_size: int = None
 
 
-@dataclass
-class File(BaseModel):
-    name: str
-    path: str
-    ref: str
-    data_preview: bool
-    project_url: str = ""
+class File(SlotModel):
+    __slots__ = ("name", "path", "ref", "data_preview", "project_url", "project_id")
+    _defaults = {"project_url": "", "project_id": None}
 
     @property
     def url(self):
         return f"{self.project_url}/-/blob/{self.ref}/{self.path}"
+
+
+@dataclass
+class ProjectFilter:
+    exclude_archived: bool = False
+    exclude_empty: bool = False
+    active_since: datetime = None
+
+    def accept(self, project: Project) -> bool:
+        if self.exclude_archived and project.archived:
+            return False
+
+        if self.exclude_empty and (project.empty_repo or project.repository_size == 0):
+            return False
+
+        last_activity = parse_iso_datetime(project.last_activity_at)
+        if self.active_since and last_activity:
+            active_since = self.active_since
+            if active_since.tzinfo is None:
+                active_since = active_since.replace(tzinfo=timezone.utc)
+            return last_activity >= active_since
+
+        return True
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class FileEvent:
+    # Project of GitLab or repository of GitHub
+    project: Any
+    file: Any
+    # Keyword found in the file
+    keyword: str = None
+
+
+@dataclass
+class ProjectSummaryEvent:
+    # Emitted after all the files of the project
+    project: Any
+    file_count: int
+    # Some files are not returned by the server (search results limit)
+    incomplete: bool = False
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class SyncEvent:
+    # Project of GitLab or repository of GitHub
+    project: Any
+    # Status of the mirror, see gsc.core.git_mirror
+    status: str = None
+    # Status of the index, None when the mirror is not indexed
+    index_status: str = None
+    error: Exception = None
@@ -1,5 +1,126 @@
 import abc
+import threading
+from rx import Observable, concat, create, defer, from_iterable, just, operators as ops
+from gsc.domain.entities.search_event import FileEvent, ProjectSummaryEvent
 
 
 class BaseUseCase(abc.ABC):
     pass
+
+
+def keyword_list(keyword) -> list:
+    """
+    Return the keywords to search, one keyword or a list of keywords.
+    """
+    return [keyword] if isinstance(keyword, str) else list(keyword)
+
+
+def stream_files(project, files: Observable) -> Observable:
+    """
+    Emit a FileEvent as soon as each file is found, then the ProjectSummaryEvent
+    of the project.
+    """
+    return stream_matches(project, files.pipe(ops.map(lambda file: (None, file))))
+
+
+def stream_file_list(project, files: list) -> Observable:
+    return stream_files(project, from_iterable(files))
+
+
+def stream_matches(project, matches: Observable, is_incomplete=None) -> Observable:
+    """
+    Same as ``stream_files`` for the (keyword, file) found by a search of
+    several keywords. ``is_incomplete`` tells, once the matches are emitted,
+    whether some files of the project were not returned.
+    """
+    count = [0]
+
+    def to_event(match: tuple) -> FileEvent:
+        count[0] += 1
+        return FileEvent(project, match[1], match[0])
+
+    def summary() -> ProjectSummaryEvent:
+        incomplete = is_incomplete() if is_incomplete else False
+        return ProjectSummaryEvent(project, count[0], incomplete)
+
+    return concat(
+        matches.pipe(ops.map(to_event)),
+        defer(lambda _: just(summary())),
+    )
+
+
+def stream_match_list(project, matches: list) -> Observable:
+    return stream_matches(project, from_iterable(matches))
+
+
+def verify_matches(matches: Observable, verifier, load_content) -> Observable:
+    """
+    Keep the (keyword, file) matches of a project which match the regular
+    expressions of verifier (``RegexVerifier``), the matches of the project are
+    checked at once. Without verifier the matches are kept as is.
+    """
+    if verifier is None:
+        return matches
+    return matches.pipe(
+        ops.to_list(),
+        ops.flat_map(lambda found: verifier.verify(found, load_content)),
+    )
+
+
+def one_project_at_a_time():
+    """
+    Keep the events of a project together while the projects are searched in
+    parallel. The events of the first project are emitted as they come, the
+    ones of the next projects are buffered until the previous project is done.
+    """
+
+    def _one_project_at_a_time(source):
+        def subscribe(observer, scheduler=None):
+            lock = threading.RLock()
+            order = []
+            buffers = {}
+            finished = set()
+
+            def flush():
+                while order:
+                    head = order[0]
+                    for event in buffers.pop(head, []):
+                        observer.on_next(event)
+                    if head not in finished:
+                        buffers[head] = []
+                        return
+                    order.pop(0)
+
+            def on_next(event):
+                with lock:
+                    key = event.project.id
+                    if key not in buffers and key not in finished:
+                        order.append(key)
+                        buffers[key] = []
+                    if isinstance(event, ProjectSummaryEvent):
+                        finished.add(key)
+
+                    if order and order[0] == key:
+                        observer.on_next(event)
+                        if key in finished:
+                            buffers.pop(key, None)
+                            order.pop(0)
+                            flush()
+                    else:
+                        buffers[key].append(event)
+
+            def on_completed():
+                with lock:
+                    for key in order:
+                        for event in buffers.pop(key, []):
+                            observer.on_next(event)
+                    order.clear()
+                observer.on_completed()
+
+            return source.subscribe(
+                on_next, observer.on_error, on_completed, scheduler=scheduler
+            )
+
+        return create(subscribe)
+
+    return _one_project_at_a_time
@@ -1,8 +1,17 @@
 from rx.core import Observable
 from rx.subject import ReplaySubject
-from rx import combine_latest, just, operators as ops
-from gsc.domain.entities.github_model import Repository
-from gsc.domain.use_cases.base_use_case import BaseUseCase
+from rx import operators as ops
+from gsc.constants import GitHubConstant
+from gsc.domain.entities.github_model import File, Repository
+from gsc.domain.use_cases.base_use_case import (
+    BaseUseCase,
+    keyword_list,
+    one_project_at_a_time,
+    stream_matches,
+    verify_matches,
+)
+from gsc.core.local_search import local_search_engine
+from gsc.core.regex_search import RegexVerifier
 from gsc.core.rx_task import rx_pool_scheduler
 from gsc.data.repository.github_repository import (
     GitHubRepoRepository,
@@ -21,10 +30,31 @@ class GitHubSearchRepoUseCase(BaseUseCase):
     def on_searching(self) -> Observable:
         return self._on_searching
 
-    def search(self, repo_name: str, keyword: str):
-        combine_latest(
-            self._get_repo.get_repository_info(repo_name),
-            self._search_repo.search(repo_name, keyword).pipe(ops.to_list()),
+    def search(self, repo_name: str, keyword, regex: bool = False):
+        """
+        Search the keyword, or the list of keywords, in repository. With
+        regex, the keywords are regular expressions.
+        """
+        keywords = keyword_list(keyword)
+        verifier = regex_verifier(keywords) if regex else None
+        if verifier:
+            keywords = verifier.keywords()
+
+        self._get_repo.get_repository_info(repo_name).pipe(
+            ops.flat_map(
+                lambda repo: stream_matches(
+                    repo,
+                    verify_matches(
+                        self._search_repo.search_keywords(
+                            repo.full_name, keywords, repo.pushed_at
+                        ),
+                        verifier,
+                        lambda file: self._search_repo.file_content(
+                            repo.full_name, file
+                        ),
+                    ),
+                )
+            ),
         ).subscribe(self._on_searching)
 
 
@@ -39,20 +69,102 @@ class GitHubSearchMultiRepoUseCase(BaseUseCase):
     def on_searching(self) -> Observable:
         return self._on_searching
 
-    def search(self, keyword: str) -> Observable:
-        self._get_repo.get_repository_list().pipe(
-            ops.group_by(lambda repo: repo),
-            ops.flat_map(
-                lambda group: group.pipe(
-                    ops.observe_on(rx_pool_scheduler),
-                    ops.map(lambda repo: self.__search_in_repository(repo, keyword)),
+    def search(
+        self,
+        keyword,
+        page_size: int = None,
+        search_mode: str = None,
+        regex: bool = False,
+    ) -> Observable:
+        """
+        Search the keyword, or the list of keywords, in the repositories of
+        the user. The repositories are listed once for all the keywords. With
+        regex, the keywords are regular expressions.
+        """
+        keywords = keyword_list(keyword)
+        verifier = regex_verifier(keywords) if regex else None
+        if verifier:
+            keywords = verifier.keywords()
+        page_size = page_size or GitHubConstant.REPOSITORY_LIST_API_LIMIT
+        search_mode = search_mode or GitHubConstant.DEFAULT_SEARCH_MODE
+        repositories = self._get_repo.get_repository_list(page_size)
+
+        if search_mode == "repo":
+            events = repositories.pipe(
+                ops.flat_map(
+                    lambda repo: self.__search_in_repository(repo, keywords, verifier)
                 )
+            )
+        else:
+            if search_mode == "owner":
+                search = self._search_repo.search_keywords_in_owners
+            else:
+                search = self._search_repo.search_keywords_in_repositories
+            # The packed queries return many repositories at once, the hits are
+            # routed by repository as the pages arrive.
+            events = search(repositories, keywords).pipe(
+                # Replayed, the events of a repository are subscribed after its
+                # first value is emitted.
+                ops.group_by(lambda value: value[0], subject_mapper=ReplaySubject),
+                ops.flat_map(lambda values: self.__stream_repository(values, verifier)),
+            )
+
+        events.pipe(one_project_at_a_time()).subscribe(self._on_searching)
+
+    def __stream_repository(self, values: Observable, verifier):
+        """
+        Emit the events of a repository from its (repository, match) values,
+        the summary once the (repository, complete) value ends them.
+        """
+        repo = values.key
+        complete = [True]
+
+        def is_match(value: tuple) -> bool:
+            if isinstance(value[1], tuple):
+                return True
+            complete[0] = value[1]
+            return False
+
+        return stream_matches(
+            repo,
+            verify_matches(
+                values.pipe(
+                    ops.take_while(is_match),
+                    ops.map(lambda value: value[1]),
+                ),
+                verifier,
+                self.__content_loader(repo),
             ),
-            ops.flat_map(lambda item: item),
-        ).subscribe(self._on_searching)
+            lambda: not complete[0],
+        )
 
-    def __search_in_repository(self, repo: Repository, keyword: str):
-        return combine_latest(
-            just(repo),
-            self._search_repo.search(repo.full_name, keyword).pipe(ops.to_list()),
+    def __search_in_repository(self, repo: Repository, keywords: list, verifier):
+        return stream_matches(
+            repo,
+            verify_matches(
+                self._search_repo.search_keywords(
+                    repo.full_name, keywords, repo.pushed_at
+                ).pipe(ops.subscribe_on(rx_pool_scheduler)),
+                verifier,
+                self.__content_loader(repo),
+            ),
         )
+
+    def __content_loader(self, repo: Repository):
+        return lambda file: self._search_repo.file_content(repo.full_name, file)
+
+
+def regex_verifier(patterns: list) -> RegexVerifier:
+    """
+    Check the regular expressions against the text matches of the files, the
+    content of a file is only requested when its text matches do not match.
+    """
+    return RegexVerifier(patterns, file_texts, set_file_preview, local_search_engine)
+
+
+def file_texts(file: File) -> tuple:
+    return file.fragments
+
+
+def set_file_preview(file: File, preview: str):
+    file.fragments = (preview,)
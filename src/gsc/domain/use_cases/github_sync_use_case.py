@@ -0,0 +1,39 @@
+from rx.core import Observable
+from rx.subject import ReplaySubject
+from rx import just, operators as ops
+from gsc.constants import GitHubConstant
+from gsc.domain.entities.github_model import Repository
+from gsc.domain.entities.sync_event import SyncEvent
+from gsc.domain.use_cases.base_use_case import BaseUseCase
+from gsc.data.repository.github_repository import (
+    GitHubMirrorSearchRepository,
+    GitHubRepoRepository,
+)
+
+
+class GitHubSyncMultiRepoUseCase(BaseUseCase):
+    def __init__(
+        self, get_repo: GitHubRepoRepository, mirror_repo: GitHubMirrorSearchRepository
+    ) -> None:
+        self._get_repo = get_repo
+        self._mirror_repo = mirror_repo
+        self._on_syncing = ReplaySubject()
+
+    def on_syncing(self) -> Observable:
+        return self._on_syncing
+
+    def sync(self, page_size: int = None):
+        """
+        Sync the mirrors of the repositories of the user, only the repositories
+        pushed since the last sync are fetched. Emit a SyncEvent per repository.
+        """
+        page_size = page_size or GitHubConstant.REPOSITORY_LIST_API_LIMIT
+        self._get_repo.get_repository_list(page_size).pipe(
+            ops.flat_map(self.__sync_repository),
+        ).subscribe(self._on_syncing)
+
+    def __sync_repository(self, repo: Repository) -> Observable:
+        return self._mirror_repo.sync(repo).pipe(
+            ops.map(lambda value: SyncEvent(repo, *value)),
+            ops.catch(lambda error, _: just(SyncEvent(repo, error=error))),
+        )
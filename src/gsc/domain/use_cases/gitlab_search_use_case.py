@@ -1,8 +1,18 @@
 from rx.core import Observable
 from rx.subject import ReplaySubject
-from rx import combine_latest, just, operators as ops
-from gsc.domain.entities.gitlab_model import Project
-from gsc.domain.use_cases.base_use_case import BaseUseCase
+from rx import combine_latest, concat, defer, merge, operators as ops
+from gsc.constants import GitLabConstant
+from gsc.domain.entities.gitlab_model import File, Project, ProjectFilter
+from gsc.domain.use_cases.base_use_case import (
+    BaseUseCase,
+    keyword_list,
+    one_project_at_a_time,
+    stream_match_list,
+    stream_matches,
+    verify_matches,
+)
+from gsc.core.local_search import local_search_engine
+from gsc.core.regex_search import RegexVerifier
 from gsc.core.rx_task import rx_pool_scheduler
 from gsc.data.repository.gitlab_repository import (
     GitLabProjectRepository,
@@ -21,19 +31,30 @@ class GitLabSearchProjectUseCase(BaseUseCase):
     def on_searching(self) -> Observable:
         return self._on_searching
 
-    def search(self, project_id: int, keyword: str):
-        combine_latest(
-            self._project_repo.project_info(project_id),
-            self._search_repo.search(project_id, keyword).pipe(ops.to_list()),
-        ).pipe(ops.map(self.__update_file_url),).subscribe(self._on_searching)
+    def search(self, project_id: int, keyword, regex: bool = False):
+        """
+        Search the keyword, or the list of keywords, in project. With regex,
+        the keywords are regular expressions.
+        """
+        keywords = keyword_list(keyword)
+        verifier = regex_verifier(keywords) if regex else None
+        if verifier:
+            keywords = verifier.keywords()
 
-    def __update_file_url(self, value):
-        project: Project = value[0]
-        files: list = value[1]
-        if files:
-            for file in files:
-                file.project_url = project.url
-        return value
+        self._project_repo.project_info(project_id).pipe(
+            ops.flat_map(
+                lambda project: stream_matches(
+                    project,
+                    verify_matches(
+                        self._search_repo.search_keywords(
+                            project.id, keywords, project.last_activity_at
+                        ).pipe(ops.map(lambda match: update_match_url(project, match))),
+                        verifier,
+                        lambda file: self._search_repo.file_content(project.id, file),
+                    ),
+                )
+            ),
+        ).subscribe(self._on_searching)
 
 
 class GitLabSearchGroupUseCase(BaseUseCase):
@@ -47,46 +68,198 @@ class GitLabSearchGroupUseCase(BaseUseCase):
     def on_searching(self) -> Observable:
         return self._on_searching
 
-    def search(self, group_name: str, keyword: str) -> Observable:
+    def search(
+        self,
+        group_name: str,
+        keyword,
+        page_size: int = None,
+        project_filter: ProjectFilter = None,
+        regex: bool = False,
+    ) -> Observable:
+        """
+        Search the keyword, or the list of keywords, in the projects of group.
+        The projects are listed once for all the keywords. With regex, the
+        keywords are regular expressions.
+        """
+        keywords = keyword_list(keyword)
+        verifier = regex_verifier(keywords) if regex else None
+        if verifier:
+            keywords = verifier.keywords()
+        page_size = page_size or GitLabConstant.GROUP_API_LIMIT
+        project_filter = project_filter or ProjectFilter()
         if group_name:
-            self._project_repo.project_list(group_name).pipe(
-                ops.group_by(lambda proj: proj),
+            projects = self._project_repo.project_list(group_name, page_size)
+        else:
+            projects = self._project_repo.own_project_list(page_size)
+
+        projects = projects.pipe(
+            # Skip the projects which are not worth searching before calling api
+            ops.filter(project_filter.accept),
+        )
+
+        if not self._search_repo.scoped_search:
+            # The mirrors are searched project by project, as they are listed.
+            projects.pipe(
                 ops.flat_map(
-                    lambda group: group.pipe(
-                        ops.observe_on(rx_pool_scheduler),
-                        ops.map(
-                            lambda project: self.__search_in_project(project, keyword)
-                        ),
+                    lambda project: self.__search_in_project(
+                        project, keywords, verifier
                     )
                 ),
-                ops.flat_map(lambda item: item),
+                one_project_at_a_time(),
             ).subscribe(self._on_searching)
+            return
+
+        # Search the whole group with a few paginated calls per keyword, while
+        # listing the projects. The files found before the projects are listed
+        # are replayed, the next ones are streamed.
+        project_list = projects.pipe(ops.to_list(), ops.replay())
+        if group_name:
+            scoped_files = [
+                self._search_repo.search_in_group(group_name, keyword)
+                for keyword in keywords
+            ]
         else:
-            self._project_repo.own_project_list().pipe(
-                ops.group_by(lambda proj: proj),
-                ops.flat_map(
-                    lambda group: group.pipe(
-                        ops.observe_on(rx_pool_scheduler),
-                        ops.map(
-                            lambda project: self.__search_in_project(project, keyword)
-                        ),
+            # The pages of the instance search are bounded by the number of
+            # projects, it starts once they are listed.
+            scoped_files = [
+                project_list.pipe(
+                    ops.flat_map(
+                        lambda projects, keyword=keyword: (
+                            self._search_repo.search_in_instance(keyword, projects)
+                        )
                     )
+                )
+                for keyword in keywords
+            ]
+        scoped_files = [files.pipe(ops.replay()) for files in scoped_files]
+        # The first item is None when the server does not support the search.
+        supported = [
+            files.pipe(
+                ops.take(1),
+                ops.map(lambda file: file is not None),
+                ops.default_if_empty(True),
+            )
+            for files in scoped_files
+        ]
+        for files in scoped_files:
+            files.connect()
+        project_list.connect()
+
+        combine_latest(project_list, combine_latest(*supported)).pipe(
+            # Search in every project when the server does not support it.
+            ops.flat_map(
+                lambda value: (
+                    self.__stream_scoped_files(
+                        value[0], scoped_files, keywords, verifier
+                    )
+                    if all(value[1])
+                    else self.__search_in_projects(value[0], keywords, verifier)
+                )
+            ),
+            one_project_at_a_time(),
+        ).subscribe(self._on_searching)
+
+    def __stream_scoped_files(
+        self, projects: list, scoped_files: list, keywords: list, verifier
+    ):
+        """
+        Emit the events of each project as the files of the scoped searches
+        arrive, then the summary of the projects without file.
+        """
+        projects_by_id = {project.id: project for project in projects}
+        found = set()
+
+        def project_events(matches):
+            project = projects_by_id[matches.key]
+            found.add(project.id)
+            return stream_matches(
+                project,
+                verify_matches(
+                    matches.pipe(
+                        ops.map(lambda match: update_match_url(project, match))
+                    ),
+                    verifier,
+                    self.__content_loader(project),
                 ),
-                ops.flat_map(lambda item: item),
-            ).subscribe(self._on_searching)
+            )
+
+        matches = merge(
+            *[
+                files.pipe(ops.map(lambda file, keyword=keyword: (keyword, file)))
+                for keyword, files in zip(keywords, scoped_files)
+            ]
+        )
+        return concat(
+            matches.pipe(
+                # Only keep the listed projects, the instance search returns
+                # every project visible to the user.
+                ops.filter(lambda match: match[1].project_id in projects_by_id),
+                # Replayed, the events of a project are subscribed after its
+                # first file is emitted.
+                ops.group_by(
+                    lambda match: match[1].project_id, subject_mapper=ReplaySubject
+                ),
+                ops.flat_map(project_events),
+            ),
+            defer(
+                lambda _: merge(
+                    *[
+                        stream_match_list(project, [])
+                        for project in projects
+                        if project.id not in found
+                    ]
+                )
+            ),
+        )
+
+    def __search_in_projects(self, projects: list, keywords: list, verifier):
+        return merge(
+            *[
+                self.__search_in_project(project, keywords, verifier)
+                for project in projects
+            ]
+        )
 
-    def __search_in_project(self, project: Project, keyword: str):
-        return combine_latest(
-            just(project),
-            self._search_repo.search(project.id, keyword).pipe(ops.to_list()),
-        ).pipe(
-            ops.do_action(on_next=self.__update_file_url),
+    def __search_in_project(self, project: Project, keywords: list, verifier):
+        return stream_matches(
+            project,
+            verify_matches(
+                self._search_repo.search_keywords(
+                    project.id, keywords, project.last_activity_at
+                ).pipe(
+                    ops.subscribe_on(rx_pool_scheduler),
+                    ops.map(lambda match: update_match_url(project, match)),
+                ),
+                verifier,
+                self.__content_loader(project),
+            ),
         )
 
-    def __update_file_url(self, value):
-        project: Project = value[0]
-        files: list = value[1]
-        if files:
-            for file in files:
-                file.project_url = project.url
-        return value
+    def __content_loader(self, project: Project):
+        return lambda file: self._search_repo.file_content(project.id, file)
+
+
+def update_file_url(project: Project, file: File) -> File:
+    file.project_url = project.url
+    return file
+
+
+def update_match_url(project: Project, match: tuple) -> tuple:
+    update_file_url(project, match[1])
+    return match
+
+
+def regex_verifier(patterns: list) -> RegexVerifier:
+    """
+    Check the regular expressions against the preview of the files, the
+    content of a file is only requested when its preview does not match.
+    """
+    return RegexVerifier(patterns, file_texts, set_file_preview, local_search_engine)
+
+
+def file_texts(file: File) -> list:
+    return [file.data_preview]
+
+
+def set_file_preview(file: File, preview: str):
+    file.data_preview = preview
@@ -0,0 +1,54 @@
+from rx.core import Observable
+from rx.subject import ReplaySubject
+from rx import just, operators as ops
+from gsc.constants import GitLabConstant
+from gsc.domain.entities.gitlab_model import Project, ProjectFilter
+from gsc.domain.entities.sync_event import SyncEvent
+from gsc.domain.use_cases.base_use_case import BaseUseCase
+from gsc.data.repository.gitlab_repository import (
+    GitLabMirrorSearchRepository,
+    GitLabProjectRepository,
+)
+
+
+class GitLabSyncGroupUseCase(BaseUseCase):
+    def __init__(
+        self,
+        project_repo: GitLabProjectRepository,
+        mirror_repo: GitLabMirrorSearchRepository,
+    ) -> None:
+        self._project_repo = project_repo
+        self._mirror_repo = mirror_repo
+        self._on_syncing = ReplaySubject()
+
+    def on_syncing(self) -> Observable:
+        return self._on_syncing
+
+    def sync(
+        self,
+        group_name: str,
+        page_size: int = None,
+        project_filter: ProjectFilter = None,
+    ):
+        """
+        Sync the mirrors of the projects of group (or of the user), only the
+        projects with a new activity since the last sync are fetched. Emit a
+        SyncEvent per project, a failed project does not stop the others.
+        """
+        page_size = page_size or GitLabConstant.GROUP_API_LIMIT
+        project_filter = project_filter or ProjectFilter()
+        if group_name:
+            projects = self._project_repo.project_list(group_name, page_size)
+        else:
+            projects = self._project_repo.own_project_list(page_size)
+
+        projects.pipe(
+            ops.filter(project_filter.accept),
+            ops.flat_map(self.__sync_project),
+        ).subscribe(self._on_syncing)
+
+    def __sync_project(self, project: Project) -> Observable:
+        return self._mirror_repo.sync(project).pipe(
+            ops.map(lambda value: SyncEvent(project, *value)),
+            ops.catch(lambda error, _: just(SyncEvent(project, error=error))),
+        )
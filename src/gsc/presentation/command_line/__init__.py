@@ -1,6 +1,7 @@
-import multiprocessing
+import threading
+from gsc.presentation.observer.output_writer import close_writers
 
-event = multiprocessing.Event()
+event = threading.Event()
 
 
 def keep_main_thread_running(function):
@@ -11,6 +12,8 @@ def keep_main_thread_running(function):
         function(*args, **kwargs)
 
         event.wait()
+        # Write what the observers printed before the process exits.
+        close_writers()
 
     return inner
 
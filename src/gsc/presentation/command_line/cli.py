@@ -1,17 +1,38 @@
+from importlib import import_module
 import click
-from tabulate import tabulate
 from gsc import utils
-from gsc.presentation.command_line.gitlab_cli import gitlab_cli
-from gsc.presentation.command_line.github_cli import github_cli
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
 
 
+class LazyGroup(click.Group):
+    """
+    Import the module of a sub command only when the command is used, so a
+    command does not pay for the imports of the others.
+    """
+
+    def __init__(self, *args, lazy_commands: dict = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Command name -> "module:attribute"
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[cmd_name].split(":")
+            self.add_command(getattr(import_module(module_name), attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
 # pylint: disable=W0613
 def print_app_info(ctx, param, value):
     if not value:
         return False
 
+    from tabulate import tabulate  # pylint: disable=C0415
+
     table = [
         ["Name", f"GSC - {utils.get_project_name().title().replace('-', ' ')}"],
         ["Description", utils.get_project_summary()],
@@ -28,6 +49,11 @@ def print_app_info(ctx, param, value):
 
 
 @click.group(
+    cls=LazyGroup,
+    lazy_commands={
+        "gl": "gsc.presentation.command_line.gitlab_cli:gitlab_cli",
+        "gh": "gsc.presentation.command_line.github_cli:github_cli",
+    },
     invoke_without_command=True,
     context_settings=CONTEXT_SETTINGS,
     help="A simple tool to search the content in GitLab and GitHub.",
@@ -48,7 +74,3 @@ def app(ctx: click.Context = None, information=False):
 
     if not information:
         click.secho(app.get_help(ctx))
-
-
-app.add_command(gitlab_cli)
-app.add_command(github_cli)
@@ -1,5 +1,6 @@
 import click
 from gsc.config import Env, EnvConfig
+from gsc.constants import API_PAGE_SIZE_MAX, DEFAULT_CACHE_TTL
 from gsc.utils import is_valid_environment_name
 
 
@@ -100,6 +101,20 @@ def __create_new_environment(config: EnvConfig, name: str):
     )
     new_env.verify_ssl_cert = verify_ssl_cert
 
+    page_size = click.prompt(
+        "Please input page size for listing",
+        type=click.IntRange(min=1, max=API_PAGE_SIZE_MAX),
+        default=API_PAGE_SIZE_MAX,
+    )
+    new_env.page_size = page_size
+
+    cache_ttl = click.prompt(
+        "Please input cache time-to-live of project list (seconds)",
+        type=click.IntRange(min=0),
+        default=DEFAULT_CACHE_TTL,
+    )
+    new_env.cache_ttl = cache_ttl
+
     config.set_env(new_env)
 
 
@@ -117,6 +132,9 @@ def __show_detail_environment(config: EnvConfig, name: str):
     click.secho(f"- Host name : {environ.host_name}")
     click.secho(f"- Private token : {environ.private_token}")
     click.secho(f"- SSL certificate verification : {environ.verify_ssl_cert}")
+    click.secho(f"- Page size : {environ.page_size or API_PAGE_SIZE_MAX}")
+    cache_ttl = DEFAULT_CACHE_TTL if environ.cache_ttl is None else environ.cache_ttl
+    click.secho(f"- Cache time-to-live : {cache_ttl}s")
 
 
 def __set_default_environment(config: EnvConfig, env_name: str):
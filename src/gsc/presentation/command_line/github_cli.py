@@ -1,27 +1,41 @@
+from typing import TYPE_CHECKING
 import click
 from dependency_injector.wiring import Provide, inject
-from gsc import utils
-from gsc.di.application_container import ApplicationContainer
-from gsc.constants import GitHubConstant
+from gsc import di, utils
+from gsc.constants import (
+    GitHubConstant,
+    API_PAGE_SIZE_MAX,
+    DEFAULT_SEARCH_ENGINE,
+    SEARCH_ENGINES,
+    SEARCH_MAX_RESULTS,
+)
 from gsc.presentation.command_line.env_cli import environment
 from gsc.presentation.command_line import keep_main_thread_running
-from gsc.presentation.observer.github_observer import (
-    GitHubParam,
-    GitHubPrintObserver,
+from gsc.presentation.command_line.utils import (
+    prepare_sync,
+    read_keywords_file_option,
+    validate_keywords,
 )
 from gsc.config import AppConfig, GitHubConfig
-from gsc.domain.use_cases.github_search_use_case import (
-    GitHubSearchRepoUseCase,
-    GitHubSearchMultiRepoUseCase,
-)
 
-app_config: AppConfig = Provide[ApplicationContainer.github_module.app_config]
-github_config: GitHubConfig = Provide[ApplicationContainer.github_module.config]
+# The search modules are imported when the search runs, not to parse the command.
+if TYPE_CHECKING:
+    from gsc.presentation.observer.github_observer import GitHubParam
+    from gsc.presentation.observer.sync_observer import SyncParam
+    from gsc.domain.use_cases.github_search_use_case import (
+        GitHubSearchRepoUseCase,
+        GitHubSearchMultiRepoUseCase,
+    )
+    from gsc.domain.use_cases.github_sync_use_case import GitHubSyncMultiRepoUseCase
+
+app_config: AppConfig = Provide["github_module.app_config"]
+github_config: GitHubConfig = Provide["github_module.config"]
 
 
 @click.group("gh", help=f"Search in {GitHubConstant.NAME} repositories.")
 @click.pass_context
 def github_cli(ctx):
+    di.wire(__name__)
     ctx.obj = [github_config]
 
 
@@ -29,13 +43,7 @@ github_cli.add_command(environment)
 
 
 def __validate_required_keyword_argument(ctx, _, value):
-    if value is None:
-        click.secho("Usage: gsc gh search [OPTIONS] <keyword>")
-        click.secho("Try 'gsc gh search -h' for help.")
-        click.secho("\n", nl=False)
-        click.secho("Error: Missing required argument <keyword>")
-        ctx.exit(2)
-    return value
+    return validate_keywords(ctx, value, "gh")
 
 
 def __validate_session_env_option(ctx, _, value):
@@ -74,9 +82,31 @@ def __validate_output_option(ctx, _, value):
     "keyword",
     type=str,
     metavar="<keyword>",
+    nargs=-1,
     required=False,
     callback=__validate_required_keyword_argument,
 )
+@click.option(
+    "-k",
+    "--keywords-file",
+    "keywords_file",
+    type=click.Path(exists=True, dir_okay=False),
+    metavar="<file_path>",
+    is_eager=True,
+    callback=read_keywords_file_option,
+    # pylint: disable=C0301
+    help="Also search the keywords of the file, one per line. All the keywords are searched in one run.",
+)
+@click.option(
+    "--regex",
+    "regex",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    is_eager=True,
+    # pylint: disable=C0301
+    help="The keywords are regular expressions, the longest literal word of each is searched on the server and the files found are checked locally. The word must be a whole search token of the server, \\w+Controller is searched as Controller and misses UserController.",
+)
 @click.option(
     "-p",
     "--repository",
@@ -90,9 +120,7 @@ def __validate_output_option(ctx, _, value):
     "session_env",
     type=str,
     metavar="<string>",
-    default=lambda: github_config.get_default_env().name
-    if github_config.get_default_env() is not None
-    else "",
+    default=lambda: getattr(github_config.get_default_env(), "name", ""),
     callback=__validate_session_env_option,
     help="Select the environment for searching, if not declare, default environment has been used.",
 )
@@ -113,15 +141,111 @@ def __validate_output_option(ctx, _, value):
     default=False,
     help="Enable debug logging of HTTP request.",
 )
+@click.option(
+    "--page-size",
+    "page_size",
+    type=click.IntRange(min=1, max=API_PAGE_SIZE_MAX),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help=f"Number of items per page when listing, default is the environment setting or {API_PAGE_SIZE_MAX}.",
+)
+@click.option(
+    "--no-cache",
+    "no_cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    # pylint: disable=C0301
+    help="Do not use the cached project list and search results, always request the server.",
+)
+@click.option(
+    "--clear-cache",
+    "clear_cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    # pylint: disable=C0301
+    help="Clear the cached project list and search results of the environment before searching.",
+)
+@click.option(
+    "--max-results",
+    "max_results",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    default=SEARCH_MAX_RESULTS,
+    show_default=True,
+    # pylint: disable=C0301
+    help="Maximum number of search results per repository, the next pages of a repository search are not requested.",
+)
+@click.option(
+    "--engine",
+    "engine",
+    type=click.Choice(SEARCH_ENGINES),
+    default=DEFAULT_SEARCH_ENGINE,
+    show_default=True,
+    # pylint: disable=C0301
+    help="Search with the search api, in local mirrors of the projects (cloned on the first search, fetched when the project changed) or with the trigram index of the mirrors.",
+)
+@click.option(
+    "--concurrency",
+    "concurrency",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help="Run the requests on the asyncio engine with up to <int> requests in flight, also the number of mirrors fetched at the same time. Each request in flight still holds one I/O thread while the blocking HTTP call runs, so <int> is also the number of threads.",
+)
+@click.option(
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help="Number of processes searching the mirrors and checking the regular expressions, default is the number of CPUs.",
+)
+@click.option(
+    "--search-mode",
+    "search_mode",
+    type=click.Choice(GitHubConstant.SEARCH_MODES),
+    default=GitHubConstant.DEFAULT_SEARCH_MODE,
+    show_default=True,
+    # pylint: disable=C0301
+    help="How to query all repositories : pack many repositories per query, one query per owner or one query per repository.",
+)
 def search(**kwargs):
+    # pylint: disable=C0415
+    from gsc.core.async_task import async_engine
+    from gsc.core.connection_pool import http_pool
+    from gsc.core.git_mirror import mirror_pool
+    from gsc.core.local_search import local_search_engine
+    from gsc.core.response_cache import ResponseCache
+    from gsc.presentation.observer.github_observer import GitHubParam
+
     param = GitHubParam(
-        keyword=kwargs.get("keyword"),
+        keyword=", ".join(kwargs.get("keyword")),
+        keywords=kwargs.get("keyword"),
+        regex=kwargs.get("regex"),
         env_name=kwargs.get("session_env"),
         output_path=kwargs.get("output"),
         repo_name=kwargs.get("repository"),
         is_debug=kwargs.get("debug") or False,
+        concurrency=kwargs.get("concurrency"),
+        search_mode=kwargs.get("search_mode"),
+        page_size=kwargs.get("page_size")
+        or getattr(github_config.get_session_env(), "page_size", None)
+        or GitHubConstant.REPOSITORY_LIST_API_LIMIT,
     )
     app_config.set_debug(param.is_debug)
+    app_config.set_cache_enabled(not kwargs.get("no_cache"))
+    app_config.set_max_results(kwargs.get("max_results"))
+    app_config.set_engine(kwargs.get("engine"))
+    if kwargs.get("clear_cache"):
+        ResponseCache(GitHubConstant.NAME, param.env_name).clear()
+    if param.concurrency:
+        async_engine.configure(param.concurrency)
+        http_pool.configure(pool_maxsize=param.concurrency)
+        mirror_pool.configure(param.concurrency)
+    if kwargs.get("jobs"):
+        local_search_engine.configure(kwargs.get("jobs"))
 
     click.clear()
     if param.repo_name:
@@ -133,22 +257,110 @@ def search(**kwargs):
 @keep_main_thread_running
 @inject
 def __search_in_multiple_repo(
-    param: GitHubParam,
-    usecase: GitHubSearchMultiRepoUseCase = Provide[
-        ApplicationContainer.github_module.search_multi_repo_use_case
+    param: "GitHubParam",
+    usecase: "GitHubSearchMultiRepoUseCase" = Provide[
+        "github_module.search_multi_repo_use_case"
     ],
 ):
+    # pylint: disable=C0415
+    from gsc.presentation.observer.github_observer import GitHubPrintObserver
+
     usecase.on_searching().subscribe(GitHubPrintObserver(param=param))
-    usecase.search(param.keyword)
+    usecase.search(param.keywords, param.page_size, param.search_mode, param.regex)
 
 
 @keep_main_thread_running
 @inject
 def __search_in_single_repo(
-    param: GitHubParam,
-    usecase: GitHubSearchRepoUseCase = Provide[
-        ApplicationContainer.github_module.search_repo_use_case
-    ],
+    param: "GitHubParam",
+    usecase: "GitHubSearchRepoUseCase" = Provide["github_module.search_repo_use_case"],
 ):
+    # pylint: disable=C0415
+    from gsc.presentation.observer.github_observer import GitHubPrintObserver
+
     usecase.on_searching().subscribe(GitHubPrintObserver(param=param))
-    usecase.search(param.repo_name, param.keyword)
+    usecase.search(param.repo_name, param.keywords, param.regex)
+
+
+@github_cli.command(
+    "sync",
+    # pylint: disable=C0301
+    help=f"Sync the local mirrors of {GitHubConstant.NAME} repositories, only the repositories pushed since the last sync are fetched.",
+)
+@click.option(
+    "-e",
+    "--environment",
+    "session_env",
+    type=str,
+    metavar="<string>",
+    default=lambda: getattr(github_config.get_default_env(), "name", ""),
+    callback=__validate_session_env_option,
+    help="Select the environment for syncing, if not declare, default environment has been used.",
+)
+@click.option(
+    "-d",
+    "--debug",
+    "debug",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Enable debug logging of HTTP request.",
+)
+@click.option(
+    "--page-size",
+    "page_size",
+    type=click.IntRange(min=1, max=API_PAGE_SIZE_MAX),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help=f"Number of items per page when listing, default is the environment setting or {API_PAGE_SIZE_MAX}.",
+)
+@click.option(
+    "--index",
+    "index",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    # pylint: disable=C0301
+    help="Also update the trigram index of the mirrors (--engine index) with the files changed since the last sync.",
+)
+@click.option(
+    "--concurrency",
+    "concurrency",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    help="Number of mirrors fetched at the same time.",
+)
+@click.option(
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help="Number of processes updating the trigram index (--index), default is the number of CPUs.",
+)
+def sync(**kwargs):
+    param = prepare_sync(
+        app_config,
+        GitHubConstant.NAME,
+        github_config.get_session_env(),
+        GitHubConstant.REPOSITORY_LIST_API_LIMIT,
+        kwargs,
+    )
+
+    click.clear()
+    __sync_multiple_repo(param)
+
+
+@keep_main_thread_running
+@inject
+def __sync_multiple_repo(
+    param: "SyncParam",
+    usecase: "GitHubSyncMultiRepoUseCase" = Provide[
+        "github_module.sync_multi_repo_use_case"
+    ],
+):
+    # pylint: disable=C0415
+    from gsc.presentation.observer.sync_observer import SyncPrintObserver
+
+    usecase.on_syncing().subscribe(SyncPrintObserver(param=param))
+    usecase.sync(param.page_size)
@@ -1,27 +1,42 @@
+from typing import TYPE_CHECKING
 import click
 from dependency_injector.wiring import Provide, inject
-from gsc import utils
-from gsc.di.application_container import ApplicationContainer
-from gsc.constants import GitLabConstant
+from gsc import di, utils
+from gsc.constants import (
+    GitLabConstant,
+    API_PAGE_SIZE_MAX,
+    DEFAULT_SEARCH_ENGINE,
+    SEARCH_ENGINES,
+    SEARCH_MAX_RESULTS,
+)
 from gsc.presentation.command_line.env_cli import environment
 from gsc.presentation.command_line import keep_main_thread_running
-from gsc.presentation.observer.gitlab_observer import (
-    GitLabParam,
-    GitLabPrintObserver,
+from gsc.presentation.command_line.utils import (
+    prepare_sync,
+    read_keywords_file_option,
+    validate_keywords,
 )
 from gsc.config import AppConfig, GitLabConfig
-from gsc.domain.use_cases.gitlab_search_use_case import (
-    GitLabSearchGroupUseCase,
-    GitLabSearchProjectUseCase,
-)
 
-app_config: AppConfig = Provide[ApplicationContainer.gitlab_module.app_config]
-gitlab_config: GitLabConfig = Provide[ApplicationContainer.gitlab_module.config]
+# The search modules are imported when the search runs, not to parse the command.
+if TYPE_CHECKING:
+    from gsc.presentation.observer.gitlab_observer import GitLabParam
+    from gsc.presentation.observer.sync_observer import SyncParam
+    from gsc.domain.entities.gitlab_model import ProjectFilter
+    from gsc.domain.use_cases.gitlab_search_use_case import (
+        GitLabSearchGroupUseCase,
+        GitLabSearchProjectUseCase,
+    )
+    from gsc.domain.use_cases.gitlab_sync_use_case import GitLabSyncGroupUseCase
+
+app_config: AppConfig = Provide["gitlab_module.app_config"]
+gitlab_config: GitLabConfig = Provide["gitlab_module.config"]
 
 
 @click.group("gl", help=f"Search in {GitLabConstant.NAME} projects.")
 @click.pass_context
 def gitlab_cli(ctx):
+    di.wire(__name__)
     ctx.obj = [gitlab_config]
 
 
@@ -29,13 +44,7 @@ gitlab_cli.add_command(environment)
 
 
 def __validate_required_keyword_argument(ctx, _, value):
-    if value is None:
-        click.secho("Usage: gsc gl search [OPTIONS] <keyword>")
-        click.secho("Try 'gsc gl search -h' for help.")
-        click.secho("\n", nl=False)
-        click.secho("Error: Missing required argument <keyword>")
-        ctx.exit(2)
-    return value
+    return validate_keywords(ctx, value, "gl")
 
 
 def __validate_session_env_option(ctx, _, value):
@@ -72,9 +81,31 @@ def __validate_output_option(ctx, _, value):
     "keyword",
     type=str,
     metavar="<keyword>",
+    nargs=-1,
     required=False,
     callback=__validate_required_keyword_argument,
 )
+@click.option(
+    "-k",
+    "--keywords-file",
+    "keywords_file",
+    type=click.Path(exists=True, dir_okay=False),
+    metavar="<file_path>",
+    is_eager=True,
+    callback=read_keywords_file_option,
+    # pylint: disable=C0301
+    help="Also search the keywords of the file, one per line. All the keywords are searched in one run.",
+)
+@click.option(
+    "--regex",
+    "regex",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    is_eager=True,
+    # pylint: disable=C0301
+    help="The keywords are regular expressions, the longest literal word of each is searched on the server and the files found are checked locally. The word must be a whole search token of the server, \\w+Controller is searched as Controller and misses UserController.",
+)
 @click.option(
     "-p",
     "--project",
@@ -96,9 +127,7 @@ def __validate_output_option(ctx, _, value):
     "session_env",
     type=str,
     metavar="<string>",
-    default=lambda: gitlab_config.get_default_env().name
-    if gitlab_config.get_default_env() is not None
-    else "",
+    default=lambda: getattr(gitlab_config.get_default_env(), "name", ""),
     callback=__validate_session_env_option,
     help="Select the environment for searching, if not declare, default environment has been used.",
 )
@@ -119,6 +148,67 @@ def __validate_output_option(ctx, _, value):
     default=False,
     help="Enable debug logging of HTTP request.",
 )
+@click.option(
+    "--page-size",
+    "page_size",
+    type=click.IntRange(min=1, max=API_PAGE_SIZE_MAX),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help=f"Number of items per page when listing, default is the environment setting or {API_PAGE_SIZE_MAX}.",
+)
+@click.option(
+    "--no-cache",
+    "no_cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    # pylint: disable=C0301
+    help="Do not use the cached project list and search results, always request the server.",
+)
+@click.option(
+    "--clear-cache",
+    "clear_cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    # pylint: disable=C0301
+    help="Clear the cached project list and search results of the environment before searching.",
+)
+@click.option(
+    "--max-results",
+    "max_results",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    default=SEARCH_MAX_RESULTS,
+    show_default=True,
+    # pylint: disable=C0301
+    help="Maximum number of search results fetched per search request, the next pages are not requested.",
+)
+@click.option(
+    "--engine",
+    "engine",
+    type=click.Choice(SEARCH_ENGINES),
+    default=DEFAULT_SEARCH_ENGINE,
+    show_default=True,
+    # pylint: disable=C0301
+    help="Search with the search api, in local mirrors of the projects (cloned on the first search, fetched when the project changed) or with the trigram index of the mirrors.",
+)
+@click.option(
+    "--concurrency",
+    "concurrency",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help="Run the requests on the asyncio engine with up to <int> requests in flight, also the number of mirrors fetched at the same time. Each request in flight still holds one I/O thread while the blocking HTTP call runs, so <int> is also the number of threads.",
+)
+@click.option(
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help="Number of processes searching the mirrors and checking the regular expressions, default is the number of CPUs.",
+)
 @click.option(
     "--code-preview",
     "code_preview",
@@ -135,18 +225,71 @@ def __validate_output_option(ctx, _, value):
     default=False,
     help="Do not show the project which has no result (for searching group).",
 )
+@click.option(
+    "--exclude-archived",
+    "exclude_archived",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Do not search in archived projects (for searching group).",
+)
+@click.option(
+    "--exclude-empty",
+    "exclude_empty",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    # pylint: disable=C0301
+    help="Do not search in projects which have an empty repository (for searching group).",
+)
+@click.option(
+    "--active-since",
+    "active_since",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    metavar="<yyyy-mm-dd>",
+    # pylint: disable=C0301
+    help="Only search in projects which have activity since the date (for searching group).",
+)
 def search(**kwargs):
+    # pylint: disable=C0415
+    from gsc.core.async_task import async_engine
+    from gsc.core.connection_pool import http_pool
+    from gsc.core.git_mirror import mirror_pool
+    from gsc.core.local_search import local_search_engine
+    from gsc.core.response_cache import ResponseCache
+    from gsc.presentation.observer.gitlab_observer import GitLabParam
+
     param = GitLabParam(
-        keyword=kwargs.get("keyword"),
+        keyword=", ".join(kwargs.get("keyword")),
+        keywords=kwargs.get("keyword"),
+        regex=kwargs.get("regex"),
         env_name=kwargs.get("session_env"),
         output_path=kwargs.get("output"),
         project_id=kwargs.get("project"),
         group=kwargs.get("group"),
         is_debug=kwargs.get("debug"),
+        concurrency=kwargs.get("concurrency"),
+        page_size=kwargs.get("page_size")
+        or getattr(gitlab_config.get_session_env(), "page_size", None)
+        or GitLabConstant.GROUP_API_LIMIT,
         code_preview=kwargs.get("code_preview"),
         ignore_no_result=kwargs.get("ignore_no_result"),
+        exclude_archived=kwargs.get("exclude_archived"),
+        exclude_empty=kwargs.get("exclude_empty"),
+        active_since=kwargs.get("active_since"),
     )
     app_config.set_debug(param.is_debug)
+    app_config.set_cache_enabled(not kwargs.get("no_cache"))
+    app_config.set_max_results(kwargs.get("max_results"))
+    app_config.set_engine(kwargs.get("engine"))
+    if kwargs.get("clear_cache"):
+        ResponseCache(GitLabConstant.NAME, param.env_name).clear()
+    if param.concurrency:
+        async_engine.configure(param.concurrency)
+        http_pool.configure(pool_maxsize=param.concurrency)
+        mirror_pool.configure(param.concurrency)
+    if kwargs.get("jobs"):
+        local_search_engine.configure(kwargs.get("jobs"))
 
     click.clear()
     if param.input_project:
@@ -158,23 +301,158 @@ def search(**kwargs):
 @keep_main_thread_running
 @inject
 def __search_in_group(
-    param: GitLabParam,
-    usecase: GitLabSearchGroupUseCase = Provide[
-        ApplicationContainer.gitlab_module.search_group_use_case
+    param: "GitLabParam",
+    usecase: "GitLabSearchGroupUseCase" = Provide[
+        "gitlab_module.search_group_use_case"
     ],
 ):
+    # pylint: disable=C0415
+    from gsc.domain.entities.gitlab_model import ProjectFilter
+    from gsc.presentation.observer.gitlab_observer import GitLabPrintObserver
+
     param.is_search_group = True
     usecase.on_searching().subscribe(GitLabPrintObserver(param=param))
-    usecase.search(param.input_group, param.keyword)
+    usecase.search(
+        param.input_group,
+        param.keywords,
+        param.page_size,
+        ProjectFilter(
+            exclude_archived=param.exclude_archived,
+            exclude_empty=param.exclude_empty,
+            active_since=param.active_since,
+        ),
+        param.regex,
+    )
 
 
 @keep_main_thread_running
 @inject
 def __search_in_project(
-    param: GitLabParam,
-    usecase: GitLabSearchProjectUseCase = Provide[
-        ApplicationContainer.gitlab_module.search_proj_use_case
+    param: "GitLabParam",
+    usecase: "GitLabSearchProjectUseCase" = Provide[
+        "gitlab_module.search_proj_use_case"
     ],
 ):
+    # pylint: disable=C0415
+    from gsc.presentation.observer.gitlab_observer import GitLabPrintObserver
+
     usecase.on_searching().subscribe(GitLabPrintObserver(param=param))
-    usecase.search(param.input_project, param.keyword)
+    usecase.search(param.input_project, param.keywords, param.regex)
+
+
+@gitlab_cli.command(
+    "sync",
+    # pylint: disable=C0301
+    help=f"Sync the local mirrors of {GitLabConstant.NAME} projects, only the projects with new activity are fetched.",
+)
+@click.option(
+    "-g",
+    "--group",
+    type=str,
+    metavar="<string>",
+    # pylint: disable=C0301
+    help="Sync the projects of the specified group, input group id or group path. If not declare, sync your own projects.",
+)
+@click.option(
+    "-e",
+    "--environment",
+    "session_env",
+    type=str,
+    metavar="<string>",
+    default=lambda: getattr(gitlab_config.get_default_env(), "name", ""),
+    callback=__validate_session_env_option,
+    help="Select the environment for syncing, if not declare, default environment has been used.",
+)
+@click.option(
+    "-d",
+    "--debug",
+    "debug",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Enable debug logging of HTTP request.",
+)
+@click.option(
+    "--page-size",
+    "page_size",
+    type=click.IntRange(min=1, max=API_PAGE_SIZE_MAX),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help=f"Number of items per page when listing, default is the environment setting or {API_PAGE_SIZE_MAX}.",
+)
+@click.option(
+    "--index",
+    "index",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    # pylint: disable=C0301
+    help="Also update the trigram index of the mirrors (--engine index) with the files changed since the last sync.",
+)
+@click.option(
+    "--exclude-archived",
+    "exclude_archived",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Do not sync archived projects.",
+)
+@click.option(
+    "--exclude-empty",
+    "exclude_empty",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Do not sync projects which have an empty repository.",
+)
+@click.option(
+    "--concurrency",
+    "concurrency",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    help="Number of mirrors fetched at the same time.",
+)
+@click.option(
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    metavar="<int>",
+    # pylint: disable=C0301
+    help="Number of processes updating the trigram index (--index), default is the number of CPUs.",
+)
+def sync(**kwargs):
+    # pylint: disable=C0415
+    from gsc.domain.entities.gitlab_model import ProjectFilter
+
+    param = prepare_sync(
+        app_config,
+        GitLabConstant.NAME,
+        gitlab_config.get_session_env(),
+        GitLabConstant.GROUP_API_LIMIT,
+        kwargs,
+    )
+
+    click.clear()
+    __sync_group(
+        param,
+        kwargs.get("group"),
+        ProjectFilter(
+            exclude_archived=kwargs.get("exclude_archived"),
+            exclude_empty=kwargs.get("exclude_empty"),
+        ),
+    )
+
+
+@keep_main_thread_running
+@inject
+def __sync_group(
+    param: "SyncParam",
+    group: str,
+    project_filter: "ProjectFilter",
+    usecase: "GitLabSyncGroupUseCase" = Provide["gitlab_module.sync_group_use_case"],
+):
+    # pylint: disable=C0415
+    from gsc.presentation.observer.sync_observer import SyncPrintObserver
+
+    usecase.on_syncing().subscribe(SyncPrintObserver(param=param))
+    usecase.sync(group, param.page_size, project_filter)
@@ -0,0 +1,77 @@
+import click
+from gsc import utils
+
+
+def read_keywords_file_option(_, __, value):
+    return utils.read_keywords(value) if value else []
+
+
+def validate_keywords(ctx, value, command: str) -> list:
+    """
+    Return the keywords of the arguments and the keywords file of the search
+    command of ``command`` (gh, gl), exit with its usage when there is none or
+    when a regular expression cannot be searched.
+    """
+    # The keywords file option is eager, it is read before the arguments.
+    keywords = list(dict.fromkeys([*value, *ctx.params.get("keywords_file", [])]))
+    if not keywords:
+        __exit_with_usage(ctx, command, "Missing required argument <keyword>")
+    if ctx.params.get("regex"):
+        __validate_regex_keywords(ctx, command, keywords)
+    return keywords
+
+
+def __validate_regex_keywords(ctx, command: str, keywords: list):
+    # pylint: disable=C0415
+    import re
+    from gsc.core.regex_search import MIN_LITERAL_LENGTH, prefilter_keyword
+
+    for keyword in keywords:
+        try:
+            literal = prefilter_keyword(keyword)
+        except re.error as error:
+            message = f'Invalid regular expression "{keyword}": {error}.'
+        else:
+            if literal:
+                continue
+            # pylint: disable=C0301
+            message = f'No literal word of {MIN_LITERAL_LENGTH} characters or more in the regular expression "{keyword}" to search.'
+        __exit_with_usage(ctx, command, message)
+
+
+def __exit_with_usage(ctx, command: str, message: str):
+    click.secho(f"Usage: gsc {command} search [OPTIONS] <keyword>")
+    click.secho(f"Try 'gsc {command} search -h' for help.")
+    click.secho("\n", nl=False)
+    click.secho(f"Error: {message}")
+    ctx.exit(2)
+
+
+def prepare_sync(app_config, platform: str, env, default_page_size: int, options: dict):
+    """
+    Return the ``SyncParam`` of the options of the sync command of platform,
+    and configure the application for it : the cache is disabled, the last
+    activity of the projects must be up to date.
+    """
+    # pylint: disable=C0415
+    from gsc.core.git_mirror import mirror_pool
+    from gsc.core.local_search import local_search_engine
+    from gsc.presentation.observer.sync_observer import SyncParam
+
+    param = SyncParam(
+        platform=platform,
+        env_name=options.get("session_env"),
+        is_debug=options.get("debug") or False,
+        indexed=options.get("index"),
+        page_size=options.get("page_size")
+        or getattr(env, "page_size", None)
+        or default_page_size,
+    )
+    app_config.set_debug(param.is_debug)
+    app_config.set_cache_enabled(False)
+    app_config.set_engine("index" if param.indexed else "mirror")
+    if options.get("concurrency"):
+        mirror_pool.configure(options.get("concurrency"))
+    if options.get("jobs"):
+        local_search_engine.configure(options.get("jobs"))
+    return param
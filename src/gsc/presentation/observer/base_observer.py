@@ -1,8 +1,14 @@
 import abc
+import re
+from collections import Counter
 from timeit import default_timer as timer
 from datetime import timedelta
 from typing import Any
 from rx.core import Observer
+from gsc.core.connection_pool import http_pool
+from gsc.core.progress import Progress, search_progress
+from gsc.core.rate_limit import rate_limit_stats
+from gsc.core.retry import retry_policy
 from gsc.presentation.observer.plugin import PrintPlugin, MarkdownExportPlugin
 
 
@@ -10,8 +16,14 @@ class PrintParam(abc.ABC):
     def __init__(self, **kwargs) -> None:
         self.env_name = kwargs.get("env_name")
         self.keyword = kwargs.get("keyword")
+        # All the keywords searched in the run, keyword is their display text.
+        self.keywords = kwargs.get("keywords") or [self.keyword]
+        # The keywords are regular expressions
+        self.regex = kwargs.get("regex") or False
         self.output_path = kwargs.get("output_path")
         self.is_debug = kwargs.get("is_debug")
+        self.concurrency = kwargs.get("concurrency")
+        self.page_size = kwargs.get("page_size")
 
 
 class BaseObserver(Observer, abc.ABC):
@@ -42,6 +54,10 @@ class BaseObserver(Observer, abc.ABC):
 
     def on_completed(self) -> None:
         elapsed_time = timedelta(seconds=timer() - self.start_time)
+        if self.param and self.param.is_debug:
+            print(f"{http_pool.stats()}")
+            print(f"{rate_limit_stats()}")
+            print(f"{retry_policy.stats()}\n")
         self.on_print_end(elapsed_time)
 
     def on_error(self, error: Exception) -> None:
@@ -59,7 +75,61 @@ class PrintObserver(BaseObserver):
         if param.output_path:
             self.export_output = MarkdownExportPlugin()
             self.export_output.set_output_path(param.output_path)
+        # Files and projects found for each keyword
+        self.keyword_files = Counter()
+        self.keyword_projects = {}
         super().__init__(param)
+        search_progress.reset()
+        search_progress.subscribe(self.on_progress)
+
+    def on_progress(self, progress: Progress):
+        self.print_output.print_progress(f"Searching ... {progress}")
+
+    def on_completed(self) -> None:
+        search_progress.unsubscribe(self.on_progress)
+        self.print_output.clear_progress()
+        super().on_completed()
+
+    def on_error(self, error: Exception) -> None:
+        search_progress.unsubscribe(self.on_progress)
+        self.print_output.clear_progress()
+        super().on_error(error)
+
+    def has_many_keywords(self) -> bool:
+        return len(self.param.keywords) > 1
+
+    def file_line(self, path: str, keyword: str) -> str:
+        """
+        Line of a found file, tagged with its keyword when searching many.
+        """
+        if keyword and self.has_many_keywords():
+            return f"{path}  [{keyword}]"
+        return path
+
+    def count_keyword(self, project_id, keyword: str):
+        self.keyword_files[keyword] += 1
+        self.keyword_projects.setdefault(keyword, set()).add(project_id)
+
+    def print_keyword_summary(self, project_type: str = "repository(s)"):
+        if not self.has_many_keywords():
+            return
+        for keyword in self.param.keywords:
+            file_count = self.keyword_files[keyword]
+            project_count = len(self.keyword_projects.get(keyword, ()))
+            self.print(
+                f'"{keyword}": {file_count} file(s) in {project_count} {project_type}',
+                dim=not file_count,
+            )
+
+    def highlight_text(self, text: str, keyword: str) -> str:
+        """
+        Text to highlight in a preview, the first match of keyword when it is
+        a regular expression.
+        """
+        if not self.param.regex:
+            return keyword
+        match = re.search(keyword, text, re.MULTILINE)
+        return match.group(0) if match and match.group(0) else keyword
 
     def print_title(self, text: str):
         self.print_output.print(text, color="bright_blue")
@@ -104,6 +174,11 @@ class PrintObserver(BaseObserver):
         if self.export_output:
             self.export_output.write(f"```\n{text})\n```")
 
+    def flush(self):
+        # Make the sections already rendered visible in the exported file.
+        if self.export_output:
+            self.export_output.flush()
+
     def print_separate_line(self):
         self.print_output.print("------------------------")
 
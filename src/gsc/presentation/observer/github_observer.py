@@ -1,19 +1,22 @@
 from typing import Any
-from gsc.domain.entities.github_model import Repository
+from gsc.domain.entities.github_model import File, Repository
+from gsc.domain.entities.search_event import FileEvent, ProjectSummaryEvent
 from gsc.presentation.observer.base_observer import PrintObserver, PrintParam
 from gsc.presentation.command_line import finish_main_thread
-from gsc.constants import GitHubConstant
+from gsc.constants import GitHubConstant, SEARCH_MAX_RESULTS
 
 
 class GitHubParam(PrintParam):
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         self.repo_name = kwargs.get("repo_name")
+        self.search_mode = kwargs.get("search_mode")
 
 
 class GitHubPrintObserver(PrintObserver):
     def __init__(self, param: GitHubParam = None) -> None:
         self.repo_count = 0
+        self.current_repo_id = None
         super().__init__(param)
 
     def on_print_start(self) -> None:
@@ -21,25 +24,43 @@ class GitHubPrintObserver(PrintObserver):
         self.print_title(msg)
 
     def on_print_result(self, value: Any) -> None:
-        repo: Repository = value[0]
-        files: list = value[1]
-        self.print_separate_line()
-        if files:
+        if isinstance(value, FileEvent):
+            self.__print_file(value.project, value.file, value.keyword)
+        elif isinstance(value, ProjectSummaryEvent):
+            self.__print_summary(value.project, value.file_count, value.incomplete)
+
+    def __print_file(self, repo: Repository, file: File, keyword: str = None):
+        if repo.id != self.current_repo_id:
             # REPOSITORY
-            self.repo_count += 1
-            repo_msg = f"[{repo.id}] {repo.name} - {len(files)} file(s)"
+            self.current_repo_id = repo.id
+            self.print_separate_line()
+            repo_msg = f"[{repo.id}] {repo.name}"
             if repo.archived:
-                repo_msg = f"[{repo.id}] (❗Archived) {repo.name} - {len(files)} file(s)"
+                repo_msg = f"[{repo.id}] (❗Archived) {repo.name}"
             self.print_heading1(repo_msg)
-            # FILES
-            for file in files:
-                self.print(f"{file.path}")
-        else:
-            # REPOSITORY
-            repo_msg = f"[{repo.id}] {repo.name}"
-            self.print_heading1(repo_msg, dim=True)
-            # FILES
-            self.print_no_result("No results found")
+        # FILES
+        self.count_keyword(repo.id, keyword)
+        self.print(self.file_line(file.path, keyword))
+
+    def __print_summary(self, repo: Repository, file_count: int, incomplete=False):
+        self.current_repo_id = None
+        if file_count:
+            self.repo_count += 1
+            self.print(f"{file_count} file(s)", dim=True)
+            if incomplete:
+                self.print(
+                    f"(❗Incomplete) The search returns at most {SEARCH_MAX_RESULTS} files per query, some files are not listed.",
+                    color="yellow",
+                )
+            self.flush()
+            return
+
+        self.print_separate_line()
+        # REPOSITORY
+        repo_msg = f"[{repo.id}] {repo.name}"
+        self.print_heading1(repo_msg, dim=True)
+        # FILES
+        self.print_no_result("No results found")
 
     @finish_main_thread
     def on_print_end(self, elapsed_time) -> None:
@@ -48,6 +69,7 @@ class GitHubPrintObserver(PrintObserver):
             count_msg = self.repo_count if self.repo_count != 0 else "NO"
             msg = f'[{elapsed_time}] There are {count_msg} repository(s) containing "{self.param.keyword}".'
             self.print(msg)
+        self.print_keyword_summary()
         self.repo_count = 0
 
     @finish_main_thread
@@ -1,5 +1,6 @@
 from typing import Any
-from gsc.domain.entities.gitlab_model import Project
+from gsc.domain.entities.gitlab_model import File, Project
+from gsc.domain.entities.search_event import FileEvent, ProjectSummaryEvent
 from gsc.presentation.observer.base_observer import PrintObserver, PrintParam
 from gsc.presentation.command_line import finish_main_thread
 from gsc.constants import GitLabConstant
@@ -13,11 +14,15 @@ class GitLabParam(PrintParam):
         self.is_search_group = kwargs.get("is_search_group") or False
         self.code_preview = kwargs.get("code_preview") or False
         self.ignore_no_result = kwargs.get("ignore_no_result") or False
+        self.exclude_archived = kwargs.get("exclude_archived") or False
+        self.exclude_empty = kwargs.get("exclude_empty") or False
+        self.active_since = kwargs.get("active_since")
 
 
 class GitLabPrintObserver(PrintObserver):
     def __init__(self, param: GitLabParam = None) -> None:
         self.project_count = 0
+        self.current_project_id = None
         super().__init__(param)
 
     def on_print_start(self) -> None:
@@ -25,34 +30,46 @@ class GitLabPrintObserver(PrintObserver):
         self.print_title(msg)
 
     def on_print_result(self, value: Any) -> None:
-        project: Project = value[0]
-        files: list = value[1]
-        if files:
+        if isinstance(value, FileEvent):
+            self.__print_file(value.project, value.file, value.keyword)
+        elif isinstance(value, ProjectSummaryEvent):
+            self.__print_summary(value.project, value.file_count)
+
+    def __print_file(self, project: Project, file: File, keyword: str = None):
+        if project.id != self.current_project_id:
             # PROJECT
+            self.current_project_id = project.id
             self.print_separate_line()
-            self.project_count += 1
-            project_msg = f"[{project.id}] {project.name} - {len(files)} file(s)"
+            project_msg = f"[{project.id}] {project.name}"
             if project.archived:
-                project_msg = (
-                    f"[{project.id}] (❗Archived) {project.name} - {len(files)} file(s)"
-                )
+                project_msg = f"[{project.id}] (❗Archived) {project.name}"
             self.print_heading1(project_msg)
-            # FILE
-            for file in files:
-                # File path
-                self.print(f"{file.path}")
-                # Show code preview if needed
-                if self.param.code_preview:
-                    self.print_code_block(file.data_preview, self.param.keyword)
-        else:
-            if self.param.is_search_group and self.param.ignore_no_result:
-                return
-            self.print_separate_line()
-            # PROJECT
-            project_msg = f"[{project.id}] {project.name}"
-            self.print_heading1(project_msg, dim=True)
-            # FILE
-            self.print_no_result("No results found")
+        # FILE
+        self.count_keyword(project.id, keyword)
+        self.print(self.file_line(file.path, keyword))
+        # Show code preview if needed
+        if self.param.code_preview:
+            self.print_code_block(
+                file.data_preview,
+                self.highlight_text(file.data_preview, keyword or self.param.keyword),
+            )
+
+    def __print_summary(self, project: Project, file_count: int):
+        self.current_project_id = None
+        if file_count:
+            self.project_count += 1
+            self.print(f"{file_count} file(s)", dim=True)
+            self.flush()
+            return
+
+        if self.param.is_search_group and self.param.ignore_no_result:
+            return
+        self.print_separate_line()
+        # PROJECT
+        project_msg = f"[{project.id}] {project.name}"
+        self.print_heading1(project_msg, dim=True)
+        # FILE
+        self.print_no_result("No results found")
 
     @finish_main_thread
     def on_print_end(self, elapsed_time) -> None:
@@ -61,6 +78,7 @@ class GitLabPrintObserver(PrintObserver):
             count_msg = self.project_count if self.project_count != 0 else "NO"
             msg = f'[{elapsed_time}] There are {count_msg} repository(s) containing "{self.param.keyword}".'
             self.print(msg)
+        self.print_keyword_summary()
         self.project_count = 0
 
     @finish_main_thread
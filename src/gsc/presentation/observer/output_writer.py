@@ -0,0 +1,147 @@
+import queue
+import threading
+import click
+
+# Texts waiting to be written, the observers wait when the writer is behind.
+DEFAULT_QUEUE_SIZE = 10000
+# Characters joined into one write.
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+_CLOSE = object()
+
+
+class OutputWriter:
+    """
+    Write the text of the observers from a dedicated thread, so the rx threads
+    do not wait for the terminal. The texts are put in a bounded queue, the
+    writer joins the consecutive texts of a stream into one write.
+
+    The texts of several streams (results on stdout, progress on stderr) are
+    written in the order they were queued.
+    """
+
+    def __init__(
+        self, max_size: int = DEFAULT_QUEUE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> None:
+        self.batch_size = batch_size
+        self._queue = queue.Queue(max_size)
+        self._closed = False
+        # A write failed (closed pipe), the next texts are dropped.
+        self._broken = False
+        self._thread = threading.Thread(
+            target=self.__run, name="gsc-output", daemon=True
+        )
+        self._thread.start()
+        with _lock:
+            _writers.add(self)
+
+    def write(self, stream, text: str):
+        if self._closed:
+            write_text(stream, text)
+            return
+        self._queue.put((stream, text))
+
+    def flush(self, wait: bool = True):
+        """
+        Flush the streams once the queued texts are written, wait for it
+        unless ``wait`` is False.
+        """
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put((None, done))
+        if wait:
+            done.wait()
+
+    def close(self):
+        """
+        Write the queued texts and stop the writer thread.
+        """
+        with _lock:
+            _writers.discard(self)
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put((None, _CLOSE))
+        self._thread.join()
+
+    def __run(self):
+        streams = set()
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][1]) if batch[0][0] else 0
+            while size < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+                if item[0]:
+                    size += len(item[1])
+
+            # Join the consecutive texts of the same stream.
+            stream, texts = None, []
+            for item_stream, value in batch:
+                if item_stream is not stream and texts:
+                    self.__write(stream, "".join(texts))
+                    texts = []
+                if item_stream is None:
+                    stream = None
+                    self.__flush(streams)
+                    if value is _CLOSE:
+                        return
+                    value.set()
+                    continue
+                stream = item_stream
+                streams.add(stream)
+                texts.append(value)
+            if texts:
+                self.__write(stream, "".join(texts))
+
+    def __write(self, stream, text: str):
+        if self._broken:
+            return
+        try:
+            write_text(stream, text)
+        except (OSError, ValueError):
+            # Closed pipe (| head) or file, keep reading the queue so the
+            # observers are not blocked.
+            self._broken = True
+
+    def __flush(self, streams: set):
+        for stream in streams:
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+
+
+def write_text(stream, text: str):
+    if is_terminal(stream):
+        # Translate the styles for the Windows console
+        click.echo(text, file=stream, nl=False)
+    else:
+        stream.write(text)
+
+
+def is_terminal(stream) -> bool:
+    isatty = getattr(stream, "isatty", None)
+    try:
+        return bool(isatty and isatty())
+    except ValueError:
+        return False
+
+
+_writers = set()
+_lock = threading.Lock()
+
+
+def close_writers():
+    """
+    Write the remaining texts of all the writers, called when the command is
+    done before the process exits.
+    """
+    with _lock:
+        writers = list(_writers)
+    for writer in writers:
+        writer.close()
@@ -1,10 +1,13 @@
 import abc
+import sys
 import click
+from gsc.presentation.observer.output_writer import OutputWriter, is_terminal
 
 
 class ExportPlugin(abc.ABC):
     def __init__(self) -> None:
         self._export_file = None
+        self._writer = None
 
     def set_output_path(self, output_path: str):
         if output_path is None:
@@ -14,13 +17,21 @@ class ExportPlugin(abc.ABC):
         self._export_file = (
             click.open_file(output_path, mode="w") if output_path else None
         )
+        if self._export_file and self._writer is None:
+            self._writer = OutputWriter()
 
     def write(self, message: str):
         if self._export_file:
-            self._export_file.write(message + "\n")
+            self._writer.write(self._export_file, message + "\n")
+
+    def flush(self):
+        # Do not wait, the observers only make the written sections visible.
+        if self._export_file and not self._export_file.closed:
+            self._writer.flush(wait=False)
 
     def close(self):
         if self._export_file and not self._export_file.closed:
+            self._writer.close()
             self._export_file.close()
 
 
@@ -45,8 +56,18 @@ class MarkdownExportPlugin(ExportPlugin):
 
 
 class PrintPlugin:
-    def __init__(self, is_debug: bool) -> None:
+    """
+    Print to the console through an ``OutputWriter``. The styles are only
+    added when the output is a terminal.
+    """
+
+    def __init__(self, is_debug: bool, stream=None, err_stream=None) -> None:
         self.is_debug = is_debug
+        self._progress_shown = False
+        self._stream = stream or sys.stdout
+        self._err_stream = err_stream or sys.stderr
+        self._styled = is_terminal(self._stream)
+        self._writer = OutputWriter()
 
     def print(
         self, msg: str, background: str = None, color: str = None, dim: bool = False
@@ -83,9 +104,38 @@ class PrintPlugin:
         if self.is_debug:
             return
 
-        click.secho(msg, bg=background, fg=color, dim=dim)
+        self.clear_progress()
+        if self._styled:
+            msg = click.style(msg, bg=background, fg=color, dim=dim)
+        self._writer.write(self._stream, msg + "\n")
+
+    def print_progress(self, msg: str):
+        """
+        Print the message on a single line of stderr, replaced by the next one.
+        Only shown on a terminal.
+        """
+        if self.is_debug or not is_terminal(self._err_stream):
+            return
+
+        self._writer.write(self._err_stream, f"\r{msg}\033[K")
+        self._progress_shown = True
+
+    def clear_progress(self):
+        if self._progress_shown:
+            self._writer.write(self._err_stream, "\r\033[K")
+            self._progress_shown = False
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
 
     def print_highlight(self, msg: str, highlight_text: str, **styles):
+        if not self._styled:
+            self.print(msg)
+            return
+
         # Set background style for text which need to be highlighted
         formated_text = click.style(highlight_text, bg="bright_white")
         # Split the original text and join highlight text
@@ -0,0 +1,58 @@
+from collections import Counter
+from gsc.core.git_mirror import MIRROR_UNCHANGED
+from gsc.core.trigram_index import INDEX_CURRENT
+from gsc.domain.entities.sync_event import SyncEvent
+from gsc.presentation.observer.base_observer import BaseObserver, PrintParam
+from gsc.presentation.observer.plugin import PrintPlugin
+from gsc.presentation.command_line import finish_main_thread
+
+
+class SyncParam(PrintParam):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.platform = kwargs.get("platform")
+        self.indexed = kwargs.get("indexed") or False
+
+
+class SyncPrintObserver(BaseObserver):
+    def __init__(self, param: SyncParam = None) -> None:
+        self.print_output = PrintPlugin(param.is_debug)
+        self.counts = Counter()
+        super().__init__(param)
+
+    def on_print_start(self) -> None:
+        msg = f'[{self.param.platform}] ("{self.param.env_name}" env) Syncing the mirrors ...'
+        self.print_output.print(msg, color="bright_blue")
+
+    def on_print_result(self, value: SyncEvent) -> None:
+        project_msg = f"[{value.project.id}] {value.project.name}"
+        if value.error:
+            self.counts["failed"] += 1
+            self.print_output.print(
+                f"{project_msg} : {value.error}".strip(), color="bright_red"
+            )
+            return
+
+        self.counts[value.status] += 1
+        # Only the projects which changed are listed, the others are counted.
+        if value.status == MIRROR_UNCHANGED and value.index_status in (
+            None,
+            INDEX_CURRENT,
+        ):
+            return
+        msg = f"{project_msg} : {value.status}"
+        if value.index_status:
+            msg += f", index {value.index_status}"
+        self.print_output.print(msg)
+
+    @finish_main_thread
+    def on_print_end(self, elapsed_time) -> None:
+        self.print_output.print("------------------------")
+        summary = ", ".join(
+            f"{count} {status}" for status, count in self.counts.items()
+        )
+        self.print_output.print(f"[{elapsed_time}] {summary or 'Nothing to sync'}.")
+
+    @finish_main_thread
+    def on_print_error(self, error: Exception) -> None:
+        self.print_output.print(f"[Error] {error}", color="bright_red")
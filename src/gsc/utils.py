@@ -1,11 +1,7 @@
 import os
 import sys
 import re
-
-if sys.version_info[:2] >= (3, 8):
-    from importlib import metadata
-else:
-    import importlib_metadata as metadata
+from datetime import datetime, timezone
 
 DISTRIBUTION_NAME = "git-search-command"
 EXTENSION_SUPPORTED = (".md", ".markdown")
@@ -32,7 +28,7 @@ def get_project_home_page():
 
 
 def get_project_version():
-    __version__ = metadata.version(DISTRIBUTION_NAME)
+    __version__ = __metadata_module().version(DISTRIBUTION_NAME)
     return __version__
 
 
@@ -51,5 +47,35 @@ def is_supported_extension_output_file(output_path: str):
         return False
 
 
+def read_keywords(path: str) -> list:
+    """
+    Read the keywords of a file, one per line. The empty lines and the lines
+    starting with # are skipped.
+    """
+    with open(path, encoding="utf-8") as file:
+        lines = [line.strip() for line in file]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def parse_iso_datetime(value: str):
+    try:
+        # Python < 3.11 does not support "Z" suffix, e.g. "2022-11-30T08:10:25.153Z"
+        time = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+    return time if time.tzinfo else time.replace(tzinfo=timezone.utc)
+
+
 def __get_project_metadata():
-    return metadata.metadata(DISTRIBUTION_NAME)
+    return __metadata_module().metadata(DISTRIBUTION_NAME)
+
+
+def __metadata_module():
+    # Slow to import, only needed by `gsc -i`
+    # pylint: disable=C0415
+    if sys.version_info[:2] >= (3, 8):
+        from importlib import metadata
+    else:
+        import importlib_metadata as metadata
+    return metadata
@@ -0,0 +1,49 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+
+class MockServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        # Callable (path, query, headers) -> (status, headers, body)
+        self.route = lambda *_: (200, {}, [])
+        self.requests = []
+
+    @property
+    def host(self):
+        return f"http://127.0.0.1:{self.server_port}/"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        parsed = urlparse(self.path)
+        query = {key: value[0] for key, value in parse_qs(parsed.query).items()}
+        self.server.requests.append((parsed.path, query))
+        status, headers, body = self.server.route(parsed.path, query, self.headers)
+        content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *_):
+        pass
+
+
+@pytest.fixture
+def server():
+    mock_server = MockServer()
+    thread = threading.Thread(target=mock_server.serve_forever, daemon=True)
+    thread.start()
+    yield mock_server
+    mock_server.shutdown()
+    mock_server.server_close()
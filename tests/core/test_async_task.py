@@ -0,0 +1,69 @@
+import threading
+import time
+from rx import operators as ops
+
+# pylint: disable=redefined-outer-name
+import pytest
+from gsc.core.async_task import AsyncEngine
+
+
+@pytest.fixture
+def engine():
+    return AsyncEngine(concurrency=4)
+
+
+def test_submit_flattens_results(engine):
+    def pages():
+        yield [1, 2]
+        yield [3]
+
+    result = engine.submit(pages).pipe(ops.to_list()).run()
+    assert result == [1, 2, 3]
+
+
+def test_disposed_generator_is_not_iterated(engine):
+    sent = []
+
+    def pages():
+        for page in range(5):
+            # Time of the request of the page
+            time.sleep(0.05)
+            sent.append(page)
+            yield [page]
+
+    assert engine.submit(pages).pipe(ops.take(2), ops.to_list()).run() == [0, 1]
+    assert sent == [0, 1]
+
+
+def test_submit_awaits_coroutine(engine):
+    async def fetch(value):
+        return [value, value]
+
+    assert engine.submit(fetch, 5).pipe(ops.to_list()).run() == [5, 5]
+
+
+def test_submit_propagates_error(engine):
+    def fail():
+        raise ValueError("Error")
+
+    with pytest.raises(ValueError):
+        engine.submit(fail).run()
+
+
+def test_concurrency_is_bounded(engine):
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def task(value):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.05)
+        with lock:
+            state["running"] -= 1
+        return value
+
+    observables = [engine.submit(task, i) for i in range(12)]
+    source = observables[0].pipe(ops.merge(*observables[1:]), ops.to_list())
+    assert sorted(source.run()) == list(range(12))
+    assert state["peak"] == 4
@@ -0,0 +1,37 @@
+import json
+import pytest
+from gsc.domain.entities.gitlab_model import File
+from gsc.data.response.gitlab_response import file_response
+
+
+def test_slot_model_without_dict():
+    file = File("main.py", "src/main.py", "main", "print()")
+    assert not hasattr(file, "__dict__")
+    assert file.project_url == ""
+    assert file.project_id is None
+    assert file.url == "/-/blob/main/src/main.py"
+
+
+def test_slot_model_to_dict_and_json():
+    file = file_response(
+        basename="main", path="src/main.py", ref="main", data="x", project_id=7
+    )
+    expected = {
+        "name": "main",
+        "path": "src/main.py",
+        "ref": "main",
+        "data_preview": "x",
+        "project_url": "",
+        "project_id": 7,
+    }
+    assert file.to_dict() == expected
+    assert json.loads(file.to_json_string()) == expected
+    assert File(**expected) == file
+    assert File.from_json(file.to_json_string()) == file
+
+
+def test_slot_model_invalid_arguments():
+    with pytest.raises(TypeError):
+        File("main.py", "src/main.py")
+    with pytest.raises(TypeError):
+        File("main.py", "src/main.py", "main", "x", unknown=1)
@@ -0,0 +1,67 @@
+import os
+import dotenv
+import pytest
+from gsc.config import AppConfig, Env, GitLabConfig
+
+
+@pytest.fixture
+def env():
+    return Env(
+        name="local",
+        host_name="https://gitlab.local",
+        private_token="it's \\ secret",
+        verify_ssl_cert=True,
+        page_size=None,
+        cache_ttl=None,
+    )
+
+
+def test_env_round_trip(tmp_path, env):
+    config = GitLabConfig(str(tmp_path))
+    config.set_env(env)
+
+    reloaded = GitLabConfig(str(tmp_path))
+    assert reloaded.get_default_env().to_dict() == env.to_dict()
+    assert [item.name for item in reloaded.get_all_envs()] == ["local"]
+    # Same format as dotenv
+    assert dotenv.dotenv_values(tmp_path / "gitlabconfig.env")["local"] == (
+        env.to_json_string()
+    )
+
+
+def test_session_keys_are_not_written(tmp_path, env):
+    config = GitLabConfig(str(tmp_path))
+    config.set_env(env)
+    modified = os.stat(tmp_path / "gitlabconfig.env").st_mtime_ns
+    assert config.set_session_env("local") == (True, None)
+    assert config.get_session_env().name == "local"
+
+    app_config = AppConfig(str(tmp_path))
+    app_config.set_debug(True)
+    app_config.set_max_results(10)
+    assert app_config.is_debug()
+    assert app_config.get_max_results() == 10
+
+    assert os.stat(tmp_path / "gitlabconfig.env").st_mtime_ns == modified
+    assert not (tmp_path / "appconfig.env").exists()
+    assert GitLabConfig(str(tmp_path)).get_session_env() is None
+
+
+def test_batch_writes_once(tmp_path, mocker):
+    config = GitLabConfig(str(tmp_path))
+    replace = mocker.spy(os, "replace")
+    with config.batch():
+        config.set_key("A", "1")
+        config.set_key("B", "2")
+        config.remove_key("A")
+    assert replace.call_count == 1
+    assert dotenv.dotenv_values(tmp_path / "gitlabconfig.env") == {"B": "2"}
+
+
+def test_save_keeps_concurrent_changes(tmp_path):
+    first = GitLabConfig(str(tmp_path))
+    second = GitLabConfig(str(tmp_path))
+    first.set_key("A", "1")
+    second.set_key("B", "2")
+    assert dotenv.dotenv_values(tmp_path / "gitlabconfig.env") == {"A": "1", "B": "2"}
+    assert second.get_key("A") == "1"
@@ -0,0 +1,28 @@
+from gsc.core.connection_pool import ConnectionPool
+
+
+def test_session_is_shared_per_host():
+    pool = ConnectionPool()
+    assert pool.session("https://a.com/") is pool.session("https://a.com/")
+    assert pool.session("https://a.com/") is not pool.session("https://b.com/")
+    pool.close()
+
+
+def test_connections_are_reused(server):
+    pool = ConnectionPool(pool_maxsize=2)
+    for _ in range(5):
+        pool.session(server.host).get(server.host).raise_for_status()
+
+    stats = pool.stats()
+    assert stats.opened == 1
+    assert stats.reused == 4
+    pool.close()
+
+
+def test_configure_resets_sessions():
+    pool = ConnectionPool()
+    session = pool.session("https://a.com/")
+    pool.configure(pool_maxsize=32)
+    assert pool.pool_maxsize == 32
+    assert pool.session("https://a.com/") is not session
+    pool.close()
@@ -0,0 +1,150 @@
+import base64
+import os
+import subprocess
+import pytest
+from gsc.core.git_mirror import (
+    MIRROR_CLONED,
+    MIRROR_FETCHED,
+    MIRROR_OFFLINE,
+    MIRROR_UNCHANGED,
+    GitMirrorError,
+    MirrorStore,
+    git_config_env,
+)
+from gsc.core.local_search import search_tree
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=gsc", "-c", "user.email=gsc@localhost", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def commit(repo, files: dict):
+    for path, content in files.items():
+        (repo / path).parent.mkdir(parents=True, exist_ok=True)
+        mode = "wb" if isinstance(content, bytes) else "w"
+        with open(repo / path, mode) as file:
+            file.write(content)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "update")
+
+
+@pytest.fixture
+def remote(tmp_path):
+    repo = tmp_path / "remote"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    commit(repo, {"README.md": "Hello\n", "src/app.py": "import os\nprint(1)\n"})
+    return repo
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MirrorStore("gitlab", "local", root_dir=str(tmp_path / "mirrors"))
+
+
+def test_sync_clones_then_fetches_on_new_version(remote, store):
+    mirror = store.sync(1, "v1", lambda: str(remote))
+    assert mirror.exists()
+    assert mirror.version == "v1"
+    assert mirror.head_ref() == "main"
+    first_head = mirror.head()
+
+    commit(remote, {"src/app.py": "import sys\n"})
+    # Same version, the mirror is not fetched
+    assert store.sync(1, "v1").head() == first_head
+    assert store.sync(1, "v2").head() != first_head
+    assert [item["path"] for item in search_tree(mirror.git_dir, "IMPORT SYS")] == [
+        "src/app.py"
+    ]
+
+
+def test_only_branches_are_mirrored(remote, store):
+    git(remote, "update-ref", "refs/pull/1/head", "HEAD")
+    git(remote, "branch", "feature")
+    mirror = store.sync(1, "v1", lambda: str(remote))
+    assert mirror.git("for-each-ref", "--format=%(refname)").split() == [
+        "refs/heads/feature",
+        "refs/heads/main",
+    ]
+
+    git(remote, "update-ref", "refs/pull/2/head", "HEAD")
+    git(remote, "branch", "-D", "feature")
+    git(remote, "branch", "fix")
+    store.sync(1, "v2")
+    assert mirror.git("for-each-ref", "--format=%(refname)").split() == [
+        "refs/heads/fix",
+        "refs/heads/main",
+    ]
+
+
+def test_sync_keeps_mirror_when_fetch_fails(remote, store):
+    mirror = store.sync(1, "v1", lambda: str(remote))
+    head = mirror.head()
+    mirror.git("remote", "set-url", "origin", str(remote.parent / "offline"))
+    assert store.sync(1, "v2").head() == head
+
+    with pytest.raises(GitMirrorError):
+        store.sync(2, "v1", lambda: str(remote.parent / "offline"))
+
+
+def test_refresh_status(remote, store):
+    assert store.refresh(1, "v1", lambda: str(remote))[1] == MIRROR_CLONED
+    assert store.refresh(1, "v1")[1] == MIRROR_UNCHANGED
+    assert store.refresh(1, "v2")[1] == MIRROR_FETCHED
+
+    mirror = store.mirror(1)
+    mirror.git("remote", "set-url", "origin", str(remote.parent / "offline"))
+    assert store.refresh(1, "v3")[1] == MIRROR_OFFLINE
+    # The version is not saved when the fetch failed
+    assert mirror.version == "v2"
+
+
+def test_git_config_env():
+    env = git_config_env(
+        "https://gitlab.com/group/project.git", "oauth2", "token", verify_ssl=False
+    )
+    assert env["GIT_CONFIG_COUNT"] == "2"
+    credentials = base64.b64encode(b"oauth2:token").decode()
+    # Only sent to the host of the project
+    assert env["GIT_CONFIG_KEY_0"] == "http.https://gitlab.com/.extraHeader"
+    assert env["GIT_CONFIG_VALUE_0"] == f"Authorization: Basic {credentials}"
+    assert env["GIT_CONFIG_KEY_1"] == "http.https://gitlab.com/.sslVerify"
+    assert git_config_env("https://gitlab.com/group/project.git") == {
+        "GIT_CONFIG_COUNT": "0"
+    }
+
+
+def test_scoped_header_is_applied_by_git(tmp_path):
+    env = dict(
+        os.environ,
+        **git_config_env("https://gitlab.com/group/project.git", "oauth2", "token"),
+    )
+
+    def header(url: str) -> str:
+        result = subprocess.run(
+            ["git", "config", "--get-urlmatch", "http.extraHeader", url],
+            env=env,
+            cwd=tmp_path,
+            capture_output=True,
+            check=False,
+        )
+        return result.stdout.decode()
+
+    assert header("https://gitlab.com/group/project.git").startswith("Authorization")
+    assert header("https://cdn.example.com/group/project.git") == ""
+
+
+def test_old_git_is_refused_with_credentials(remote, tmp_path, mocker):
+    mocker.patch("gsc.core.git_mirror.git_version", return_value=(2, 30, 1))
+    store = MirrorStore("gitlab", "local", token="token", root_dir=str(tmp_path))
+    with pytest.raises(GitMirrorError, match="git >= 2.31 is required"):
+        store.sync(1, "v1", lambda: str(remote))
+
+    # Nothing to pass without credentials
+    public_store = MirrorStore("gitlab", "public", root_dir=str(tmp_path))
+    assert public_store.sync(1, "v1", lambda: str(remote)).exists()
@@ -0,0 +1,45 @@
+import json
+import pytest
+from gsc.core.json_stream import JsonStream
+
+
+def split(text: str, size: int) -> list:
+    data = text.encode("utf-8")
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 4096])
+def test_array_items_across_chunks(size):
+    items = [{"id": i, "data": "été ✓ " * i, "value": 1.5e3} for i in range(20)]
+    assert list(JsonStream(split(json.dumps(items), size))) == items
+
+
+@pytest.mark.parametrize("size", [1, 5, 4096])
+def test_object_items_and_fields(size):
+    body = json.dumps(
+        {"total_count": 12345, "items": [{"a": 1}, {"b": [1, 2]}], "last": True}
+    )
+    stream = JsonStream(split(body, size), items_key="items")
+    items = iter(stream)
+    assert next(items) == {"a": 1}
+    # Fields before the items are already read
+    assert stream.fields == {"total_count": 12345}
+    assert list(items) == [{"b": [1, 2]}]
+    assert stream.fields == {"total_count": 12345, "last": True}
+
+
+@pytest.mark.parametrize(
+    "body, expected", [("[]", []), (" [ 1 , 2 ] ", [1, 2]), ("", [])]
+)
+def test_small_documents(body, expected):
+    assert list(JsonStream([body.encode()])) == expected
+
+
+def test_object_without_items_key():
+    assert list(JsonStream([b'{"id": 1}'])) == [{"id": 1}]
+
+
+@pytest.mark.parametrize("body", ['[{"a": 1}, {"b"', '[{"a": 1} {"b": 2}]', "[1, 2"])
+def test_invalid_document(body):
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonStream(split(body, 2)))
@@ -0,0 +1,74 @@
+import random
+import subprocess
+import pytest
+from gsc.core.keyword_scanner import KeywordScanner, scan_tree
+from gsc.core.local_search import LocalSearchEngine
+
+GIT = ["git", "-c", "user.name=gsc", "-c", "user.email=gsc@localhost"]
+
+
+@pytest.fixture
+def git_dir(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_bytes(
+        b"import requests\n\ndef search():\n    # TODO: search again\n    pass\n"
+    )
+    (tmp_path / "README.md").write_bytes(b"# Search\n")
+    (tmp_path / "empty.txt").write_bytes(b"")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\0search")
+    subprocess.run(GIT + ["init", "-q", "-b", "main", str(tmp_path)], check=True)
+    subprocess.run(GIT + ["-C", str(tmp_path), "add", "-A"], check=True)
+    subprocess.run(GIT + ["-C", str(tmp_path), "commit", "-q", "-m", "i"], check=True)
+    return str(tmp_path / ".git")
+
+
+def test_overlapping_keywords():
+    scanner = KeywordScanner(["he", "she", "his", "hers", ""])
+    assert sorted(scanner.scan(b"USHERS ahishers")) == [
+        (1, 1),
+        (2, 0),
+        (2, 3),
+        (8, 2),
+        (10, 1),
+        (11, 0),
+        (11, 3),
+    ]
+
+
+def test_same_matches_as_find():
+    rand = random.Random(0)
+    content = bytes(rand.choice(b"abcAB\n") for _ in range(5000))
+    keywords = ["ab", "abc", "bca", "cab", "aaa", "b\na"]
+    scanner = KeywordScanner(keywords)
+
+    found = sorted(scanner.scan(content))
+    expected = []
+    lower = content.lower()
+    for number, keyword in enumerate(keywords):
+        position = lower.find(keyword.encode())
+        while position >= 0:
+            expected.append((position, number))
+            position = lower.find(keyword.encode(), position + 1)
+    assert found == sorted(expected)
+
+
+def test_scan_tree(git_dir):
+    items = scan_tree(git_dir, ["SEARCH", "todo", "missing"])
+    assert [(item["path"], item["keyword"]) for item in items] == [
+        ("README.md", "SEARCH"),
+        ("src/app.py", "SEARCH"),
+        ("src/app.py", "todo"),
+    ]
+    app = items[1]
+    assert app["ref"] == "main"
+    assert app["matches"] == [(3, 21), (4, 43)]
+    assert app["startline"] == 2
+    assert app["data"] == "\ndef search():\n    # TODO: search again\n"
+    assert items[2]["matches"] == [(4, 37)]
+
+    engine = LocalSearchEngine(2)
+    try:
+        future = engine.submit(scan_tree, git_dir, ["SEARCH", "todo", "missing"])
+        assert future.result() == items
+    finally:
+        engine.shutdown()
@@ -0,0 +1,59 @@
+import subprocess
+import pytest
+from gsc.core.local_search import LocalSearchEngine, preview_lines, search_tree
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=gsc", "-c", "user.email=gsc@localhost", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_dir(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "src" / "main.py").write_text("a = 1\nb = Keyword()\nc = 3\nd = 4\n")
+    (repo / "notes.txt").write_text("nothing here\n")
+    (repo / "image.bin").write_bytes(b"\0keyword")
+    git(repo, "init", "-q", "-b", "dev")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "init")
+    return str(repo / ".git")
+
+
+def test_search_tree(git_dir):
+    assert search_tree(git_dir, "keyword") == [
+        {
+            "basename": "main",
+            "path": "src/main.py",
+            "ref": "dev",
+            "startline": 1,
+            "data": "a = 1\nb = Keyword()\nc = 3\n",
+        }
+    ]
+    assert search_tree(git_dir, "missing") == []
+
+
+@pytest.mark.parametrize(
+    "content, position, expected",
+    [
+        (b"match", 0, (1, "match\n")),
+        (b"one\ntwo\nmatch\n", 8, (2, "two\nmatch\n")),
+        (b"match\nthree\nfour", 0, (1, "match\nthree\n")),
+    ],
+)
+def test_preview_lines(content, position, expected):
+    assert preview_lines(content, position) == expected
+
+
+def test_engine_runs_on_process_pool(git_dir):
+    engine = LocalSearchEngine(max_workers=1)
+    try:
+        items = engine.submit(search_tree, git_dir, "KEYWORD").result(timeout=60)
+    finally:
+        engine.shutdown()
+    assert [item["path"] for item in items] == ["src/main.py"]
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from gsc.core.rate_limit import rate_limit, report_response
+
+
+def create_request(limiter, headers: dict = None, status_code: int = 200):
+    @limiter
+    def request(_):
+        if headers is not None:
+            report_response(headers, status_code)
+        return time.monotonic()
+
+    return request
+
+
+def test_sliding_window_without_server_quota():
+    request = create_request(rate_limit(calls=2, period=0.3))
+    api = SimpleNamespace(rate_limit_key="token")
+    start = time.monotonic()
+    calls = [request(api) for _ in range(3)]
+    assert calls[1] - start < 0.1
+    assert calls[2] - start >= 0.25
+
+
+def test_wait_until_reset_when_quota_exhausted():
+    limiter = rate_limit(calls=100, period=60)
+    api = SimpleNamespace(rate_limit_key="token")
+    headers = {"RateLimit-Remaining": "0", "RateLimit-Reset": str(time.time() + 0.3)}
+    create_request(limiter, headers)(api)
+
+    start = time.monotonic()
+    create_request(limiter)(api)
+    assert time.monotonic() - start >= 0.25
+
+
+def test_pace_calls_over_remaining_quota():
+    limiter = rate_limit(calls=100, period=60)
+    api = SimpleNamespace(rate_limit_key="token")
+    headers = {
+        "X-RateLimit-Remaining": "10",
+        "X-RateLimit-Reset": str(time.time() + 1),
+    }
+    create_request(limiter, headers)(api)
+
+    # Server allows 10 calls in the next second, one every 0.1s
+    start = time.monotonic()
+    for _ in range(3):
+        create_request(limiter)(api)
+    assert 0.15 <= time.monotonic() - start < 0.6
+
+
+def test_sliding_window_applies_with_server_quota():
+    limiter = rate_limit(calls=2, period=0.3)
+    api = SimpleNamespace(rate_limit_key="token")
+    headers = {"RateLimit-Remaining": "2000", "RateLimit-Reset": str(time.time() + 60)}
+    start = time.monotonic()
+    create_request(limiter, headers)(api)
+    create_request(limiter)(api)
+
+    # The quota of the server is broader than the configured limit
+    create_request(limiter)(api)
+    assert time.monotonic() - start >= 0.25
+
+
+def test_retry_after_on_too_many_requests():
+    limiter = rate_limit(calls=100, period=60)
+    api = SimpleNamespace(rate_limit_key="token")
+    create_request(limiter, {"Retry-After": "1"}, status_code=429)(api)
+    assert limiter.quotas["token"].remaining == 0
+
+
+def test_quota_is_shared_per_token():
+    limiter = rate_limit(calls=100, period=60)
+    headers = {"RateLimit-Remaining": "0", "RateLimit-Reset": str(time.time() + 5)}
+    create_request(limiter, headers)(SimpleNamespace(rate_limit_key="token_a"))
+
+    start = time.monotonic()
+    create_request(limiter)(SimpleNamespace(rate_limit_key="token_b"))
+    assert time.monotonic() - start < 0.1
+
+
+def test_waiting_calls_are_served_in_arrival_order():
+    limiter = rate_limit(calls=1, period=0.05)
+    api = SimpleNamespace(rate_limit_key="token")
+    request = create_request(limiter)
+    order = []
+
+    def worker(index):
+        order.append((index, request(api)))
+
+    threads = []
+    for index in range(4):
+        threads.append(threading.Thread(target=worker, args=(index,)))
+        threads[-1].start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+
+    started = [index for index, _ in sorted(order, key=lambda item: item[1])]
+    assert started == [0, 1, 2, 3]
+
+
+def test_min_interval_between_calls():
+    request = create_request(rate_limit(calls=100, period=60, min_interval=0.1))
+    api = SimpleNamespace(rate_limit_key="token")
+    calls = [request(api) for _ in range(3)]
+    assert calls[1] - calls[0] >= 0.09
+    assert calls[2] - calls[1] >= 0.09
+
+
+def test_reserve_does_not_block():
+    limiter = rate_limit(calls=1, period=10)
+    assert limiter.reserve() == 0
+    start = time.monotonic()
+    assert limiter.reserve() > 9
+    assert time.monotonic() - start < 0.1
+    assert limiter.stats().queue_depth == 1
+
+
+def test_async_callers_wait_without_blocking():
+    limiter = rate_limit(calls=1, period=0.2)
+
+    @limiter
+    async def request():
+        return time.monotonic()
+
+    async def run():
+        return await asyncio.gather(request(), request(), asyncio.sleep(0, "idle"))
+
+    first, second, idle = asyncio.run(run())
+    assert second - first >= 0.15
+    assert idle == "idle"
+
+
+def test_stats_track_wait_time():
+    limiter = rate_limit(calls=1, period=0.1)
+    request = create_request(limiter)
+    api = SimpleNamespace(rate_limit_key="token")
+    request(api)
+    request(api)
+    stats = limiter.stats()
+    assert stats.calls == 2
+    assert stats.max_wait >= 0.05
+    assert stats.average_wait == stats.total_wait / 2
@@ -0,0 +1,99 @@
+import re
+import pytest
+from rx import just, throw, operators as ops
+from gsc.core import regex_search
+from gsc.core.local_search import LocalSearchEngine
+from gsc.core.regex_search import (
+    RegexVerifier,
+    find_matches,
+    prefilter_keyword,
+    required_literals,
+)
+
+
+class Hit:
+    def __init__(self, path: str, preview: str) -> None:
+        self.path = path
+        self.preview = preview
+
+
+def set_preview(hit: Hit, preview: str):
+    hit.preview = preview
+
+
+@pytest.mark.parametrize(
+    "pattern, literals, keyword",
+    [
+        (r"foo\.bar\(", ["foo.bar("], "foo"),
+        (r"(foo|bar)_baz", ["_baz"], "_baz"),
+        (r"api_?key\s*=\s*\w{32}", ["api", "key", "="], "api"),
+        (r"^import\s+requests$", ["import", "requests"], "requests"),
+        (r"(?:token){2,}x?", ["token"], "token"),
+        (r"\d+|x", [], None),
+        (r"a.b", ["a", "b"], None),
+    ],
+)
+def test_prefilter_keyword(pattern, literals, keyword):
+    assert required_literals(pattern) == literals
+    assert prefilter_keyword(pattern) == keyword
+
+
+def test_no_literal_without_parser(mocker):
+    # The parser of the re module is private, it may change.
+    mocker.patch.object(regex_search, "_parse", return_value=None)
+    assert required_literals(r"foo\.bar\(") == []
+    assert prefilter_keyword(r"foo\.bar\(") is None
+    with pytest.raises(re.error):
+        prefilter_keyword(r"foo(")
+
+
+def test_find_matches():
+    assert find_matches(r"^b\w+", ["abc", "a\nbcd", ""]) == [None, (2, 5), None]
+
+
+def verify(verifier: RegexVerifier, matches: list, contents: dict) -> list:
+    loaded = []
+
+    def load_content(hit: Hit):
+        loaded.append(hit.path)
+        if hit.path not in contents:
+            return throw(FileNotFoundError(hit.path))
+        return just(contents[hit.path])
+
+    found = verifier.verify(matches, load_content).pipe(ops.to_list()).run()
+    return [(pattern, hit.path) for pattern, hit in found], loaded
+
+
+@pytest.mark.parametrize("engine", [None, LocalSearchEngine(1)])
+def test_verify_preview_then_content(engine):
+    verifier = RegexVerifier(
+        [r"secret\d+", r"secret\s*="], lambda hit: [hit.preview], set_preview, engine
+    )
+    assert verifier.keywords() == ["secret"]
+
+    hits = [
+        Hit("a.py", "secret42\n"),
+        Hit("b.py", "# secret\n"),
+        Hit("c.py", "the secret\n"),
+        Hit("d.py", "secret\n"),
+    ]
+    contents = {
+        "b.py": "# secret\nx = 1\nsecret7 = 2\n",
+        "c.py": "the secret\n",
+    }
+    found, loaded = verify(verifier, [("secret", hit) for hit in hits], contents)
+
+    assert found == [
+        (r"secret\d+", "a.py"),
+        (r"secret\d+", "b.py"),
+    ]
+    # Each file is loaded once for the patterns its preview does not match.
+    assert sorted(loaded) == ["a.py", "b.py", "c.py", "d.py"]
+    assert hits[1].preview == "x = 1\nsecret7 = 2\n"
+    if engine:
+        engine.shutdown()
+
+
+def test_verify_without_matches():
+    verifier = RegexVerifier([r"foo\d"], lambda hit: [hit.preview], set_preview)
+    assert verify(verifier, [], {}) == ([], [])
@@ -0,0 +1,189 @@
+import pytest
+from requests import HTTPError
+from rx import operators as ops
+from gsc.core.async_task import AsyncEngine
+from gsc.core.base_model import BaseModel
+from gsc.core.connection_pool import ConnectionPool
+from gsc.core.progress import Progress
+from gsc.core.rate_limit import rate_limit
+from gsc.core.request_decorator import Api, get_request_pagination
+from gsc.core.retry import RetryLater, RetryPolicy, deferred_retries
+
+TOTAL_PAGES = 6
+
+
+class ItemResponse(BaseModel):
+    def __init__(self, **kwargs):
+        super().__init__()
+        # pylint: disable=C0103
+        self.id = kwargs.get("id")
+
+
+search_limiter = rate_limit(calls=100, period=60)
+search_progress = Progress()
+
+
+class ItemRequest(Api):
+    def __init__(
+        self, host: str, max_results: int = None, retry_policy: RetryPolicy = None
+    ) -> None:
+        super().__init__(
+            host,
+            {},
+            connection_pool=ConnectionPool(),
+            retry_policy=retry_policy,
+            max_results=max_results,
+        )
+
+    @get_request_pagination(path="items", response_model=ItemResponse)
+    def item_list(self, limit: int):
+        return None, {"page": 1, "per_page": limit}
+
+    @get_request_pagination(path="items", response_model=ItemResponse, prefetch=3)
+    def item_list_prefetch(self, limit: int):
+        return None, {"page": 1, "per_page": limit}
+
+    @get_request_pagination(
+        path="items",
+        response_model=ItemResponse,
+        rate_limiter=search_limiter,
+        progress=search_progress,
+        capped=True,
+    )
+    def item_search(self, limit: int):
+        return None, {"page": 1, "per_page": limit}
+
+    @get_request_pagination(
+        path="items", response_model=ItemResponse, stream=True, items_key="items"
+    )
+    def item_search_stream(self, limit: int):
+        return None, {"page": 1, "per_page": limit}
+
+
+def gitlab_route(failed_page: int = None):
+    def route(_, query, headers):
+        page = int(query["page"])
+        if page == failed_page:
+            return 500, {}, {}
+        response_headers = {"X-Total-Pages": str(TOTAL_PAGES)}
+        if page < TOTAL_PAGES:
+            link = f"http://{headers['Host']}/items?page={page + 1}&per_page=2"
+            response_headers["Link"] = f'<{link}>; rel="next"'
+        return 200, response_headers, [{"id": page * 10}, {"id": page * 10 + 1}]
+
+    return route
+
+
+def github_route(_, query, headers):
+    page = int(query["page"])
+    link = f"http://{headers['Host']}/items?page={TOTAL_PAGES}&per_page=2"
+    return (
+        200,
+        {"Link": f'<{link}>; rel="last"'},
+        [{"id": page * 10}, {"id": page * 10 + 1}],
+    )
+
+
+EXPECTED_IDS = [page * 10 + i for page in range(1, TOTAL_PAGES + 1) for i in (0, 1)]
+
+
+def test_pagination_follows_next_links(server):
+    server.route = gitlab_route()
+    items = list(ItemRequest(server.host).item_list(2))
+    assert [item.id for item in items] == EXPECTED_IDS
+
+
+@pytest.mark.parametrize("route", [gitlab_route(), github_route])
+def test_pagination_prefetch_keeps_page_order(server, route):
+    server.route = route
+    items = list(ItemRequest(server.host).item_list_prefetch(2))
+    assert [item.id for item in items] == EXPECTED_IDS
+    assert sorted(int(query["page"]) for _, query in server.requests) == list(
+        range(1, TOTAL_PAGES + 1)
+    )
+
+
+def test_pagination_prefetch_stops_on_failed_page(server):
+    server.route = gitlab_route(failed_page=3)
+    items = []
+    with pytest.raises(HTTPError):
+        for item in ItemRequest(server.host).item_list_prefetch(2):
+            items.append(item.id)
+    assert items == EXPECTED_IDS[:4]
+
+
+def test_search_pagination_is_rate_limited_per_page(server):
+    server.route = gitlab_route()
+    calls = search_limiter.stats().calls
+    items = list(ItemRequest(server.host).item_search(2))
+    assert [item.id for item in items] == EXPECTED_IDS
+    assert search_limiter.stats().calls - calls == TOTAL_PAGES
+
+
+def test_search_pagination_stops_at_max_results(server):
+    server.route = gitlab_route()
+    items = list(ItemRequest(server.host, max_results=5).item_search(2))
+    assert [item.id for item in items] == EXPECTED_IDS[:5]
+    assert len(server.requests) == 3
+
+
+def test_search_pagination_reports_progress(server):
+    def route(path, query, headers):
+        status, response_headers, body = gitlab_route()(path, query, headers)
+        return status, {**response_headers, "X-Total": str(TOTAL_PAGES * 2)}, body
+
+    server.route = route
+    search_progress.reset()
+    list(ItemRequest(server.host, max_results=8).item_search(2))
+    assert search_progress.total == 8
+    assert search_progress.done == 8
+    assert str(search_progress) == "8/8 results (100%)"
+
+
+def test_search_pagination_decodes_stream(server):
+    def route(path, query, headers):
+        status, response_headers, body = gitlab_route()(path, query, headers)
+        return status, response_headers, {"total_count": 12, "items": body}
+
+    server.route = route
+    items = ItemRequest(server.host).item_search_stream(2)
+    assert [item.id for item in items] == EXPECTED_IDS
+
+
+def test_pagination_sends_first_page_at_once(server):
+    server.route = gitlab_route()
+    items = ItemRequest(server.host).item_list(2)
+    assert len(server.requests) == 1
+    assert [item.id for item in items] == EXPECTED_IDS
+
+
+def test_throttled_first_page_is_deferred(server):
+    server.route = lambda *_: (429, {"Retry-After": "5"}, {})
+    request = ItemRequest(server.host, retry_policy=RetryPolicy(max_attempts=1))
+    with pytest.raises(RetryLater):
+        with deferred_retries():
+            request.item_search(2)
+
+
+def test_engine_waits_for_first_page_on_loop(server, mocker):
+    server.route = gitlab_route()
+    acquire_async = mocker.spy(search_limiter, "acquire_async")
+    calls = search_limiter.stats().calls
+    engine = AsyncEngine(concurrency=2)
+
+    # Same call as rx_task, the Api object is the first argument.
+    request = ItemRequest(server.host)
+    items = engine.submit(ItemRequest.item_search, request, 2).pipe(ops.to_list()).run()
+    assert [item.id for item in items] == EXPECTED_IDS
+    assert acquire_async.call_count == 1
+    # One reservation per page, the first one is not reserved twice.
+    assert search_limiter.stats().calls - calls == TOTAL_PAGES
+
+
+def test_interleaved_calls_keep_their_own_api(server):
+    server.route = gitlab_route()
+    capped = ItemRequest(server.host, max_results=3).item_search(2)
+    # A later call on another Api object must not change the first one.
+    uncapped = ItemRequest(server.host).item_search(2)
+    assert [item.id for item in capped] == EXPECTED_IDS[:3]
+    assert [item.id for item in uncapped] == EXPECTED_IDS
@@ -0,0 +1,63 @@
+# pylint: disable=redefined-outer-name
+import pytest
+from gsc.core import response_cache
+from gsc.core.base_model import BaseModel
+from gsc.core.connection_pool import ConnectionPool
+from gsc.core.request_decorator import Api, get_request_pagination
+from gsc.core.response_cache import ResponseCache
+
+ETAG = '"abc"'
+
+
+class ItemResponse(BaseModel):
+    def __init__(self, **kwargs):
+        super().__init__()
+        # pylint: disable=C0103
+        self.id = kwargs.get("id")
+
+
+class ItemRequest(Api):
+    def __init__(self, host: str, cache: ResponseCache) -> None:
+        super().__init__(
+            host, {}, connection_pool=ConnectionPool(), response_cache=cache
+        )
+
+    @get_request_pagination(path="items", response_model=ItemResponse, cacheable=True)
+    def item_list(self):
+        return None, {"page": 1}
+
+
+def route(_, __, headers):
+    if headers.get("If-None-Match") == ETAG:
+        return 304, {"ETag": ETAG}, b""
+    return 200, {"ETag": ETAG}, [{"id": 1}, {"id": 2}]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(mocker, tmp_path):
+    mocker.patch.object(response_cache, "CACHE_DIR", str(tmp_path))
+
+
+def test_fresh_entry_skips_request(server):
+    server.route = route
+    cache = ResponseCache("mock", "env", ttl=60)
+    assert [item.id for item in ItemRequest(server.host, cache).item_list()] == [1, 2]
+    assert [item.id for item in ItemRequest(server.host, cache).item_list()] == [1, 2]
+    assert len(server.requests) == 1
+
+
+def test_stale_entry_is_revalidated(server):
+    server.route = route
+    cache = ResponseCache("mock", "env", ttl=0)
+    assert [item.id for item in ItemRequest(server.host, cache).item_list()] == [1, 2]
+    assert [item.id for item in ItemRequest(server.host, cache).item_list()] == [1, 2]
+    assert len(server.requests) == 2
+
+
+def test_clear_removes_entries(server):
+    server.route = route
+    cache = ResponseCache("mock", "env", ttl=60)
+    list(ItemRequest(server.host, cache).item_list())
+    cache.clear()
+    list(ItemRequest(server.host, cache).item_list())
+    assert len(server.requests) == 2
@@ -0,0 +1,36 @@
+# pylint: disable=redefined-outer-name
+import pytest
+from gsc.core import response_cache, result_cache
+from gsc.core.result_cache import ResultCache
+
+ITEMS = [{"name": "file.py", "path": "src/file.py"}]
+
+
+@pytest.fixture
+def cache(mocker, tmp_path):
+    mocker.patch.object(response_cache, "CACHE_DIR", str(tmp_path))
+    mocker.patch.object(result_cache, "CACHE_DIR", str(tmp_path))
+    return ResultCache("mock", "env", "search")
+
+
+def test_get_returns_items_of_same_version(cache):
+    cache.put((1, "keyword"), "2023-01-01T00:00:00Z", ITEMS)
+    assert cache.get((1, "keyword"), "2023-01-01T00:00:00Z") == ITEMS
+    assert cache.get((1, "other"), "2023-01-01T00:00:00Z") is None
+
+
+def test_get_misses_when_version_changed(cache):
+    cache.put((1, "keyword"), "2023-01-01T00:00:00Z", ITEMS)
+    assert cache.get((1, "keyword"), "2023-02-01T00:00:00Z") is None
+
+
+@pytest.mark.parametrize("version", [None, ""])
+def test_unknown_version_is_not_cached(cache, version):
+    cache.put((1, "keyword"), version, ITEMS)
+    assert cache.get((1, "keyword"), version) is None
+
+
+def test_disabled_cache(cache):
+    cache.put((1, "keyword"), "v1", ITEMS)
+    cache.enabled = False
+    assert cache.get((1, "keyword"), "v1") is None
@@ -0,0 +1,164 @@
+import time
+import pytest
+import requests
+from requests import HTTPError
+from rx import operators as ops
+from gsc.core.async_task import AsyncEngine
+from gsc.core.base_model import BaseModel
+from gsc.core.connection_pool import ConnectionPool
+from gsc.core.request_decorator import Api, get_request
+from gsc.core.retry import (
+    RetryBudget,
+    RetryLater,
+    RetryPolicy,
+    RetryState,
+    deferred_retries,
+)
+
+
+class ItemResponse(BaseModel):
+    def __init__(self, **kwargs):
+        super().__init__()
+        # pylint: disable=C0103
+        self.id = kwargs.get("id")
+
+
+class ItemRequest(Api):
+    def __init__(self, host: str, policy: RetryPolicy) -> None:
+        super().__init__(
+            host, {}, connection_pool=ConnectionPool(), retry_policy=policy
+        )
+
+    @get_request(path="item", response_model=ItemResponse)
+    def item(self):
+        return None, None
+
+
+def create_response(status: int, headers: dict = None, text: str = ""):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    # pylint: disable=protected-access
+    response._content = text.encode()
+    return response
+
+
+def fast_policy(**kwargs):
+    return RetryPolicy(base_delay=0.01, max_delay=0.05, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "status, headers, text, expected",
+    [
+        (429, {}, "", True),
+        (503, {}, "", True),
+        (404, {}, "", False),
+        (403, {}, '{"message": "Forbidden"}', False),
+        (403, {"Retry-After": "10"}, "", True),
+        (403, {"X-RateLimit-Remaining": "0"}, "", True),
+        (403, {}, '{"message": "API rate limit exceeded"}', True),
+    ],
+)
+def test_is_retryable(status, headers, text, expected):
+    response = create_response(status, headers, text)
+    assert RetryPolicy.is_retryable(response) == expected
+
+
+def test_decorrelated_jitter_is_bounded():
+    policy = RetryPolicy(max_attempts=100, base_delay=1, max_delay=10)
+    response = create_response(503)
+    delay = policy.next_delay(response, RetryState(1, 2))
+    assert 1 <= delay <= 6
+    assert policy.next_delay(response, RetryState(1, 9)) <= 10
+
+
+def test_server_delay_above_max_delay_is_not_retried():
+    policy = RetryPolicy(max_delay=60)
+    response = create_response(429, {"Retry-After": "3600"})
+    assert policy.next_delay(response, RetryState()) is None
+
+
+@pytest.mark.parametrize(
+    "status, remaining, expected",
+    [(503, "4999", None), (429, "12", None), (403, "0", 1800)],
+)
+def test_reset_is_only_used_when_quota_exhausted(status, remaining, expected):
+    reset = str(int(time.time()) + 1800)
+    response = create_response(
+        status, {"X-RateLimit-Remaining": remaining, "X-RateLimit-Reset": reset}
+    )
+    delay = RetryPolicy.server_delay(response)
+    if expected is None:
+        assert delay is None
+    else:
+        assert expected - 5 < delay <= expected
+
+
+def test_transient_error_is_retried_despite_reset():
+    policy = RetryPolicy(max_delay=60)
+    reset = str(int(time.time()) + 3600)
+    response = create_response(
+        503, {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": reset}
+    )
+    assert policy.next_delay(response, RetryState()) <= 60
+
+
+def test_budget_limits_retries():
+    policy = RetryPolicy(budget=RetryBudget(ratio=0, reserve=2))
+    response = create_response(503)
+    assert policy.next_delay(response, RetryState()) is not None
+    assert policy.next_delay(response, RetryState()) is not None
+    assert policy.next_delay(response, RetryState()) is None
+    assert policy.stats().exhausted == 1
+
+
+def test_permanent_forbidden_fails_fast(server):
+    server.route = lambda *_: (403, {}, {"message": "403 Forbidden"})
+    with pytest.raises(HTTPError):
+        ItemRequest(server.host, fast_policy()).item()
+    assert len(server.requests) == 1
+
+
+def test_rate_limited_request_is_retried(server):
+    statuses = [429, 403, 200]
+
+    def route(*_):
+        status = statuses.pop(0)
+        return status, {"Retry-After": "0"} if status != 200 else {}, {"id": 1}
+
+    server.route = route
+    items = ItemRequest(server.host, fast_policy()).item()
+    assert [item.id for item in items] == [1]
+    assert len(server.requests) == 3
+
+
+def test_retries_stop_after_max_attempts(server):
+    server.route = lambda *_: (503, {}, {})
+    with pytest.raises(HTTPError):
+        ItemRequest(server.host, fast_policy(max_attempts=2)).item()
+    assert len(server.requests) == 3
+
+
+def test_deferred_retry_raises_instead_of_sleeping(server):
+    server.route = lambda *_: (429, {"Retry-After": "5"}, {})
+    with pytest.raises(RetryLater) as error:
+        with deferred_retries():
+            ItemRequest(server.host, RetryPolicy(max_attempts=1)).item()
+    assert error.value.delay == 5
+    assert error.value.state.attempt == 1
+
+
+def test_engine_reschedules_deferred_retry():
+    engine = AsyncEngine(concurrency=1)
+    states = []
+
+    def task():
+        with deferred_retries(None):
+            pass
+        states.append(len(states))
+        if len(states) < 3:
+            raise RetryLater(0.01, RetryState(len(states), 0.01))
+        return "done"
+
+    assert engine.submit(task).pipe(ops.to_list()).run() == ["done"]
+    assert states == [0, 1, 2]
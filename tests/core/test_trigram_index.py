@@ -0,0 +1,141 @@
+import os
+import subprocess
+import pytest
+from gsc.core.local_search import search_tree
+from gsc.core import trigram_index
+from gsc.core.trigram_index import (
+    INDEX_BUILT,
+    INDEX_CURRENT,
+    INDEX_FILE,
+    INDEX_UPDATED,
+    TrigramIndex,
+    refresh_index,
+    search_index,
+)
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=gsc", "-c", "user.email=gsc@localhost", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def commit(repo, files: dict):
+    for path, content in files.items():
+        (repo / path).parent.mkdir(parents=True, exist_ok=True)
+        (repo / path).write_bytes(content)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "update")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    commit(
+        repo,
+        {
+            "README.md": b"# Search Command\nSearch in GitLab\n",
+            "src/app.py": b"import requests\n\ndef search():\n    return None\n",
+            "src/util.py": b"def helper():\n    pass\n",
+            "logo.png": b"\x89PNG\0search",
+        },
+    )
+    return repo
+
+
+@pytest.mark.parametrize(
+    "keyword", ["search", "SEARCH", "def ", "import requests", "ab", "missing"]
+)
+def test_same_results_as_scan(repo, keyword):
+    git_dir = str(repo / ".git")
+    assert search_index(git_dir, keyword) == search_tree(git_dir, keyword)
+
+
+def test_index_rebuilt_when_head_moves(repo):
+    git_dir = str(repo / ".git")
+    index_path = os.path.join(git_dir, INDEX_FILE)
+    assert search_index(git_dir, "helper")[0]["path"] == "src/util.py"
+    built = os.stat(index_path).st_mtime_ns
+
+    search_index(git_dir, "helper")
+    assert os.stat(index_path).st_mtime_ns == built
+
+    commit(repo, {"src/new.py": b"helper()\n"})
+    paths = [item["path"] for item in search_index(git_dir, "helper")]
+    assert paths == ["src/new.py", "src/util.py"]
+    with TrigramIndex(index_path) as index:
+        assert index.file_count == 4
+        assert index.ref == "main"
+
+
+def test_update_reads_only_changed_files(repo, monkeypatch):
+    git_dir = str(repo / ".git")
+    for name in ("a", "b", "c", "d", "e", "f"):
+        commit(repo, {f"lib/{name}.py": f"def {name}():\n    pass\n".encode()})
+    assert refresh_index(git_dir) == INDEX_BUILT
+    assert refresh_index(git_dir) == INDEX_CURRENT
+
+    read_paths = []
+    read_blobs = trigram_index.read_blobs
+
+    def record(git_dir, blobs):
+        read_paths.extend(path for path, _ in blobs)
+        return read_blobs(git_dir, blobs)
+
+    monkeypatch.setattr(trigram_index, "read_blobs", record)
+    commit(repo, {"src/app.py": b"import json\n\ndef search():\n    pass\n"})
+    git(repo, "rm", "-q", "src/util.py")
+    commit(repo, {"lib/g.py": b"def helper():\n    search()\n"})
+    assert refresh_index(git_dir) == INDEX_UPDATED
+    assert sorted(read_paths) == ["lib/g.py", "src/app.py"]
+
+    for keyword in ("search", "helper", "import", "def", "pass\n", "x"):
+        assert search_index(git_dir, keyword) == search_tree(git_dir, keyword)
+
+
+def test_index_built_again_after_many_changes(repo):
+    git_dir = str(repo / ".git")
+    refresh_index(git_dir)
+    commit(repo, {"README.md": b"# Renamed\n", "src/app.py": b"pass\n"})
+    assert refresh_index(git_dir) == INDEX_BUILT
+    with TrigramIndex(os.path.join(git_dir, INDEX_FILE)) as index:
+        assert index.file_count == 3
+
+
+def test_candidates(repo):
+    git_dir = str(repo / ".git")
+    search_index(git_dir, "x")
+    with TrigramIndex(os.path.join(git_dir, INDEX_FILE)) as index:
+        # README.md, src/app.py, src/util.py
+        assert index.candidates(b"search") == [0, 1]
+        assert index.candidates(b"zzz") == []
+        assert index.candidates(b"se") == [0, 1, 2]
+
+
+def test_contents_are_read_from_the_blobs(repo):
+    git_dir = str(repo / ".git")
+    refresh_index(git_dir)
+    with open(os.path.join(git_dir, INDEX_FILE), "rb") as file:
+        assert b"def helper" not in file.read()
+    assert search_index(git_dir, "def helper")[0]["data"] == "def helper():\n    pass\n"
+
+
+def test_sha256_commit_is_stored_whole(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main", "--object-format=sha256")
+    commit(repo, {f"src/{name}.py": b"def search():\n    pass\n" for name in "abcde"})
+    git_dir = str(repo / ".git")
+    assert refresh_index(git_dir) == INDEX_BUILT
+    with TrigramIndex(os.path.join(git_dir, INDEX_FILE)) as index:
+        assert len(index.commit) == 64
+    assert refresh_index(git_dir) == INDEX_CURRENT
+
+    commit(repo, {"src/a.py": b"def search():\n    return 1\n"})
+    assert refresh_index(git_dir) == INDEX_UPDATED
+    assert search_index(git_dir, "return") == search_tree(git_dir, "return")
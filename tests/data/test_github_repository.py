@@ -0,0 +1,305 @@
+import threading
+import time
+from gsc.core import result_cache
+from rx import from_iterable, just, operators as ops
+from rx.subject import ReplaySubject, Subject
+from gsc.core.result_cache import ResultCache
+from gsc.data.repository.github_repository import (
+    GitHubSearchRepository,
+    collect_matches,
+    combine_keywords,
+    pack_qualifiers,
+    pack_repositories,
+    split_matches,
+)
+from gsc.data.response.github_response import file_response
+from gsc.domain.entities.github_model import Repository
+
+
+def create_repository(repo_id: int, owner: str = "user", owner_type: str = "User"):
+    return Repository(
+        id=repo_id,
+        name=f"repo-{repo_id}",
+        full_name=f"{owner}/repo-{repo_id}",
+        private=False,
+        archived=False,
+        html_url=f"https://github.com/{owner}/repo-{repo_id}",
+        fork=False,
+        forks_url="",
+        pushed_at="2023-01-15T10:00:00Z",
+        owner=owner,
+        owner_type=owner_type,
+    )
+
+
+def create_item(repo_id: int, path: str) -> dict:
+    return {"name": path, "path": path, "html_url": "", "repository": {"id": repo_id}}
+
+
+class FakeSearchRequest:
+    def __init__(self, items: list, server_limit: int = None) -> None:
+        self.items = items
+        self.queries = []
+        self.max_results = None
+        # Maximum number of items returned per query
+        self.server_limit = server_limit
+
+    def search_with_qualifiers(self, _, qualifiers: str, __):
+        self.queries.append(qualifiers)
+        scopes = [q.split(":")[1] for q in qualifiers.split(" ")]
+        items = [
+            item
+            for item in self.items
+            if item["owner"] in scopes or item["owner"].split("/")[0] in scopes
+        ]
+        items = items[: self.server_limit]
+        return from_iterable([file_response(**item) for item in items])
+
+    def file_content(self, _, path: str, __):
+        contents = {item["path"]: item.get("content", "") for item in self.items}
+        return just(contents[path])
+
+
+def search(method, repositories: list):
+    values = method(repositories, "keyword").pipe(ops.to_list()).run()
+    return {repo.id: [file.path for file in files] for repo, files in values}
+
+
+def test_pack_qualifiers_up_to_max_length():
+    qualifiers = ["repo:user/repo-1", "repo:user/repo-2", "repo:user/repo-3"]
+    queries = pack_qualifiers("keyword", qualifiers, 50)
+    assert queries == ["repo:user/repo-1 repo:user/repo-2", "repo:user/repo-3"]
+    assert all(len(f"keyword in:file {query}") <= 50 for query in queries)
+
+
+def test_packed_search_is_demultiplexed_by_repository():
+    repositories = [create_repository(1), create_repository(2), create_repository(3)]
+    items = [
+        {**create_item(1, "a.py"), "owner": "user/repo-1"},
+        {**create_item(1, "b.py"), "owner": "user/repo-1"},
+        {**create_item(3, "c.py"), "owner": "user/repo-3"},
+    ]
+    request = FakeSearchRequest(items)
+    repository = GitHubSearchRepository(request, ResultCache(enabled=False))
+
+    result = search(repository.search_in_repositories, repositories)
+    assert result == {1: ["a.py", "b.py"], 2: [], 3: ["c.py"]}
+    assert len(request.queries) == 1
+
+
+def test_owner_search_only_keeps_listed_repositories():
+    repositories = [create_repository(1), create_repository(2, "org", "Organization")]
+    items = [
+        {**create_item(1, "a.py"), "owner": "user"},
+        {**create_item(9, "z.py"), "owner": "user"},
+        {**create_item(2, "b.py"), "owner": "org"},
+    ]
+    request = FakeSearchRequest(items)
+    repository = GitHubSearchRepository(request, ResultCache(enabled=False))
+
+    result = search(repository.search_in_owners, repositories)
+    assert result == {1: ["a.py"], 2: ["b.py"]}
+    assert request.queries == ["org:org user:user"]
+
+
+def test_combine_keywords_with_or():
+    keywords = ["k1", "k2", "two words", "k3", "k4", "k5", "k6", "k7", "OR"]
+    assert combine_keywords(keywords) == [
+        ["two words"],
+        ["k1", "k2", "k3", "k4", "k5", "k6"],
+        ["OR"],
+        ["k7"],
+    ]
+
+
+def test_split_matches_by_fragment():
+    files = [
+        file_response(**create_item(1, "a.py"), text_matches=[{"fragment": "FOO"}]),
+        file_response(**create_item(1, "b.py"), text_matches=[{"fragment": "bar foo"}]),
+        file_response(**create_item(1, "c.py")),
+    ]
+    matches = [
+        (keyword, file.path) for keyword, file in split_matches(["foo", "bar"], files)
+    ]
+    assert matches == [
+        ("foo", "a.py"),
+        ("foo", "b.py"),
+        ("bar", "b.py"),
+    ]
+
+
+def test_packed_search_of_keywords_uses_one_query():
+    repositories = [create_repository(1), create_repository(2)]
+    items = [
+        {
+            **create_item(1, "a.py"),
+            "owner": "user/repo-1",
+            "text_matches": [{"fragment": "foo"}],
+        },
+        {
+            **create_item(2, "b.py"),
+            "owner": "user/repo-2",
+            "text_matches": [{"fragment": "bar"}],
+        },
+    ]
+    request = FakeSearchRequest(items)
+    repository = GitHubSearchRepository(request, ResultCache(enabled=False))
+
+    values = (
+        collect_matches(
+            repository.search_keywords_in_repositories(
+                from_iterable(repositories), ["foo", "bar"]
+            )
+        )
+        .pipe(ops.to_list())
+        .run()
+    )
+    result = {
+        repo.id: [(keyword, file.path) for keyword, file in matches]
+        for repo, matches in values
+    }
+    assert result == {1: [("foo", "a.py")], 2: [("bar", "b.py")]}
+    assert len(request.queries) == 1
+
+
+def test_packed_search_streams_files_as_pages_arrive():
+    repositories = Subject()
+    # Replayed, the query is subscribed on the pool scheduler.
+    pages = ReplaySubject()
+    request = FakeSearchRequest([])
+    request.search_with_qualifiers = lambda *_: pages
+    repository = GitHubSearchRepository(request, ResultCache(enabled=False))
+    values = []
+    done = threading.Event()
+    repository.search_keywords_in_repositories(repositories, ["keyword"]).subscribe(
+        values.append, on_completed=done.set
+    )
+
+    repositories.on_next(create_repository(1))
+    repositories.on_next(create_repository(2))
+    # The pack is searched once the repositories are listed.
+    repositories.on_completed()
+    pages.on_next(file_response(**create_item(2, "b.py")))
+    assert wait_for(lambda: values)
+    assert [(repo.id, match[1].path) for repo, match in values] == [(2, "b.py")]
+
+    pages.on_completed()
+    assert done.wait(5)
+    assert [(repo.id, match) for repo, match in values[1:]] == [(1, True), (2, True)]
+
+
+def wait_for(predicate, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_pack_repositories_up_to_max_length():
+    packs = (
+        from_iterable([create_repository(i) for i in range(1, 4)])
+        .pipe(pack_repositories("keyword", 50), ops.to_list())
+        .run()
+    )
+    assert [[repo.id for repo in pack] for pack in packs] == [[1, 2], [3]]
+
+
+def create_owned_item(repo_id: int, path: str) -> dict:
+    return {**create_item(repo_id, path), "owner": f"user/repo-{repo_id}"}
+
+
+def search_values(method, repositories: list) -> list:
+    values = method(from_iterable(repositories), ["keyword"]).pipe(ops.to_list()).run()
+    return [
+        (repo.id, value[1].path if isinstance(value, tuple) else value)
+        for repo, value in values
+    ]
+
+
+def test_packed_search_caps_results_per_repository():
+    repositories = [create_repository(1), create_repository(2)]
+    items = [
+        create_owned_item(1, "a.py"),
+        create_owned_item(1, "b.py"),
+        create_owned_item(2, "c.py"),
+    ]
+    request = FakeSearchRequest(items)
+    request.max_results = 1
+    repository = GitHubSearchRepository(request, ResultCache(enabled=False))
+
+    result = search(repository.search_in_repositories, repositories)
+    assert result == {1: ["a.py"], 2: ["c.py"]}
+    assert len(request.queries) == 1
+
+
+def test_truncated_packed_query_is_split(mocker):
+    mocker.patch("gsc.data.repository.github_repository.SEARCH_MAX_RESULTS", new=2)
+    repositories = [create_repository(1), create_repository(2)]
+    items = [
+        create_owned_item(1, "a.py"),
+        create_owned_item(1, "b.py"),
+        create_owned_item(2, "c.py"),
+    ]
+    request = FakeSearchRequest(items, server_limit=2)
+    repository = GitHubSearchRepository(request, ResultCache(enabled=False))
+
+    values = search_values(repository.search_keywords_in_repositories, repositories)
+    assert sorted(values, key=str) == sorted(
+        # The repository 1 alone still has too many results.
+        [(1, "a.py"), (1, "b.py"), (2, "c.py"), (1, False), (2, True)],
+        key=str,
+    )
+    assert request.queries == [
+        "repo:user/repo-1 repo:user/repo-2",
+        "repo:user/repo-1",
+        "repo:user/repo-2",
+    ]
+
+
+def test_truncated_owner_query_falls_back_to_repositories(mocker):
+    mocker.patch("gsc.data.repository.github_repository.SEARCH_MAX_RESULTS", new=2)
+    repositories = [create_repository(1), create_repository(2)]
+    items = [create_owned_item(1, "a.py"), create_owned_item(2, "b.py")]
+    request = FakeSearchRequest(items, server_limit=2)
+    repository = GitHubSearchRepository(request, ResultCache(enabled=False))
+
+    values = search_values(repository.search_keywords_in_owners, repositories)
+    # The files without fragment are split by content, in any order.
+    assert sorted(values[:2]) == [(1, "a.py"), (2, "b.py")]
+    assert values[2:] == [(1, True), (2, True)]
+    assert request.queries == [
+        "user:user",
+        "repo:user/repo-1 repo:user/repo-2",
+        "repo:user/repo-1",
+        "repo:user/repo-2",
+    ]
+
+
+def test_files_without_fragment_are_split_by_content(mocker, tmp_path):
+    mocker.patch.object(result_cache, "CACHE_DIR", str(tmp_path))
+    cache = ResultCache("mock", "env", "search")
+    repositories = [create_repository(1)]
+    items = [
+        {**create_owned_item(1, "a.py"), "text_matches": [{"fragment": "foo"}]},
+        {**create_owned_item(1, "b.py"), "content": "x = BAR\n"},
+        # Found by the server for a normalized token only
+        {**create_owned_item(1, "c.py"), "content": "x = 1\n"},
+    ]
+    repository = GitHubSearchRepository(FakeSearchRequest(items), cache)
+
+    matches = (
+        collect_matches(
+            repository.search_keywords_in_repositories(
+                from_iterable(repositories), ["foo", "bar"]
+            )
+        )
+        .pipe(ops.to_list())
+        .run()
+    )
+    assert sorted((keyword, file.path) for keyword, file in matches[0][1]) == [
+        ("bar", "b.py"),
+        ("foo", "a.py"),
+        ("foo OR bar", "c.py"),
+    ]
+    # The file tagged with the whole query is not split, nothing is cached.
+    assert cache.get(("user/repo-1", "foo"), repositories[0].pushed_at) is None
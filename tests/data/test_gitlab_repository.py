@@ -0,0 +1,120 @@
+# pylint: disable=redefined-outer-name
+import pytest
+from rx import from_iterable, operators as ops
+from gsc.constants import GitLabConstant
+from gsc.core import result_cache
+from gsc.core.result_cache import ResultCache
+from gsc.data.repository.gitlab_repository import GitLabSearchRepository
+from gsc.data.response.gitlab_response import file_response
+from gsc.domain.entities.gitlab_model import Project
+
+VERSION = "2023-01-15T10:00:00Z"
+
+
+def create_item(project_id: int, path: str) -> dict:
+    return {"project_id": project_id, "path": path, "basename": path, "ref": "main"}
+
+
+def create_project(project_id: int) -> Project:
+    return Project(
+        id=project_id,
+        name=f"project-{project_id}",
+        archived=False,
+        url=f"https://gitlab.com/group/project-{project_id}",
+        last_activity_at=VERSION,
+    )
+
+
+class FakeSearchRequest:
+    def __init__(self, items: list, max_results: int = None) -> None:
+        self.items = items
+        self.max_results = max_results
+        self.calls = 0
+
+    def search_in_project(self, project_id: int, *_):
+        self.calls += 1
+        items = [item for item in self.items if item["project_id"] == project_id]
+        if self.max_results is not None:
+            items = items[: self.max_results]
+        return from_iterable([file_response(**item) for item in items])
+
+    def search_in_group(self, *_):
+        # Not capped by the request
+        return from_iterable([file_response(**item) for item in self.items])
+
+    def search_in_instance(self, *_):
+        def items():
+            for item in self.items:
+                self.instance_items += 1
+                yield file_response(**item)
+
+        self.instance_items = 0
+        return from_iterable(items())
+
+
+@pytest.fixture
+def cache(mocker, tmp_path):
+    mocker.patch.object(result_cache, "CACHE_DIR", str(tmp_path))
+    return ResultCache("mock", "env", "search")
+
+
+def search_twice(repository: GitLabSearchRepository) -> list:
+    for _ in range(2):
+        files = repository.search(1, "keyword", VERSION).pipe(ops.to_list()).run()
+    return [file.path for file in files]
+
+
+def test_complete_result_is_cached(cache):
+    request = FakeSearchRequest([create_item(1, "a.py"), create_item(1, "b.py")])
+    assert search_twice(GitLabSearchRepository(request, cache)) == ["a.py", "b.py"]
+    assert request.calls == 1
+
+
+def test_truncated_result_is_not_cached(cache):
+    items = [create_item(1, "a.py"), create_item(1, "b.py"), create_item(1, "c.py")]
+    request = FakeSearchRequest(items, max_results=2)
+    assert search_twice(GitLabSearchRepository(request, cache)) == ["a.py", "b.py"]
+    assert request.calls == 2
+
+
+def test_group_search_is_capped_per_project():
+    items = [
+        create_item(project_id, f"{name}.py") for name in "abc" for project_id in (1, 2)
+    ]
+    request = FakeSearchRequest(items, max_results=2)
+    repository = GitLabSearchRepository(request)
+
+    files = repository.search_in_group("group", "keyword").pipe(ops.to_list()).run()
+    assert [(file.project_id, file.path) for file in files] == [
+        (1, "a.py"),
+        (2, "a.py"),
+        (1, "b.py"),
+        (2, "b.py"),
+    ]
+
+
+def test_instance_search_is_bounded_by_the_listed_projects(mocker):
+    mocker.patch.object(GitLabConstant, "SEARCH_API_LIMIT", new=2)
+    # Most files of the instance are in projects which are not listed
+    items = [create_item(9, f"{number}.py") for number in range(10)]
+    items.insert(5, create_item(1, "a.py"))
+    request = FakeSearchRequest(items)
+    repository = GitLabSearchRepository(request)
+    projects = [create_project(1)]
+
+    files = repository.search_in_instance("keyword", projects).pipe(ops.to_list())
+    assert [(file.project_id, file.path) for file in files.run()] == [(1, "a.py")]
+    # One page of the instance search, then the search of the project
+    assert request.instance_items == 2
+    assert request.calls == 1
+
+
+def test_instance_search_within_the_pages_is_not_searched_again():
+    items = [create_item(9, "z.py"), create_item(1, "a.py")]
+    request = FakeSearchRequest(items)
+    repository = GitLabSearchRepository(request)
+    projects = [create_project(1)]
+
+    files = repository.search_in_instance("keyword", projects).pipe(ops.to_list())
+    assert [(file.project_id, file.path) for file in files.run()] == [(1, "a.py")]
+    assert request.calls == 0
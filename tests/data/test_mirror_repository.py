@@ -0,0 +1,167 @@
+import os
+import subprocess
+import pytest
+from rx import just, operators as ops
+from gsc.core.git_mirror import (
+    MIRROR_CLONED,
+    MIRROR_FETCHED,
+    MIRROR_UNCHANGED,
+    MirrorStore,
+)
+from gsc.core.local_search import local_search_engine
+from gsc.core.trigram_index import INDEX_BUILT, INDEX_CURRENT, INDEX_UPDATED
+from gsc.data.repository.github_repository import GitHubMirrorSearchRepository
+from gsc.data.repository.gitlab_repository import GitLabMirrorSearchRepository
+from gsc.domain.entities.github_model import Repository
+from gsc.domain.entities.gitlab_model import Project
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=gsc", "-c", "user.email=gsc@localhost", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture(scope="module", autouse=True)
+def engine():
+    yield local_search_engine
+    local_search_engine.shutdown()
+
+
+@pytest.fixture
+def remote_url(tmp_path):
+    repo = tmp_path / "work"
+    (repo / "src").mkdir(parents=True)
+    (repo / "src" / "search.py").write_text("def find_keyword():\n    pass\n")
+    (repo / "README.md").write_text("# Project\n")
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "init")
+    git(tmp_path, "clone", "-q", "--bare", str(repo), str(tmp_path / "project.git"))
+    return str(tmp_path / "project")
+
+
+@pytest.fixture
+def work_dir(remote_url):
+    return os.path.join(os.path.dirname(remote_url), "work")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MirrorStore("test", "env", root_dir=str(tmp_path / "mirrors"))
+
+
+class FakeProjectRequest:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.calls = 0
+
+    def project_info(self, project_id: int):
+        self.calls += 1
+        return just(
+            Project(id=project_id, name="project", archived=False, url=self.url)
+        )
+
+
+class FakeRepositoryRequest:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+    def get_repository_info(self, _):
+        return just(create_repository(self.url))
+
+
+def create_repository(url: str) -> Repository:
+    return Repository(
+        id=7,
+        name="project",
+        full_name="user/project",
+        private=False,
+        archived=False,
+        html_url=url,
+        fork=False,
+        forks_url="",
+        pushed_at="2023-01-15T10:00:00Z",
+    )
+
+
+def test_gitlab_mirror_search(remote_url, store):
+    request = FakeProjectRequest(remote_url)
+    repo = GitLabMirrorSearchRepository(request, store)
+
+    files = repo.search(42, "KEYWORD", "v1").pipe(ops.to_list()).run()
+    assert [(file.path, file.ref, file.project_id) for file in files] == [
+        ("src/search.py", "main", 42)
+    ]
+    assert files[0].data_preview == "def find_keyword():\n    pass\n"
+
+    # The clone url is only requested to clone the mirror
+    repo.search(42, "keyword", "v1").pipe(ops.to_list()).run()
+    assert request.calls == 1
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_gitlab_mirror_search_keywords(remote_url, store, indexed):
+    repo = GitLabMirrorSearchRepository(FakeProjectRequest(remote_url), store, indexed)
+
+    matches = (
+        repo.search_keywords(42, ["keyword", "project", "missing"], "v1")
+        .pipe(ops.to_list())
+        .run()
+    )
+    assert sorted((keyword, file.path) for keyword, file in matches) == [
+        ("keyword", "src/search.py"),
+        ("project", "README.md"),
+    ]
+
+
+def test_github_mirror_search(remote_url, store):
+    repo = GitHubMirrorSearchRepository(FakeRepositoryRequest(remote_url), store)
+
+    files = repo.search("user/project", "keyword").pipe(ops.to_list()).run()
+    assert [file.html_url for file in files] == [
+        f"{remote_url}/blob/main/src/search.py"
+    ]
+
+    repository = create_repository(remote_url)
+    result = repo.search_in_repositories([repository], "project").run()
+    assert result[0] is repository
+    assert [(file.path, file.repository_id) for file in result[1]] == [("README.md", 7)]
+
+
+def test_gitlab_mirror_sync(remote_url, work_dir, store):
+    repo = GitLabMirrorSearchRepository(None, store, indexed=True)
+    project = Project(
+        id=42,
+        name="project",
+        archived=False,
+        url=remote_url,
+        last_activity_at="v1",
+    )
+    assert repo.sync(project).run() == (MIRROR_CLONED, INDEX_BUILT)
+    assert repo.sync(project).run() == (MIRROR_UNCHANGED, INDEX_CURRENT)
+
+    with open(f"{work_dir}/src/new.py", "w", encoding="utf-8") as file:
+        file.write("new_keyword = 1\n")
+    git(work_dir, "add", "-A")
+    git(work_dir, "commit", "-q", "-m", "new")
+    git(work_dir, "push", "-q", f"{remote_url}.git", "main")
+    project.last_activity_at = "v2"
+    assert repo.sync(project).run() == (MIRROR_FETCHED, INDEX_UPDATED)
+
+    files = repo.search(42, "new_keyword", "v2").pipe(ops.to_list()).run()
+    assert [file.path for file in files] == ["src/new.py"]
+
+
+def test_mirror_file_content(remote_url, store):
+    gitlab_repo = GitLabMirrorSearchRepository(FakeProjectRequest(remote_url), store)
+    file = gitlab_repo.search(42, "keyword", "v1").run()
+    assert gitlab_repo.file_content(42, file).run() == "def find_keyword():\n    pass\n"
+
+    github_repo = GitHubMirrorSearchRepository(FakeRepositoryRequest(remote_url), store)
+    file = github_repo.search("user/project", "project").run()
+    assert file.fragments == ("# Project\n",)
+    assert github_repo.file_content("user/project", file).run() == "# Project\n"
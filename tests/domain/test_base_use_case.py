@@ -0,0 +1,41 @@
+from rx import from_iterable, operators as ops
+from rx.subject import Subject
+from gsc.domain.entities.gitlab_model import Project
+from gsc.domain.entities.search_event import FileEvent, ProjectSummaryEvent
+from gsc.domain.use_cases.base_use_case import one_project_at_a_time, stream_files
+
+
+def create_project(project_id: int) -> Project:
+    return Project(id=project_id, name=f"project-{project_id}", archived=False, url="")
+
+
+def describe(event) -> str:
+    if isinstance(event, FileEvent):
+        return f"{event.project.id}:{event.file}"
+    return f"{event.project.id}:done({event.file_count})"
+
+
+def test_stream_files_ends_with_summary():
+    project = create_project(1)
+    events = stream_files(project, from_iterable(["a", "b"])).pipe(ops.to_list()).run()
+    assert [describe(event) for event in events] == ["1:a", "1:b", "1:done(2)"]
+
+
+def test_events_of_a_project_are_kept_together():
+    first, second = create_project(1), create_project(2)
+    source = Subject()
+    emitted = []
+    source.pipe(one_project_at_a_time()).subscribe(
+        lambda event: emitted.append(describe(event))
+    )
+
+    source.on_next(FileEvent(first, "a"))
+    source.on_next(FileEvent(second, "x"))
+    # First project is streamed, second one is buffered
+    assert emitted == ["1:a"]
+
+    source.on_next(FileEvent(first, "b"))
+    source.on_next(ProjectSummaryEvent(second, 1))
+    source.on_next(ProjectSummaryEvent(first, 2))
+    assert emitted == ["1:a", "1:b", "1:done(2)", "2:x", "2:done(1)"]
+    source.on_completed()
@@ -0,0 +1,108 @@
+from rx import from_iterable, operators as ops
+from rx.subject import Subject
+from gsc.domain.entities.github_model import File, Repository
+from gsc.domain.entities.search_event import FileEvent, ProjectSummaryEvent
+from gsc.domain.use_cases.github_search_use_case import GitHubSearchMultiRepoUseCase
+
+
+def create_repository(repo_id: int) -> Repository:
+    return Repository(
+        id=repo_id,
+        name=f"repo-{repo_id}",
+        full_name=f"user/repo-{repo_id}",
+        private=False,
+        archived=False,
+        html_url=f"https://github.com/user/repo-{repo_id}",
+        fork=False,
+        forks_url="",
+    )
+
+
+def create_file(repo_id: int, path: str) -> File:
+    return File(path, path, "", repo_id)
+
+
+class FakeRepoRepository:
+    def __init__(self, repositories: list) -> None:
+        self.repositories = repositories
+
+    def get_repository_list(self, *_):
+        return from_iterable(self.repositories)
+
+
+class FakeSearchRepository:
+    def __init__(self, values) -> None:
+        self.values = values
+
+    def search_keywords_in_repositories(self, *_):
+        return self.values
+
+    search_keywords_in_owners = search_keywords_in_repositories
+
+
+def test_packed_search_streams_files_as_found():
+    repositories = [create_repository(1), create_repository(2)]
+    values = Subject()
+    use_case = GitHubSearchMultiRepoUseCase(
+        FakeRepoRepository(repositories), FakeSearchRepository(values)
+    )
+    events = []
+    use_case.on_searching().subscribe(events.append)
+    use_case.search("keyword")
+
+    values.on_next((repositories[0], ("keyword", create_file(1, "a.py"))))
+    # Emitted before the next pages of the search
+    assert [event.file.path for event in events] == ["a.py"]
+
+    values.on_next((repositories[0], True))
+    values.on_next((repositories[1], True))
+    values.on_completed()
+    summaries = [
+        (event.project.id, event.file_count)
+        for event in events
+        if isinstance(event, ProjectSummaryEvent)
+    ]
+    assert summaries == [(1, 1), (2, 0)]
+
+
+def test_packed_search_is_regrouped_by_repository():
+    repositories = [create_repository(1), create_repository(2)]
+    values = from_iterable(
+        [
+            (repositories[1], ("keyword", create_file(2, "b.py"))),
+            (repositories[0], ("keyword", create_file(1, "a.py"))),
+            (repositories[1], ("keyword", create_file(2, "c.py"))),
+            (repositories[1], True),
+            (repositories[0], True),
+        ]
+    )
+    use_case = GitHubSearchMultiRepoUseCase(
+        FakeRepoRepository(repositories), FakeSearchRepository(values)
+    )
+    result = use_case.on_searching().pipe(ops.to_list())
+    use_case.search("keyword", search_mode="owner")
+
+    files = [
+        (event.project.id, event.file.path)
+        for event in result.run()
+        if isinstance(event, FileEvent)
+    ]
+    assert files == [(2, "b.py"), (2, "c.py"), (1, "a.py")]
+
+
+def test_incomplete_repository_is_reported():
+    repositories = [create_repository(1)]
+    values = from_iterable(
+        [
+            (repositories[0], ("keyword", create_file(1, "a.py"))),
+            (repositories[0], False),
+        ]
+    )
+    use_case = GitHubSearchMultiRepoUseCase(
+        FakeRepoRepository(repositories), FakeSearchRepository(values)
+    )
+    result = use_case.on_searching().pipe(ops.to_list())
+    use_case.search("keyword")
+
+    summary = result.run()[-1]
+    assert (summary.file_count, summary.incomplete) == (1, True)
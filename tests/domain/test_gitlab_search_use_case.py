@@ -0,0 +1,217 @@
+from rx import from_iterable, just, merge, operators as ops
+from rx.subject import Subject
+from gsc.domain.entities.gitlab_model import File, Project
+from gsc.domain.entities.search_event import FileEvent
+from gsc.domain.use_cases.gitlab_search_use_case import GitLabSearchGroupUseCase
+
+
+def create_project(project_id: int) -> Project:
+    return Project(
+        id=project_id,
+        name=f"group / project-{project_id}",
+        archived=False,
+        url=f"https://gitlab.com/group/project-{project_id}",
+    )
+
+
+def create_file(path: str, data_preview: str = "") -> File:
+    return File(name=path, path=path, ref="main", data_preview=data_preview)
+
+
+class FakeProjectRepository:
+    def __init__(self, projects: list) -> None:
+        self.projects = projects
+
+    def project_list(self, *_):
+        return from_iterable(self.projects)
+
+    def own_project_list(self, *_):
+        return from_iterable(self.projects)
+
+
+class FakeSearchRepository:
+    scoped_search = True
+
+    def __init__(self, files_by_project: dict) -> None:
+        self.files_by_project = files_by_project
+        self.searched_projects = []
+
+    def search_in_group(self, *_):
+        return scoped_files(self.files_by_project)
+
+    def search_in_instance(self, *_):
+        return scoped_files(self.files_by_project)
+
+    def search(self, project_id: int, *_):
+        self.searched_projects.append(project_id)
+        return from_iterable([create_file(f"{project_id}.py")])
+
+    def search_keywords(self, project_id: int, keywords: list, *_):
+        return merge(
+            *[
+                self.search(project_id, keyword).pipe(
+                    ops.map(lambda file, keyword=keyword: (keyword, file))
+                )
+                for keyword in keywords
+            ]
+        )
+
+
+class FakeKeywordSearchRepository(FakeSearchRepository):
+    def __init__(self, files_by_keyword: dict) -> None:
+        super().__init__(None)
+        self.files_by_keyword = files_by_keyword
+        self.searched_keywords = []
+
+    def search_in_group(self, _, keyword: str):
+        self.searched_keywords.append(keyword)
+        return scoped_files(self.files_by_keyword[keyword])
+
+
+def scoped_files(files_by_project: dict):
+    if files_by_project is None:
+        # Not supported by the server
+        return just(None)
+    for project_id, files in files_by_project.items():
+        for file in files:
+            file.project_id = project_id
+    return from_iterable(
+        [file for files in files_by_project.values() for file in files]
+    )
+
+
+def search(use_case: GitLabSearchGroupUseCase, group_name: str, keyword="keyword"):
+    result = use_case.on_searching().pipe(ops.to_list())
+    use_case.search(group_name, keyword)
+    files = {}
+    for event in result.run():
+        paths = files.setdefault(event.project.id, [])
+        if isinstance(event, FileEvent):
+            paths.append(event.file.path)
+        else:
+            assert event.file_count == len(paths)
+    return files
+
+
+def test_group_search_is_regrouped_by_project():
+    projects = [create_project(1), create_project(2)]
+    search_repo = FakeSearchRepository({1: [create_file("a.py"), create_file("b.py")]})
+    use_case = GitLabSearchGroupUseCase(FakeProjectRepository(projects), search_repo)
+
+    assert search(use_case, "group") == {1: ["a.py", "b.py"], 2: []}
+    assert search_repo.searched_projects == []
+
+
+def test_group_search_streams_files_as_found():
+    search_repo = FakeSearchRepository(None)
+    files = Subject()
+    search_repo.search_in_group = lambda *_: files
+    use_case = GitLabSearchGroupUseCase(
+        FakeProjectRepository([create_project(1)]), search_repo
+    )
+    events = []
+    use_case.on_searching().subscribe(events.append)
+    use_case.search("group", "keyword")
+
+    file = create_file("a.py")
+    file.project_id = 1
+    files.on_next(file)
+    # Emitted before the next pages of the search
+    assert [event.file.path for event in events] == ["a.py"]
+
+    files.on_completed()
+    assert events[-1].file_count == 1
+
+
+def test_instance_search_only_keeps_listed_projects():
+    search_repo = FakeSearchRepository(
+        {1: [create_file("a.py")], 3: [create_file("c.py")]}
+    )
+    use_case = GitLabSearchGroupUseCase(
+        FakeProjectRepository([create_project(1)]), search_repo
+    )
+
+    assert search(use_case, None) == {1: ["a.py"]}
+
+
+def test_fallback_to_search_per_project():
+    projects = [create_project(1), create_project(2)]
+    search_repo = FakeSearchRepository(None)
+    use_case = GitLabSearchGroupUseCase(FakeProjectRepository(projects), search_repo)
+
+    assert search(use_case, "group") == {1: ["1.py"], 2: ["2.py"]}
+    assert sorted(search_repo.searched_projects) == [1, 2]
+
+
+def test_mirrors_are_searched_per_project():
+    projects = [create_project(1), create_project(2)]
+    search_repo = FakeSearchRepository({1: [create_file("a.py")]})
+    search_repo.scoped_search = False
+    search_repo.search_in_group = None
+    use_case = GitLabSearchGroupUseCase(FakeProjectRepository(projects), search_repo)
+
+    assert search(use_case, "group") == {1: ["1.py"], 2: ["2.py"]}
+    assert sorted(search_repo.searched_projects) == [1, 2]
+
+
+def test_keywords_share_the_project_list():
+    projects = [create_project(1), create_project(2)]
+    search_repo = FakeKeywordSearchRepository(
+        {"foo": {1: [create_file("a.py")]}, "bar": {1: [create_file("b.py")]}}
+    )
+    use_case = GitLabSearchGroupUseCase(FakeProjectRepository(projects), search_repo)
+
+    result = use_case.on_searching().pipe(ops.to_list())
+    use_case.search("group", ["foo", "bar"])
+    files = [
+        (event.keyword, event.file.path)
+        for event in result.run()
+        if isinstance(event, FileEvent)
+    ]
+
+    assert files == [("foo", "a.py"), ("bar", "b.py")]
+    assert search_repo.searched_keywords == ["foo", "bar"]
+    assert search_repo.searched_projects == []
+
+
+def test_keywords_fallback_to_search_per_project():
+    projects = [create_project(1)]
+    search_repo = FakeSearchRepository(None)
+    use_case = GitLabSearchGroupUseCase(FakeProjectRepository(projects), search_repo)
+
+    assert search(use_case, "group", ["foo", "bar"]) == {1: ["1.py", "1.py"]}
+    assert search_repo.searched_projects == [1, 1]
+
+
+def test_regex_search_is_verified():
+    projects = [create_project(1)]
+    search_repo = FakeKeywordSearchRepository(
+        {
+            "token": {
+                1: [
+                    create_file("a.py", "token = 1\n"),
+                    create_file("b.py", "# token\n"),
+                    create_file("c.py", "tokens\n"),
+                ]
+            }
+        }
+    )
+    contents = {"b.py": "# token\n\ntoken = 2\n", "c.py": "tokens\n"}
+    search_repo.file_content = lambda _, file: just(contents[file.path])
+    use_case = GitLabSearchGroupUseCase(FakeProjectRepository(projects), search_repo)
+
+    result = use_case.on_searching().pipe(ops.to_list())
+    use_case.search("group", [r"token\s*=\s*\d"], regex=True)
+    events = result.run()
+    files = [
+        (event.keyword, event.file.path, event.file.data_preview)
+        for event in events
+        if isinstance(event, FileEvent)
+    ]
+
+    assert search_repo.searched_keywords == ["token"]
+    assert files == [
+        (r"token\s*=\s*\d", "a.py", "token = 1\n"),
+        (r"token\s*=\s*\d", "b.py", "\ntoken = 2\n"),
+    ]
+    assert events[-1].file_count == 2
@@ -0,0 +1,52 @@
+from rx import from_iterable, just, throw, operators as ops
+from gsc.domain.entities.gitlab_model import Project, ProjectFilter
+from gsc.domain.use_cases.gitlab_sync_use_case import GitLabSyncGroupUseCase
+
+
+def create_project(project_id: int, archived=False) -> Project:
+    return Project(
+        id=project_id,
+        name=f"group / project-{project_id}",
+        archived=archived,
+        url=f"https://gitlab.com/group/project-{project_id}",
+        last_activity_at="2023-01-15T10:00:00Z",
+    )
+
+
+class FakeProjectRepository:
+    def __init__(self, projects: list) -> None:
+        self.projects = projects
+
+    def project_list(self, *_):
+        return from_iterable(self.projects)
+
+    def own_project_list(self, *_):
+        return from_iterable(self.projects)
+
+
+class FakeMirrorRepository:
+    def __init__(self) -> None:
+        self.synced_projects = []
+
+    def sync(self, project: Project):
+        self.synced_projects.append(project.id)
+        if project.id == 2:
+            return throw(Exception("Repository not found"))
+        return just(("fetched", None))
+
+
+def test_sync_group_continues_after_a_failed_project():
+    projects = [create_project(1), create_project(2), create_project(3, True)]
+    mirror_repo = FakeMirrorRepository()
+    use_case = GitLabSyncGroupUseCase(FakeProjectRepository(projects), mirror_repo)
+
+    result = use_case.on_syncing().pipe(ops.to_list())
+    use_case.sync("group", project_filter=ProjectFilter(exclude_archived=True))
+    events = result.run()
+
+    assert mirror_repo.synced_projects == [1, 2]
+    assert [(event.project.id, event.status) for event in events] == [
+        (1, "fetched"),
+        (2, None),
+    ]
+    assert str(events[1].error) == "Repository not found"
@@ -0,0 +1,57 @@
+from datetime import datetime
+import pytest
+from gsc.domain.entities.gitlab_model import Project, ProjectFilter
+
+
+def create_project(**kwargs):
+    return Project(
+        id=1,
+        name="group / project",
+        archived=kwargs.get("archived", False),
+        url="https://gitlab.com/group/project",
+        last_activity_at=kwargs.get("last_activity_at", "2023-01-15T10:00:00.000Z"),
+        empty_repo=kwargs.get("empty_repo", False),
+        repository_size=kwargs.get("repository_size", 1024),
+    )
+
+
+def test_default_filter_accepts_all():
+    project_filter = ProjectFilter()
+    assert project_filter.accept(create_project(archived=True, empty_repo=True))
+
+
+@pytest.mark.parametrize(
+    "project, accepted",
+    [
+        (create_project(), True),
+        (create_project(archived=True), False),
+    ],
+)
+def test_exclude_archived(project, accepted):
+    assert ProjectFilter(exclude_archived=True).accept(project) == accepted
+
+
+@pytest.mark.parametrize(
+    "project, accepted",
+    [
+        (create_project(), True),
+        (create_project(empty_repo=True), False),
+        (create_project(repository_size=0), False),
+        (create_project(empty_repo=None, repository_size=None), True),
+    ],
+)
+def test_exclude_empty(project, accepted):
+    assert ProjectFilter(exclude_empty=True).accept(project) == accepted
+
+
+@pytest.mark.parametrize(
+    "project, accepted",
+    [
+        (create_project(last_activity_at="2023-01-15T10:00:00.000Z"), True),
+        (create_project(last_activity_at="2022-12-31T23:59:59.000Z"), False),
+        (create_project(last_activity_at=None), True),
+    ],
+)
+def test_active_since(project, accepted):
+    project_filter = ProjectFilter(active_since=datetime(2023, 1, 1))
+    assert project_filter.accept(project) == accepted
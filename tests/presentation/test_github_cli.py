@@ -76,6 +76,20 @@ def test_github_search_help(runner, arguments):
         "Export the search result to markdown file with extension .md or .markdown.",
         "-d, --debug",
         "Enable debug logging of HTTP request.",
+        "--page-size <int>",
+        "Number of items per page when listing, default is the environment setting or 100.",
+        "--no-cache",
+        "Do not use the cached project list and search results, always request the server.",
+        "--clear-cache",
+        "Clear the cached project list and search results of the environment before searching.",
+        "--concurrency <int>",
+        "--max-results <int>",
+        "Maximum number of search results per repository, the next pages of a repository search are not requested.",
+        "Run the requests on the asyncio engine with up to <int> requests in flight, also the number of mirrors fetched at the same time.",
+        "--jobs <int>",
+        "Number of processes searching the mirrors and checking the regular expressions, default is the number of CPUs.",
+        "--search-mode [packed|owner|repo]",
+        "How to query all repositories : pack many repositories per query, one query per owner or one query per repository.",
     ]
     result = runner.invoke(cli.app, arguments, terminal_width=500)
     assert result.exit_code == 0
@@ -219,3 +233,64 @@ def test_github_search_w_keyword_w_output_valid_value(mocker, runner, arguments)
     result = runner.invoke(github_cli.search, arguments)
     assert result.exit_code == 0
     assert mock_func.assert_called_once
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        "keyword --page-size 0",
+        "keyword --page-size 101",
+        "keyword --page-size ten",
+    ],
+)
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_github_search_w_keyword_w_page_size_invalid_value(runner, arguments):
+    result = runner.invoke(github_cli.search, arguments)
+    assert result.exception
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        "keyword --search-mode all",
+        "keyword --search-mode",
+    ],
+)
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_github_search_w_keyword_w_search_mode_invalid_value(runner, arguments):
+    result = runner.invoke(github_cli.search, arguments)
+    assert result.exception
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize("arguments", ["", "--index", "--page-size 50"])
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_github_sync(mocker, runner, arguments):
+    mock_func = mocker.patch(
+        "gsc.presentation.command_line.github_cli.__sync_multiple_repo"
+    )
+    result = runner.invoke(github_cli.sync, arguments)
+    assert result.exit_code == 0
+    assert mock_func.call_count == 1
+
+
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_github_sync_configures_pools(mocker, runner):
+    mocker.patch("gsc.presentation.command_line.github_cli.__sync_multiple_repo")
+    mirror_pool = mocker.patch("gsc.core.git_mirror.mirror_pool.configure")
+    search_engine = mocker.patch("gsc.core.local_search.local_search_engine.configure")
+    result = runner.invoke(github_cli.sync, "--index --concurrency 8 --jobs 2")
+    assert result.exit_code == 0
+    mirror_pool.assert_called_once_with(8)
+    search_engine.assert_called_once_with(2)
+
+
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_github_search_w_keywords(mocker, runner):
+    mock_func = mocker.patch(
+        "gsc.presentation.command_line.github_cli.__search_in_multiple_repo"
+    )
+    result = runner.invoke(github_cli.search, ["foo", "bar", "foo"])
+    assert result.exit_code == 0
+    assert mock_func.call_args[0][0].keywords == ["foo", "bar"]
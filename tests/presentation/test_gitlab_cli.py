@@ -78,10 +78,28 @@ def test_gitlab_search_help(runner, arguments):
         "Export the search result to markdown file with extension .md or .markdown.",
         "-d, --debug",
         "Enable debug logging of HTTP request.",
+        "--page-size <int>",
+        "Number of items per page when listing, default is the environment setting or 100.",
+        "--no-cache",
+        "Do not use the cached project list and search results, always request the server.",
+        "--clear-cache",
+        "Clear the cached project list and search results of the environment before searching.",
+        "--concurrency <int>",
+        "--max-results <int>",
+        "Maximum number of search results fetched per search request, the next pages are not requested.",
+        "Run the requests on the asyncio engine with up to <int> requests in flight, also the number of mirrors fetched at the same time.",
+        "--jobs <int>",
+        "Number of processes searching the mirrors and checking the regular expressions, default is the number of CPUs.",
         "--code-preview",
         "Show code preview.",
         "--ignore-no-result",
         "Do not show the project which has no result (for searching group).",
+        "--exclude-archived",
+        "Do not search in archived projects (for searching group).",
+        "--exclude-empty",
+        "Do not search in projects which have an empty repository (for searching group).",
+        "--active-since <yyyy-mm-dd>",
+        "Only search in projects which have activity since the date (for searching group).",
     ]
     result = runner.invoke(cli.app, arguments, terminal_width=500)
     assert result.exit_code == 0
@@ -254,3 +272,153 @@ def test_gitlab_search_w_keyword_w_output_valid_value(mocker, runner, arguments)
     result = runner.invoke(gitlab_cli.search, arguments)
     assert result.exit_code == 0
     assert mock_func.assert_called_once
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        "keyword -p 123456 --page-size 0",
+        "keyword -p 123456 --page-size 101",
+        "keyword -p 123456 --page-size ten",
+    ],
+)
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_search_w_keyword_w_page_size_invalid_value(runner, arguments):
+    result = runner.invoke(gitlab_cli.search, arguments)
+    assert result.exception
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        "keyword -g python_grp --active-since 2023-13-01",
+        "keyword -g python_grp --active-since yesterday",
+    ],
+)
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_search_w_keyword_w_active_since_invalid_value(runner, arguments):
+    result = runner.invoke(gitlab_cli.search, arguments)
+    assert result.exception
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        "keyword -g python_grp --exclude-archived --exclude-empty",
+        "keyword -g python_grp --active-since 2023-01-31",
+    ],
+)
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_search_w_keyword_w_project_filter(mocker, runner, arguments):
+    mock_func = mocker.patch(
+        "gsc.presentation.command_line.gitlab_cli.__search_in_group"
+    )
+    result = runner.invoke(gitlab_cli.search, arguments)
+    assert result.exit_code == 0
+    assert mock_func.assert_called_once
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        "",
+        "-g python_grp",
+        "-g python_grp --index --exclude-archived --exclude-empty",
+    ],
+)
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_sync(mocker, runner, arguments):
+    mock_func = mocker.patch("gsc.presentation.command_line.gitlab_cli.__sync_group")
+    result = runner.invoke(gitlab_cli.sync, arguments)
+    assert result.exit_code == 0
+    assert mock_func.call_count == 1
+
+
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_search_w_keywords_w_keywords_file(mocker, runner, tmp_path):
+    keywords_file = tmp_path / "keywords.txt"
+    keywords_file.write_text("# secrets\nbar\n\nbaz\nfoo\n", encoding="utf-8")
+    mock_func = mocker.patch(
+        "gsc.presentation.command_line.gitlab_cli.__search_in_group"
+    )
+    result = runner.invoke(
+        gitlab_cli.search, ["foo", "bar", "-g", "python_grp", "-k", str(keywords_file)]
+    )
+    assert result.exit_code == 0
+    param = mock_func.call_args[0][0]
+    assert param.keywords == ["foo", "bar", "baz"]
+    assert param.keyword == "foo, bar, baz"
+
+
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_search_w_keywords_file_only(mocker, runner, tmp_path):
+    keywords_file = tmp_path / "keywords.txt"
+    keywords_file.write_text("foo\nbar\n", encoding="utf-8")
+    mock_func = mocker.patch(
+        "gsc.presentation.command_line.gitlab_cli.__search_in_group"
+    )
+    result = runner.invoke(gitlab_cli.search, ["--keywords-file", str(keywords_file)])
+    assert result.exit_code == 0
+    assert mock_func.call_args[0][0].keywords == ["foo", "bar"]
+
+
+def test_gitlab_search_w_keywords_file_not_existed(runner, tmp_path):
+    result = runner.invoke(gitlab_cli.search, ["-k", str(tmp_path / "missing.txt")])
+    assert result.exit_code == 2
+
+
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_search_w_regex(mocker, runner):
+    mock_func = mocker.patch(
+        "gsc.presentation.command_line.gitlab_cli.__search_in_group"
+    )
+    result = runner.invoke(gitlab_cli.search, [r"api_key\s*=", "--regex"])
+    assert result.exit_code == 0
+    param = mock_func.call_args[0][0]
+    assert param.regex
+    assert param.keywords == [r"api_key\s*="]
+
+
+@pytest.mark.parametrize(
+    "keyword, error",
+    [
+        ("token(", 'Error: Invalid regular expression "token("'),
+        (
+            r"\d+",
+            r'Error: No literal word of 2 characters or more in the regular expression "\d+" to search.',
+        ),
+    ],
+)
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_search_w_regex_invalid_value(runner, keyword, error):
+    result = runner.invoke(gitlab_cli.search, ["--regex", keyword])
+    assert result.exit_code == 2
+    assert error in result.output
+
+
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_search_configures_pools(mocker, runner):
+    mocker.patch("gsc.presentation.command_line.gitlab_cli.__search_in_group")
+    mocker.patch("gsc.core.async_task.async_engine.configure")
+    mocker.patch("gsc.core.connection_pool.http_pool.configure")
+    mirror_pool = mocker.patch("gsc.core.git_mirror.mirror_pool.configure")
+    search_engine = mocker.patch("gsc.core.local_search.local_search_engine.configure")
+    result = runner.invoke(
+        gitlab_cli.search, "keyword -g python_grp --concurrency 8 --jobs 2"
+    )
+    assert result.exit_code == 0
+    mirror_pool.assert_called_once_with(8)
+    search_engine.assert_called_once_with(2)
+
+
+@pytest.mark.usefixtures("set_up_mock_env")
+def test_gitlab_sync_configures_pools(mocker, runner):
+    mocker.patch("gsc.presentation.command_line.gitlab_cli.__sync_group")
+    mirror_pool = mocker.patch("gsc.core.git_mirror.mirror_pool.configure")
+    search_engine = mocker.patch("gsc.core.local_search.local_search_engine.configure")
+    result = runner.invoke(gitlab_cli.sync, "--index --concurrency 8 --jobs 2")
+    assert result.exit_code == 0
+    mirror_pool.assert_called_once_with(8)
+    search_engine.assert_called_once_with(2)
@@ -0,0 +1,102 @@
+import io
+import threading
+import click
+from gsc.presentation.observer.output_writer import OutputWriter, close_writers
+from gsc.presentation.observer.plugin import PrintPlugin
+
+
+class RecordStream(io.StringIO):
+    def __init__(self, tty: bool = False) -> None:
+        super().__init__()
+        self.tty = tty
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+    def isatty(self) -> bool:
+        return self.tty
+
+
+class BlockedStream(RecordStream):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.started.set()
+        self.release.wait()
+        return super().write(text)
+
+
+class BrokenStream(RecordStream):
+    def write(self, text: str) -> int:
+        raise BrokenPipeError()
+
+
+def test_lines_are_batched():
+    stream = BlockedStream()
+    writer = OutputWriter()
+    writer.write(stream, "first\n")
+    stream.started.wait()
+    for number in range(1000):
+        writer.write(stream, f"line {number}\n")
+    stream.release.set()
+    writer.close()
+
+    lines = stream.getvalue().splitlines()
+    assert lines == ["first"] + [f"line {number}" for number in range(1000)]
+    # The lines queued while the first write was blocked are written at once.
+    assert stream.writes == 2
+
+
+def test_streams_keep_the_order():
+    out, err = RecordStream(), RecordStream()
+    writer = OutputWriter(batch_size=10)
+    writer.write(out, "a\n")
+    writer.write(err, "progress")
+    writer.write(out, "b\n")
+    writer.flush()
+    assert (out.getvalue(), err.getvalue()) == ("a\nb\n", "progress")
+    writer.close()
+
+
+def test_closed_stream_does_not_block():
+    writer = OutputWriter(max_size=2)
+    for _ in range(100):
+        writer.write(BrokenStream(), "line\n")
+    writer.close()
+
+
+def test_close_writers():
+    stream = RecordStream()
+    writer = OutputWriter()
+    writer.write(stream, "line\n")
+    close_writers()
+    assert stream.getvalue() == "line\n"
+    # Written at once after close
+    writer.write(stream, "late\n")
+    assert stream.getvalue() == "line\nlate\n"
+
+
+def test_no_style_when_not_terminal():
+    out, err = RecordStream(), RecordStream()
+    plugin = PrintPlugin(False, out, err)
+    plugin.print("title", color="bright_blue")
+    plugin.print_highlight("a key b", "key", dim=True)
+    plugin.print_progress("Searching ...")
+    plugin.close()
+    assert out.getvalue() == "title\na key b\n"
+    assert err.getvalue() == ""
+
+
+def test_style_on_terminal():
+    out, err = RecordStream(tty=True), RecordStream(tty=True)
+    plugin = PrintPlugin(False, out, err)
+    plugin.print_progress("Searching ...")
+    plugin.print("title", color="bright_blue")
+    plugin.close()
+    assert out.getvalue() == click.style("title", fg="bright_blue", dim=False) + "\n"
+    assert err.getvalue() == "\rSearching ...\x1b[K\r\x1b[K"
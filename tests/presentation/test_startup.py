@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import pytest
+
+# Only needed to search, not to parse the command line or manage the envs.
+SEARCH_MODULES = ("rx", "requests", "urllib3", "jsonpickle", "tabulate")
+LOADED_MODULES = """
+import sys
+from gsc import main
+sys.argv[0] = "gsc"
+try:
+    main()
+except SystemExit:
+    pass
+print(",".join(name for name in {modules} if name in sys.modules), file=sys.stderr)
+"""
+
+
+@pytest.mark.parametrize(
+    "arguments", ["-h", "gl -h", "gh -h", "gl search -h", "gh search -h", "gl env -h"]
+)
+def test_command_does_not_import_search_modules(arguments):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            LOADED_MODULES.format(modules=SEARCH_MODULES),
+            *arguments.split(),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stderr.strip().splitlines()[-1:] in ([], [""])
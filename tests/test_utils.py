@@ -1,4 +1,5 @@
 import sys
+from datetime import datetime, timezone
 import pytest
 from gsc import utils
 
@@ -123,3 +124,23 @@ def test_is_supported_extension_output_file_invalid(file_path):
 def test_is_supported_extension_output_file_throw_exception(mocker):
     mocker.patch("os.path.splitext", return_value=Exception("Error"))
     assert not utils.is_supported_extension_output_file("/Users/abc/Desktop/output.md")
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (
+            "2022-11-30T08:10:25.153Z",
+            datetime(2022, 11, 30, 8, 10, 25, 153000, tzinfo=timezone.utc),
+        ),
+        (
+            "2022-11-30T08:10:25Z",
+            datetime(2022, 11, 30, 8, 10, 25, tzinfo=timezone.utc),
+        ),
+        ("2022-11-30", datetime(2022, 11, 30, tzinfo=timezone.utc)),
+        ("invalid", None),
+        (None, None),
+    ],
+)
+def test_parse_iso_datetime(value, expected):
+    assert utils.parse_iso_datetime(value) == expected